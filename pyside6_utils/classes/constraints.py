@@ -125,7 +125,7 @@ def validate_parameter_constraints(parameter_constraints, params, caller_name):
 		if constraints == "no_validation":
 			continue
 
-		constraints = [make_constraint(constraint) for constraint in constraints]
+		constraints = make_constraints(constraints)
 
 		for constraint in constraints:
 			if constraint.is_satisfied_by(param_val):
@@ -216,6 +216,43 @@ def make_constraint(constraint):
 	raise ValueError(f"Unknown constraint type: {constraint}")
 
 
+#NOTE: added to avoid re-converting the same constraint-lists (e.g. the constraints-metadata of a dataclass-field) on
+# every validation/editor-creation. Keyed by the id of the list, the list itself is kept in the entry so its id can not
+# be re-used by another list while cached.
+_COMPILED_CONSTRAINTS_CACHE : typing.Dict[int, typing.Tuple[typing.Any, typing.List["_Constraint"]]] = {}
+_COMPILED_CONSTRAINTS_CACHE_SIZE = 4096 #Cache is cleared when full (e.g. when lists are created on each call)
+
+
+def make_constraints(constraints):
+	"""Convert a list of constraints into Constraint objects using make_constraint. The result is cached per list
+	(by identity), so the same list is only converted once - the list should therefore not be modified after it has
+	been used (or clear_constraints_cache() should be called).
+
+	Parameters
+	----------
+	constraints : list of object
+		The constraints to convert.
+
+	Returns
+	-------
+	constraints : list of _Constraint
+		The converted constraints, shared between calls so should not be modified.
+	"""
+	entry = _COMPILED_CONSTRAINTS_CACHE.get(id(constraints), None)
+	if entry is not None and entry[0] is constraints:
+		return entry[1]
+	compiled = [make_constraint(constraint) for constraint in constraints] #Not cached if this raises
+	if len(_COMPILED_CONSTRAINTS_CACHE) >= _COMPILED_CONSTRAINTS_CACHE_SIZE:
+		_COMPILED_CONSTRAINTS_CACHE.clear()
+	_COMPILED_CONSTRAINTS_CACHE[id(constraints)] = (constraints, compiled)
+	return compiled
+
+
+def clear_constraints_cache():
+	"""Clear the cache of make_constraints(), should be called when a constraint-list is modified after use."""
+	_COMPILED_CONSTRAINTS_CACHE.clear()
+
+
 def validate_params(parameter_constraints):
 	"""Decorator to validate types and values of functions and methods.
 
@@ -1,5 +1,7 @@
 """Init"""
+from .dataclass_filter_proxy_model import DataclassFilterProxyModel
 from .dataclass_model import DataclassModel
+from .dataclass_multi_model import DataclassMultiModel
 from .dataclass_tree_item import DataclassTreeItem
 from .extended_sort_filter_proxy_model import ExtendedSortFilterProxyModel
 from .file_explorer_model import FileExplorerModel
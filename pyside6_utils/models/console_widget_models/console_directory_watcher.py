@@ -0,0 +1,131 @@
+"""Implements a watcher that mirrors all (log-)files in a directory to a ConsoleModel"""
+import os
+import typing
+
+from PySide6 import QtCore
+
+from pyside6_utils.models.console_widget_models.console_from_file_item import \
+    ConsoleFromFileItem
+from pyside6_utils.models.console_widget_models.console_model import \
+    ConsoleModel
+
+
+def scan_directory(path : str, only_extensions : typing.Iterable[str] | None = None
+		) -> typing.Dict[str, os.stat_result]:
+	"""Returns the stat-result of every file in the passed directory using a single os.scandir pass.
+
+	Args:
+		path (str): The path to the directory
+		only_extensions (Iterable[str], optional): Only include files with these extensions (e.g. [".txt", ".log"]),
+			compared case-insensitively. Defaults to None, in which case all files are included.
+
+	Returns:
+		dict[str, os.stat_result]: The stat-result per file-path
+	"""
+	extensions = {extension.lower() for extension in only_extensions} if only_extensions is not None else None
+	result = {}
+	with os.scandir(path) as entries:
+		for entry in entries:
+			if extensions is not None and os.path.splitext(entry.name)[1].lower() not in extensions:
+				continue
+			try:
+				if entry.is_file():
+					result[entry.path] = entry.stat()
+			except OSError: #File was removed in the meantime
+				continue
+	return result
+
+
+class ConsoleDirectoryWatcher(QtCore.QObject):
+	"""
+	Watches a directory and keeps a ConsoleModel in sync with the files in it: a ConsoleFromFileItem is added for each
+	new file and removed once the file is removed.
+
+	The directory is scanned periodically using a single os.scandir pass. The (size, modification-time) of each file is
+	compared to that of the previous scan, only the items of changed files are asked to read their new contents. The
+	created items do not poll their file themselves and are loaded lazily (only once selected), so tracking a
+	directory with many files stays cheap.
+	"""
+	itemAdded = QtCore.Signal(ConsoleFromFileItem)
+	itemRemoved = QtCore.Signal(ConsoleFromFileItem)
+
+	def __init__(self,
+			model : ConsoleModel,
+			path : str,
+			only_extensions : typing.Iterable[str] | None = None,
+			polling_interval : float = 0.5,
+			parent : QtCore.QObject | None = None
+		) -> None:
+		"""
+		Args:
+			model (ConsoleModel): The model to add/remove the items to/from
+			path (str): The directory to watch
+			only_extensions (Iterable[str], optional): Only mirror files with these extensions (e.g. [".txt", ".log"]),
+				compared case-insensitively. Defaults to None, in which case all files are mirrored.
+			polling_interval (float, optional): The interval in seconds at which the directory is scanned.
+				Defaults to 0.5.
+			parent (QtCore.QObject, optional): The parent. Defaults to None.
+		"""
+		super().__init__(parent)
+		self._model = model
+		self._path = path
+		self._only_extensions = list(only_extensions) if only_extensions is not None else None
+		self._items : typing.Dict[str, ConsoleFromFileItem] = {} #Item per file-path
+		self._stats : typing.Dict[str, typing.Tuple[int, float]] = {} #(size, modification-time) per file-path
+
+		self._scan_timer = QtCore.QTimer(self)
+		self._scan_timer.setInterval(max(1, int(polling_interval * 1000)))
+		self._scan_timer.timeout.connect(self.scan)
+		self.scan()
+		self._scan_timer.start()
+
+	def get_items(self) -> typing.Dict[str, ConsoleFromFileItem]:
+		"""Returns the item per file-path of all files that are currently mirrored"""
+		return dict(self._items)
+
+	def scan(self) -> None:
+		"""Scan the directory: add/remove items for new/removed files and check changed files for new contents"""
+		try:
+			stats = scan_directory(self._path, self._only_extensions)
+		except OSError: #Directory is (temporarily) unavailable -> treat as empty
+			stats = {}
+
+		removed_items = [self._items.pop(path) for path in list(self._items) if path not in stats]
+		for item in removed_items:
+			del self._stats[item.get_path()]
+		if len(removed_items) > 0:
+			self._model.remove_items(removed_items) #Single removal per block of rows
+			for item in removed_items:
+				item.close()
+				self.itemRemoved.emit(item)
+
+		new_items = []
+		for path, stat in stats.items():
+			size_mtime = (stat.st_size, stat.st_mtime)
+			item = self._items.get(path)
+			if item is None: #New file
+				try:
+					item = ConsoleFromFileItem(
+						os.path.splitext(os.path.basename(path))[0], path, watch_file=False, lazy_load=True)
+				except ValueError: #File was removed in the meantime
+					continue
+				self._items[path] = item
+				self._stats[path] = size_mtime
+				new_items.append(item)
+			elif self._stats[path] != size_mtime: #Changed file
+				self._stats[path] = size_mtime
+				item.check_for_changes()
+
+		if len(new_items) > 0:
+			self._model.add_items(new_items) #Single insertion for all new files
+			for item in new_items:
+				self.itemAdded.emit(item)
+
+	def stop(self) -> None:
+		"""Stop watching the directory, the items are kept in the model"""
+		self._scan_timer.stop()
+
+	def start(self) -> None:
+		"""(Re)start watching the directory"""
+		self.scan()
+		self._scan_timer.start()
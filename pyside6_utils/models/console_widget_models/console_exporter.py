@@ -0,0 +1,290 @@
+"""Implements exporting (a snapshot of) the lines of a console item to a (compressed) file using a worker thread"""
+import functools
+import gzip
+import logging
+import os
+import typing
+
+from PySide6 import QtCore
+
+try:
+	import zstandard
+except ImportError:
+	zstandard = None
+
+from pyside6_utils.models.console_widget_models.console_model import \
+    BaseConsoleItem
+
+log = logging.getLogger(__name__)
+
+COMPRESSION_EXTENSIONS = {
+	".gz" : "gzip",
+	".gzip" : "gzip",
+	".zst" : "zstd",
+	".zstd" : "zstd",
+}
+
+
+class ConsoleExportWorker(QtCore.QObject):
+	"""Writes either a list of lines, or a byte-range of a file, to the target path in chunks. Reports the progress after
+	each chunk and checks whether it should stop. Used by ConsoleExportTask, which runs it in a separate thread.
+	"""
+	progressChanged = QtCore.Signal(int, int) #Done, total (lines when exporting lines, bytes when copying a file)
+	exportFinished = QtCore.Signal(str) #Emits the target path
+	exportFailed = QtCore.Signal(str) #Emits the error message
+	workFinished = QtCore.Signal() #Emitted (from the worker thread) when done, also when the export failed
+
+	def __init__(self,
+			target_path : str,
+			lines : typing.Sequence[str] | None = None,
+			source_path : str | None = None,
+			source_size : int = 0,
+			compression : str | None = None,
+			encoding : str = "utf-8",
+			chunk_size : int = 1024 * 1024,
+			*args, **kwargs #pylint: disable=keyword-arg-before-vararg
+		) -> None:
+		"""
+		Args:
+			target_path (str): The path to write to
+			lines (Sequence[str], optional): The lines to write, should not be modified while exporting. Defaults to
+				None, in which case source_path is copied.
+			source_path (str, optional): The file of which the first source_size bytes are copied. Defaults to None.
+			source_size (int, optional): The number of bytes of source_path to copy. Defaults to 0.
+			compression (str, optional): None, "gzip" or "zstd". Defaults to None.
+			encoding (str, optional): The encoding used to write the lines. Defaults to "utf-8".
+			chunk_size (int, optional): The (approximate) number of bytes to write at once. Defaults to 1024 * 1024.
+		"""
+		super().__init__(*args, **kwargs)
+		self._target_path = target_path
+		self._lines = lines
+		self._source_path = source_path
+		self._source_size = source_size
+		self._compression = compression
+		self._encoding = encoding
+		self._chunk_size = chunk_size
+		self.run_flag = True #Set to False to cancel the export
+
+	def do_work(self) -> None:
+		"""Write the export, the (partial) target file is removed if the export fails or is cancelled"""
+		try:
+			self._do_export()
+		finally:
+			self.workFinished.emit()
+
+	def _do_export(self) -> None:
+		try:
+			if self._lines is not None:
+				with _open_target(self._target_path, self._compression) as out_file:
+					self._write_lines(out_file)
+			elif self._compression is None:
+				self._copy_range()
+			else:
+				with _open_target(self._target_path, self._compression) as out_file:
+					self._copy_range_to(out_file)
+		except Exception as exception: #pylint: disable=broad-except
+			log.exception(f"Could not export to {self._target_path}")
+			self._remove_target()
+			self.exportFailed.emit(f"{type(exception).__name__}: {exception}")
+			return
+
+		if not self.run_flag:
+			self._remove_target()
+			self.exportFailed.emit("Export was cancelled")
+			return
+		self.exportFinished.emit(self._target_path)
+
+	def _remove_target(self) -> None:
+		try:
+			os.remove(self._target_path)
+		except OSError:
+			pass
+
+	def _write_lines(self, out_file : typing.BinaryIO) -> None:
+		"""Write the lines in chunks, so the full text is never joined in memory"""
+		assert self._lines is not None
+		total = len(self._lines)
+		start = 0
+		lines_per_chunk = 1024 #Adjusted after each chunk so that each chunk is around chunk_size bytes
+		while start < total and self.run_flag:
+			end = min(total, start + lines_per_chunk)
+			data = "".join(self._lines[start:end]).encode(self._encoding, errors="replace")
+			out_file.write(data)
+			lines_per_chunk = max(1, min(lines_per_chunk * 4, (end - start) * self._chunk_size // max(1, len(data))))
+			start = end
+			self.progressChanged.emit(start, total)
+
+	def _copy_range(self) -> None:
+		"""Copy the first source_size bytes of the source file, using os.sendfile (zero-copy) if available"""
+		with open(self._source_path, "rb") as in_file, open(self._target_path, "wb") as out_file: #type: ignore
+			if hasattr(os, "sendfile"):
+				try:
+					offset = 0
+					while offset < self._source_size and self.run_flag:
+						sent = os.sendfile(out_file.fileno(), in_file.fileno(), offset,
+							min(self._chunk_size, self._source_size - offset))
+						if sent == 0: #File was truncated in the meantime
+							break
+						offset += sent
+						self.progressChanged.emit(offset, self._source_size)
+					return
+				except OSError: #Sendfile not supported for these files -> fall back to a normal copy
+					in_file.seek(0)
+					out_file.seek(0)
+					out_file.truncate()
+			self._copy_range_to(out_file, in_file)
+
+	def _copy_range_to(self, out_file : typing.BinaryIO, in_file : typing.BinaryIO | None = None) -> None:
+		"""Copy the first source_size bytes of the source file to out_file in chunks (like shutil.copyfileobj, but
+		limited to the range)"""
+		if in_file is None:
+			with open(self._source_path, "rb") as source_file: #type: ignore
+				self._copy_range_to(out_file, source_file)
+			return
+		copied = 0
+		while copied < self._source_size and self.run_flag:
+			data = in_file.read(min(self._chunk_size, self._source_size - copied))
+			if not data:
+				break
+			out_file.write(data)
+			copied += len(data)
+			self.progressChanged.emit(copied, self._source_size)
+
+
+def _open_target(path : str, compression : str | None) -> typing.BinaryIO:
+	"""Open the passed path for (optionally compressed) binary writing"""
+	if compression is None:
+		return open(path, "wb") #pylint: disable=consider-using-with
+	elif compression == "gzip":
+		return gzip.open(path, "wb", compresslevel=6) #type: ignore
+	elif compression == "zstd":
+		if zstandard is None:
+			raise ImportError("Exporting to zstd requires the zstandard package (pip install zstandard)")
+		return zstandard.ZstdCompressor().stream_writer(open(path, "wb"), closefd=True) #type: ignore #pylint: disable=consider-using-with
+	raise ValueError(f"Unknown compression: {compression}, should be one of: None, 'gzip', 'zstd'")
+
+
+def _stop_export(worker : ConsoleExportWorker, worker_thread : QtCore.QThread) -> None:
+	"""Cancel the export of a ConsoleExportTask that is being destroyed and wait for its thread, as a QThread can not be
+	destroyed while it is running"""
+	worker.run_flag = False
+	worker_thread.wait()
+	worker_thread.deleteLater()
+
+
+class ConsoleExportTask(QtCore.QObject):
+	"""Exports the lines of a console item to a file in a separate thread. Lines are written in chunks, the progress
+	is reported using progressChanged. Should be created using export_console_item().
+
+	The worker and its thread are deleted once the export is done. If the task is destroyed (e.g. together with the item
+	that is its parent) while exporting, the export is cancelled and waited for.
+	"""
+	progressChanged = QtCore.Signal(int, int) #Done, total (lines when exporting lines, bytes when copying a file)
+	exportFinished = QtCore.Signal(str) #Emits the target path
+	exportFailed = QtCore.Signal(str) #Emits the error message
+
+	def __init__(self, worker : ConsoleExportWorker, parent : QtCore.QObject | None = None) -> None:
+		super().__init__(parent)
+		self._worker = worker
+		self._worker_thread = QtCore.QThread()
+		self._worker.moveToThread(self._worker_thread)
+		self._worker_thread.started.connect(self._worker.do_work)
+		self._worker.progressChanged.connect(self.progressChanged)
+		self._worker.exportFinished.connect(self.exportFinished)
+		self._worker.exportFailed.connect(self.exportFailed)
+		#Quit from the worker thread itself, a queued connection would never be handled while the GUI thread blocks
+		# in wait()
+		self._worker.workFinished.connect(self._worker_thread.quit, QtCore.Qt.ConnectionType.DirectConnection)
+		self._worker_thread.finished.connect(self._worker.deleteLater) #Deleted in the worker thread, before it ends
+		self._worker_thread.finished.connect(self._on_thread_finished)
+		self._thread_deleted = False
+		self._destroyed_connection = self.destroyed.connect(
+			functools.partial(_stop_export, self._worker, self._worker_thread))
+
+	def _on_thread_finished(self) -> None:
+		"""Delete the finished thread, so finished exports do not pile up on long-lived items"""
+		QtCore.QObject.disconnect(self._destroyed_connection)
+		self._thread_deleted = True
+		self._worker_thread.deleteLater()
+
+	def start(self) -> None:
+		"""Start the export"""
+		self._worker_thread.start()
+
+	def cancel(self) -> None:
+		"""Stop the export, exportFailed is emitted and the partially written file is removed"""
+		self._worker.run_flag = False
+
+	def is_finished(self) -> bool:
+		"""Returns whether the export has finished (or failed)"""
+		return self._thread_deleted or self._worker_thread.isFinished()
+
+	def wait(self, timeout_ms : int = -1) -> bool:
+		"""Block until the export has finished, returns False if it timed out"""
+		if self._thread_deleted:
+			return True
+		if timeout_ms < 0:
+			return self._worker_thread.wait()
+		return self._worker_thread.wait(timeout_ms)
+
+
+def export_console_item(
+		item : BaseConsoleItem,
+		target_path : str,
+		compression : str | None = "auto",
+		encoding : str = "utf-8",
+		start : bool = True,
+		parent : QtCore.QObject | None = None
+	) -> ConsoleExportTask:
+	"""Export the lines currently kept by the passed console item to a file, in a separate thread.
+
+	The lines are snapshotted when this function is called (only the list is copied, not the text), lines that arrive
+	afterwards are not exported. Items that mirror a file (those with a get_path() method, e.g. ConsoleFromFileItem)
+	are exported by copying the bytes of the file that have been read up to now instead (using os.sendfile when
+	possible).
+
+	E.g.:
+		task = export_console_item(item, "output.log.gz")
+		task.progressChanged.connect(lambda done, total: progress_bar.setValue(100 * done // max(1, total)))
+		task.exportFinished.connect(lambda path: print(f"Exported to {path}"))
+
+	Args:
+		item (BaseConsoleItem): The item to export
+		target_path (str): The path to export to
+		compression (str | None, optional): None, "gzip", "zstd" (requires the zstandard package) or "auto" to
+			determine the compression from the extension of target_path (.gz/.zst). Defaults to "auto".
+		encoding (str, optional): The encoding to use when writing lines. Defaults to "utf-8".
+		start (bool, optional): Whether to start the export right away, otherwise ConsoleExportTask.start() should be
+			called (e.g. after connecting to its signals). Defaults to True.
+		parent (QtCore.QObject, optional): The parent of the task, which keeps it alive. Defaults to None, in which
+			case the item is used as the parent.
+
+	Raises:
+		ValueError: If the compression is unknown
+		ImportError: If zstd compression is requested, but the zstandard package is not installed
+
+	Returns:
+		ConsoleExportTask: The task, emits progressChanged, exportFinished and exportFailed
+	"""
+	if compression == "auto":
+		compression = COMPRESSION_EXTENSIONS.get(os.path.splitext(target_path)[1].lower(), None)
+	if compression not in (None, "gzip", "zstd"):
+		raise ValueError(f"Unknown compression: {compression}, should be one of: None, 'auto', 'gzip', 'zstd'")
+	if compression == "zstd" and zstandard is None:
+		raise ImportError("Exporting to zstd requires the zstandard package (pip install zstandard)")
+
+	source_path = item.get_path() if hasattr(item, "get_path") else None #type: ignore
+	if source_path is not None and os.path.isfile(source_path):
+		source_size = item.get_loaded_size() if hasattr(item, "get_loaded_size") else -1 #type: ignore
+		if source_size < 0:
+			source_size = os.path.getsize(source_path)
+		worker = ConsoleExportWorker(target_path, source_path=source_path, source_size=source_size,
+			compression=compression, encoding=encoding)
+	else:
+		lines, _ = item.get_current_line_list()
+		worker = ConsoleExportWorker(target_path, lines=list(lines), compression=compression, encoding=encoding)
+
+	task = ConsoleExportTask(worker, parent=parent if parent is not None else item)
+	if start:
+		task.start()
+	return task
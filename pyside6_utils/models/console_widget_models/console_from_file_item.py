@@ -5,8 +5,11 @@ import typing
 
 from PySide6 import QtCore, QtWidgets
 
+from pyside6_utils.models.console_widget_models.console_line_processor import \
+    ConsoleLineProcessor
 from pyside6_utils.models.console_widget_models.console_model import \
     BaseConsoleItem
+from pyside6_utils.utility.signal_blocker import SignalBlocker
 
 
 class FileCheckerWorker(QtCore.QObject):
@@ -56,7 +59,23 @@ class ConsoleFromFileItem(BaseConsoleItem):
 	loadedLinesChanged = QtCore.Signal(list, int) #Emits all lines that have been changed, together with the line-index 
 	emitDataChanged = QtCore.Signal() #Emitted when the data of the item changes
 
-	def __init__(self, name : str, path : str, *args, **kwargs):
+	def __init__(self,
+			name : str,
+			path : str,
+			watch_file : bool = True,
+			lazy_load : bool = False,
+			*args, **kwargs #pylint: disable=keyword-arg-before-vararg
+		):
+		"""
+		Args:
+			name (str): The name of this item as displayed in the console widget
+			path (str): The path of the file to mirror
+			watch_file (bool, optional): Whether to start a thread that polls the file for changes. If False,
+				check_for_changes() should be called when the file might have changed (e.g. by a
+				ConsoleDirectoryWatcher, which checks all files in a directory using a single scan). Defaults to True.
+			lazy_load (bool, optional): Only read the file once its lines are requested (e.g. when the item is selected
+				in the console widget), until then only the last-edit date is updated. Defaults to False.
+		"""
 		super().__init__(*args, **kwargs)
 		self._console_pixmap = QtWidgets.QStyle.StandardPixmap.SP_TitleBarMaxButton
 		self._console_icon = QtWidgets.QApplication.style().standardIcon(self._console_pixmap)
@@ -67,7 +86,8 @@ class ConsoleFromFileItem(BaseConsoleItem):
 		# self._current_text : str = "" #The current text in the file #TODO: probably list of lines works better...
 		self._current_line_list : list[str] = [] #List of lines
 		self._cur_lines = [0, 0] #What lines are currently loaded
-		self._last_edited = QtCore.QDateTime.fromSecsSinceEpoch(0) #Set to 0 so that it is always updated on first change
+		self._last_edited = 0.0 #Modification time (seconds since epoch), same type as os.path.getmtime so items can be
+			# sorted by it
 		self._current_seek : int = 0 #The current seek position in the current file
 
 
@@ -81,17 +101,60 @@ class ConsoleFromFileItem(BaseConsoleItem):
 		self._polling_interval = 0.2 #The interval in seconds to poll the file for changes #TODO: make parameter
 
 		self._current_seek : int = 0 #The current seek position in the current file
-		self._on_content_changes_selected_file() #Call this method once to get the initial text
-
-		self._file_monitor_worker = FileCheckerWorker(self._path)
-		self._worker_thread = QtCore.QThread()
-		self._worker_thread.started.connect(self._file_monitor_worker.do_work)
-		self._file_monitor_worker.moveToThread(self._worker_thread)
-		#Connect deleteLater to the finished signal of the thread
-		self._file_monitor_worker.fileChanged.connect(self._on_content_changes_selected_file)
-
-		#Connect doWork to the started signal of the thread
-		self._worker_thread.start()
+		self._lines_read = 0 #Counters, see get_metrics()
+		self._bytes_read = 0
+		self._loaded = not lazy_load #Whether the file has been read (up to self._current_seek)
+		if self._loaded:
+			self._on_content_changes_selected_file() #Call this method once to get the initial text
+		else:
+			self._last_edited = os.path.getmtime(self._path)
+
+		self._file_monitor_worker : FileCheckerWorker | None = None
+		self._worker_thread : QtCore.QThread | None = None
+		if watch_file:
+			self._file_monitor_worker = FileCheckerWorker(self._path)
+			self._worker_thread = QtCore.QThread()
+			self._worker_thread.started.connect(self._file_monitor_worker.do_work)
+			self._file_monitor_worker.moveToThread(self._worker_thread)
+			#Connect deleteLater to the finished signal of the thread
+			self._file_monitor_worker.fileChanged.connect(self.check_for_changes)
+
+			#Connect doWork to the started signal of the thread
+			self._worker_thread.start()
+
+	def get_path(self) -> str:
+		"""Returns the path of the mirrored file"""
+		return self._path
+
+	def get_loaded_size(self) -> int:
+		"""Returns the number of bytes of the file that have been read (and are displayed), or -1 if the file has not been
+		loaded yet (lazy_load)"""
+		return self._current_seek if self._loaded else -1
+
+	def get_metrics(self) -> typing.Dict[str, float]:
+		"""Returns the number of lines/bytes read from the file, and its modification time as last_change_time"""
+		return {
+			"lines_read" : self._lines_read,
+			"bytes_read" : self._bytes_read,
+			"last_change_time" : self._last_edited,
+		}
+
+	def check_for_changes(self) -> None:
+		"""Read the new contents of the file (if any) and emit them. If the file has not been loaded yet (lazy_load),
+		only the last-edit date is updated."""
+		if self._loaded:
+			self._on_content_changes_selected_file()
+		elif os.path.exists(self._path):
+			self._last_edited = os.path.getmtime(self._path)
+			self.dataChanged.emit()
+
+	def close(self) -> None:
+		"""Stop the file-polling thread (if any)"""
+		if self._worker_thread is not None and self._file_monitor_worker is not None:
+			self._file_monitor_worker.run_flag = False
+			self._worker_thread.quit()
+			self._worker_thread.wait()
+			self._worker_thread = None
 
 
 	def get_current_line_list(self) -> tuple[list[str], int]:
@@ -99,6 +162,10 @@ class ConsoleFromFileItem(BaseConsoleItem):
 		ICW the start-index of this buffer. When the full file is loaded, this will be 0.
 		"""
 		# return self._current_text, 0 #TODO: No limit implemented yet
+		if not self._loaded: #Lazy loading -> read the file the first time the lines are requested
+			self._loaded = True
+			with SignalBlocker(self): #The lines are returned, no need to also emit them
+				self._on_content_changes_selected_file()
 		return self._current_line_list, self._cur_lines[0]
 
 
@@ -135,22 +202,27 @@ class ConsoleFromFileItem(BaseConsoleItem):
 		if cur_size <= self._current_seek: #If file size is equal to the current seek position, do nothing
 			return
 
-		cur_line = len(self._current_line_list)+1 #Get the current line number
+		cur_line = len(self._current_line_list) #Get the line-index of the first new line
 		new_line_list : typing.List[str]= [] #List of new lines
 
-		#Open the file and seek to the current seek position
-		with open(self._path, "r", encoding=encoding) as in_file:
+		#Open the file and seek to the current seek position. Only split on "\n", a lone "\r" (e.g. progress-bars)
+		# overwrites the current line instead of starting a new one
+		with open(self._path, "r", encoding=encoding, newline="\n") as in_file:
 			in_file.seek(self._current_seek)
 			if len(self._current_line_list) > 0 and not self._current_line_list[-1].endswith("\n"): #TODO os.linesep?
-				self._current_line_list[-1] += in_file.readline()
+				self._current_line_list[-1] = ConsoleLineProcessor.compact_carriage_returns(
+					self._current_line_list[-1] + in_file.readline())
 				new_line_list.append(self._current_line_list[-1])
-				cur_line -= 1 #Also update the last line number
+				cur_line -= 1 #First emitted line replaces the (incomplete) last line
 			for line in in_file: #Read the new lines #TODO: maybe make a bit more efficient?
 				self._current_line_list.append(line)
 				new_line_list.append(line)
+			self._bytes_read += in_file.tell() - self._current_seek
 			self._current_seek = in_file.tell() #Make the current seek position the end of the file
+		self._lines_read += len(new_line_list)
 
 		#Retrieve the last edit date
 		self._last_edited = os.path.getmtime(self._path)
 		# self.currentTextChanged.emit(self._current_text, 0) #Emit the current text
 		self.loadedLinesChanged.emit(new_line_list, cur_line) #Emit the current text
+		self.dataChanged.emit() #Last-edit date changed
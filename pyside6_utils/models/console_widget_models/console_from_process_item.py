@@ -0,0 +1,188 @@
+"""Implements a console item that runs a (child) process and displays its stdout/stderr"""
+import codecs
+import datetime
+import re
+import typing
+
+from PySide6 import QtCore
+
+from pyside6_utils.models.console_widget_models.console_from_stream_item import \
+    ConsoleFromStreamItem
+
+
+class ConsoleFromProcessItem(ConsoleFromStreamItem):
+	"""An item that represents a single row in the console widget, which runs a program using a QProcess and displays
+	its output. Stdout and stderr are read (non-blocking, using the QProcess-signals) in chunks of all available data,
+	and are interleaved in the order in which they arrive. Each line is (optionally) prefixed with a timestamp.
+
+	The running/exit-state of the process is shown in the name of the item, dataChanged is emitted when it changes.
+	"""
+	STATE_NAMES = {
+		QtCore.QProcess.ProcessState.NotRunning : "not running",
+		QtCore.QProcess.ProcessState.Starting : "starting",
+		QtCore.QProcess.ProcessState.Running : "running",
+	}
+	LINE_START_REGEX = re.compile(r"(\n|\r)")
+
+	def __init__(self,
+			name : str,
+			program : str,
+			arguments : typing.Sequence[str] | None = None,
+			working_directory : str | None = None,
+			timestamps : bool = True,
+			start : bool = True,
+			encoding : str = "utf-8",
+			*args, **kwargs #pylint: disable=keyword-arg-before-vararg
+		) -> None:
+		"""
+		Args:
+			name (str): The name of this item as displayed in the console widget
+			program (str): The program to run
+			arguments (Sequence[str], optional): The arguments to pass to the program. Defaults to None.
+			working_directory (str, optional): The working directory of the process, None to use the current working
+				directory. Defaults to None.
+			timestamps (bool, optional): Whether to prefix each line with the time at which it was received.
+				Defaults to True.
+			start (bool, optional): Whether to start the process right away, otherwise start() should be called.
+				Defaults to True.
+			encoding (str, optional): The encoding of the output of the process. Defaults to "utf-8".
+			*args, **kwargs: Passed to ConsoleFromStreamItem (e.g. max_lines, emit_interval)
+		"""
+		super().__init__(name, *args, **kwargs)
+		self._program = program
+		self._arguments = list(arguments) if arguments is not None else []
+		self._timestamps = timestamps
+
+		self._process = QtCore.QProcess(self)
+		self._process.setProgram(program)
+		self._process.setArguments(self._arguments)
+		if working_directory is not None:
+			self._process.setWorkingDirectory(working_directory)
+
+		#Each channel is decoded separately (a chunk might end halfway a multi-byte character) and keeps track of whether
+		# it is at the start of a line, so a timestamp can be inserted
+		self._decoders = {
+			channel : codecs.getincrementaldecoder(encoding)(errors="replace")
+				for channel in QtCore.QProcess.ProcessChannel
+		}
+		self._at_line_start = {channel : True for channel in QtCore.QProcess.ProcessChannel}
+		self._open_channel : QtCore.QProcess.ProcessChannel | None = None #Channel that wrote the incomplete last line
+		self._finished = False
+
+		self._process.readyReadStandardOutput.connect(
+			lambda: self._on_ready_read(QtCore.QProcess.ProcessChannel.StandardOutput))
+		self._process.readyReadStandardError.connect(
+			lambda: self._on_ready_read(QtCore.QProcess.ProcessChannel.StandardError))
+		self._process.stateChanged.connect(lambda *_: self.dataChanged.emit())
+		self._process.finished.connect(self._on_finished)
+		self._process.errorOccurred.connect(self._on_error)
+
+		if start:
+			self.start()
+
+	def get_process(self) -> QtCore.QProcess:
+		"""Returns the QProcess that is run by this item"""
+		return self._process
+
+	def start(self) -> None:
+		"""Start the process, if it is not running already"""
+		if self._process.state() == QtCore.QProcess.ProcessState.NotRunning:
+			self._finished = False
+			self._process.start()
+
+	def terminate(self) -> None:
+		"""Ask the process to terminate"""
+		self._process.terminate()
+
+	def kill(self) -> None:
+		"""Kill the process"""
+		self._process.kill()
+
+	def close(self, timeout : float = 3.0) -> None:
+		"""Stop the process (if running) and stop emitting its output. The process is asked to terminate first, if it
+		has not finished after timeout seconds it is killed.
+
+		Args:
+			timeout (float, optional): The number of seconds to wait for the process to terminate. Defaults to 3.0.
+		"""
+		if self._process.state() != QtCore.QProcess.ProcessState.NotRunning:
+			self._process.terminate()
+			if not self._process.waitForFinished(max(0, int(timeout * 1000))):
+				self._process.kill()
+				self._process.waitForFinished(1000)
+		super().close()
+
+	def is_running(self) -> bool:
+		"""Returns whether the process is starting/running"""
+		return self._process.state() != QtCore.QProcess.ProcessState.NotRunning
+
+	def get_status_text(self) -> str:
+		"""Returns the running/exit-state of the process as text, e.g. "running" or "exit code 1" """
+		if self._process.state() != QtCore.QProcess.ProcessState.NotRunning:
+			return self.STATE_NAMES[self._process.state()]
+		if self._process.error() == QtCore.QProcess.ProcessError.FailedToStart:
+			return "failed to start"
+		if self._process.exitStatus() == QtCore.QProcess.ExitStatus.CrashExit:
+			return "crashed"
+		return f"exit code {self._process.exitCode()}" if self._finished else "not started"
+
+	def data(self, role : QtCore.Qt.ItemDataRole, column : int = 0):
+		"""Retrieve the data for the given role for this item."""
+		if column == 0:
+			return f"{self._name} ({self.get_status_text()})"
+		elif column == 2:
+			return " ".join([self._program, *self._arguments])
+		return super().data(role, column)
+
+	def _on_ready_read(self, channel : QtCore.QProcess.ProcessChannel) -> None:
+		"""Read all available data of the passed channel at once"""
+		self._process.setReadChannel(channel)
+		text = self._decoders[channel].decode(self._process.readAll().data())
+		self._write_channel_text(channel, text)
+
+	def _write_channel_text(self, channel : QtCore.QProcess.ProcessChannel, text : str) -> None:
+		"""Write the text of the passed channel, inserting timestamps at the start of each line"""
+		if not text:
+			return
+		if self._open_channel is not None and self._open_channel != channel: #Other channel wrote an incomplete line
+			self._end_open_line() # -> end that line so the lines are not mixed
+
+		if not self._timestamps:
+			self.write(text)
+		else:
+			timestamp = f"[{datetime.datetime.now().strftime('%H:%M:%S.%f')[:-3]}] "
+			out = []
+			for part in self.LINE_START_REGEX.split(text):
+				if part in ("\n", "\r"): #A carriage-return (e.g. progress-bar) overwrites the line -> also re-insert
+					out.append(part)     # the timestamp
+					self._at_line_start[channel] = True
+				elif part:
+					if self._at_line_start[channel]:
+						out.append(timestamp)
+						self._at_line_start[channel] = False
+					out.append(part)
+			self.write("".join(out))
+		self._open_channel = None if text.endswith("\n") else channel
+
+	def _end_open_line(self) -> None:
+		"""End the incomplete last line (if any)"""
+		if self._open_channel is not None:
+			self.write("\n")
+			self._at_line_start[self._open_channel] = True
+			self._open_channel = None
+
+	def _on_finished(self, exit_code : int, exit_status : QtCore.QProcess.ExitStatus) -> None:
+		self._finished = True
+		for channel in QtCore.QProcess.ProcessChannel: #Write any remaining (undecoded) text
+			self._write_channel_text(channel, self._decoders[channel].decode(b"", final=True))
+		self._end_open_line()
+		status = "crashed" if exit_status == QtCore.QProcess.ExitStatus.CrashExit else f"exit code {exit_code}"
+		self._write_channel_text(QtCore.QProcess.ProcessChannel.StandardOutput, f"Process finished ({status})\n")
+		self.dataChanged.emit()
+
+	def _on_error(self, error : QtCore.QProcess.ProcessError) -> None:
+		if error == QtCore.QProcess.ProcessError.FailedToStart:
+			self._end_open_line()
+			self._write_channel_text(QtCore.QProcess.ProcessChannel.StandardError,
+				f"Failed to start {self._program}: {self._process.errorString()}\n")
+			self.dataChanged.emit()
@@ -0,0 +1,292 @@
+"""Implements a console item that drains shared-memory ring-buffers, which (worker-)processes write their output to"""
+import codecs
+import os
+import struct
+import threading
+import time
+import typing
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+from PySide6 import QtCore
+
+from pyside6_utils.models.console_widget_models.console_from_stream_item import \
+    ConsoleFromStreamItem
+
+#Each slot starts with a header of (bytes written, bytes read, bytes dropped), padded to 64 bytes so the counters of
+# different slots do not share a cache-line. The counters only increase: "written" and "dropped" are only stored by the
+# writer of the slot, "read" only by the reader, so no lock is needed between the processes.
+_HEADER = struct.Struct("<QQQ")
+_HEADER_SIZE = 64
+_COUNTER = struct.Struct("<Q")
+
+
+def _remove_shared_memory(memory : shared_memory.SharedMemory) -> None:
+	"""Close and unlink the passed shared memory block, used as the finalizer of ConsoleFromSharedMemoryItem"""
+	memory.close()
+	try:
+		memory.unlink()
+	except FileNotFoundError: #Already removed (e.g. by another process)
+		pass
+
+
+class SharedMemoryConsoleSink():
+	"""File-like object that writes text to a single slot (ring-buffer) of a ConsoleFromSharedMemoryItem. Can be pickled
+	and passed to other processes (e.g. multiprocessing/pathos-workers), where it attaches to the shared memory by name.
+
+	E.g.:
+		def run_job(sink):
+			logging.getLogger().addHandler(logging.StreamHandler(sink))
+			print("Hello", file=sink)
+
+		pool.map(run_job, [item.create_sink(f"job {nr}") for nr in range(10)])
+
+	Text is only written to the shared memory, the GUI-process reads it back periodically. If the ring-buffer is full
+	(the GUI can not keep up), write() waits for at most write_timeout seconds, after which the remaining text is dropped
+	(and reported as such in the console).
+	"""
+
+	def __init__(self,
+			shared_memory_name : str,
+			slot : int,
+			slot_size : int,
+			write_timeout : float = 1.0,
+			encoding : str = "utf-8"
+		) -> None:
+		"""
+		Args:
+			shared_memory_name (str): The name of the shared memory block
+			slot (int): The slot to write to
+			slot_size (int): The size of the ring-buffer of each slot (in bytes, excluding the header)
+			write_timeout (float, optional): The maximum time (in seconds) to wait for space in the ring-buffer, after
+				which text is dropped. Defaults to 1.0.
+			encoding (str, optional): The encoding to use. Defaults to "utf-8".
+		"""
+		self._shared_memory_name = shared_memory_name
+		self._slot = slot
+		self._slot_size = slot_size
+		self._write_timeout = write_timeout
+		self.encoding = encoding
+		self._creator_pid = os.getpid()
+		self._shared_memory : shared_memory.SharedMemory | None = None #Attached lazily, in the writing process
+		self._lock = threading.Lock() #Only guards against threads of the same process writing at the same time
+
+	def __getstate__(self) -> typing.Dict[str, typing.Any]:
+		state = self.__dict__.copy()
+		state["_shared_memory"] = None
+		del state["_lock"]
+		return state
+
+	def __setstate__(self, state : typing.Dict[str, typing.Any]) -> None:
+		self.__dict__.update(state)
+		self._lock = threading.Lock()
+
+	def _attach(self) -> shared_memory.SharedMemory:
+		if self._shared_memory is None:
+			#Processes that are not started by this process using multiprocessing (e.g. pathos-workers, which use the
+			# multiprocess-package) start their own resource-tracker when attaching, which would remove the shared
+			# memory once the worker exits. Unregister the shared memory in that case, the creating item removes it.
+			has_tracker = getattr(resource_tracker._resource_tracker, "_fd", None) is not None #pylint: disable=protected-access
+			self._shared_memory = shared_memory.SharedMemory(self._shared_memory_name)
+			if not has_tracker and os.getpid() != self._creator_pid:
+				resource_tracker.unregister(self._shared_memory._name, "shared_memory") #pylint: disable=protected-access
+		return self._shared_memory
+
+	def write(self, text : str) -> int:
+		"""Write text to the ring-buffer of this sink, waits for at most write_timeout seconds if the buffer is full.
+
+		Returns:
+			int: The number of characters written (file-like behaviour), dropped text is counted as well
+		"""
+		data = text.encode(self.encoding, errors="replace")
+		with self._lock:
+			buffer = self._attach().buf
+			header_offset = self._slot * (_HEADER_SIZE + self._slot_size)
+			data_offset = header_offset + _HEADER_SIZE
+			pos = 0
+			deadline = None
+			while pos < len(data):
+				written, read, dropped = _HEADER.unpack_from(buffer, header_offset)
+				free = self._slot_size - (written - read)
+				if free <= 0:
+					if deadline is None:
+						deadline = time.monotonic() + self._write_timeout
+					elif time.monotonic() > deadline: #Reader can not keep up -> drop the remaining text
+						_COUNTER.pack_into(buffer, header_offset + 16, dropped + len(data) - pos)
+						break
+					time.sleep(0.001)
+					continue
+				deadline = None
+				count = min(free, len(data) - pos)
+				start = written % self._slot_size
+				first_part = min(count, self._slot_size - start) #Part before wrapping around
+				buffer[data_offset + start : data_offset + start + first_part] = data[pos : pos + first_part]
+				if count > first_part:
+					buffer[data_offset : data_offset + count - first_part] = data[pos + first_part : pos + count]
+				_COUNTER.pack_into(buffer, header_offset, written + count) #Publish the data to the reader
+				pos += count
+		return len(text)
+
+	def writelines(self, lines : typing.Iterable[str]) -> None:
+		"""Write all passed lines (file-like behaviour, no newlines are added)"""
+		for line in lines:
+			self.write(line)
+
+	def flush(self) -> None:
+		"""File-like behaviour, text is readable by the console item as soon as it is written"""
+
+	def isatty(self) -> bool:
+		"""File-like behaviour, returns False so programs do not use terminal-only features"""
+		return False
+
+	def writable(self) -> bool:
+		"""File-like behaviour"""
+		return True
+
+	def close(self) -> None:
+		"""Detach from the shared memory, writing again re-attaches"""
+		if self._shared_memory is not None:
+			self._shared_memory.close()
+			self._shared_memory = None
+
+
+class ConsoleFromSharedMemoryItem(ConsoleFromStreamItem):
+	"""An item that represents a single row in the console widget, of which the text is written to shared memory by
+	other processes, using SharedMemoryConsoleSinks created by create_sink(). This avoids writing to, and polling,
+	files when the output of (many) worker-processes should be displayed.
+
+	Each sink writes to its own ring-buffer (slot), so writers never wait for each other. All slots are drained in bulk
+	every emit_interval seconds. Only complete lines are displayed, so the lines of different writers are never mixed.
+
+	The shared memory is removed by close(), or when the item is garbage-collected (or the interpreter exits) if close()
+	is never called.
+	"""
+
+	def __init__(self,
+			name : str,
+			slot_count : int = 64,
+			slot_size : int = 256 * 1024,
+			prefix_labels : bool = True,
+			*args, **kwargs #pylint: disable=keyword-arg-before-vararg
+		) -> None:
+		"""
+		Args:
+			name (str): The name of this item as displayed in the console widget
+			slot_count (int, optional): The maximum number of sinks that can be used at the same time. Defaults to 64.
+			slot_size (int, optional): The size of the ring-buffer of each sink in bytes. Defaults to 256 * 1024.
+			prefix_labels (bool, optional): Whether to prefix each line with the label of the sink that wrote it.
+				Defaults to True.
+			*args, **kwargs: Passed to ConsoleFromStreamItem (e.g. max_lines, emit_interval)
+		"""
+		self._slot_count = slot_count
+		self._slot_size = slot_size
+		self._shared_memory = shared_memory.SharedMemory(create=True, size=slot_count * (_HEADER_SIZE + slot_size))
+		self._shared_memory.buf[:] = bytes(len(self._shared_memory.buf)) #Make sure all counters start at 0
+		self._finalizer = weakref.finalize(self, _remove_shared_memory, self._shared_memory) #Runs at most once
+		super().__init__(name, *args, **kwargs)
+		self._prefix_labels = prefix_labels
+
+		self._labels : typing.Dict[int, str] = {} #Label per slot that is in use
+		self._released_slots : typing.Set[int] = set() #Slots that are no longer used, freed once drained
+		self._decoders : typing.Dict[int, codecs.IncrementalDecoder] = {}
+		self._partial_lines : typing.Dict[int, str] = {} #Text after the last newline per slot
+		self._dropped : typing.Dict[int, int] = {} #Last seen dropped-counter per slot
+		self._dropped_bytes = 0 #Total number of bytes dropped by the sinks (because the ring-buffer was full)
+
+	def get_metrics(self) -> typing.Dict[str, float]:
+		"""Returns the metrics of ConsoleFromStreamItem, and the number of bytes dropped by the sinks"""
+		metrics = super().get_metrics()
+		metrics["dropped_bytes"] = self._dropped_bytes
+		return metrics
+
+	def get_shared_memory_name(self) -> str:
+		"""Returns the name of the shared memory block"""
+		return self._shared_memory.name
+
+	def data(self, role : QtCore.Qt.ItemDataRole, column : int = 0):
+		"""Retrieve the data for the given role for this item."""
+		if column == 2:
+			return f"Shared memory: {self._shared_memory.name}"
+		return super().data(role, column)
+
+	def create_sink(self, label : str | None = None, write_timeout : float = 1.0) -> SharedMemoryConsoleSink:
+		"""Create a sink that writes to a free slot of this item, the sink can be passed to another process.
+
+		Args:
+			label (str, optional): The label to prefix the lines of this sink with. Defaults to None, in which case the
+				slot-number is used.
+			write_timeout (float, optional): See SharedMemoryConsoleSink. Defaults to 1.0.
+
+		Raises:
+			RuntimeError: If all slots are in use, release_sink() should be called for sinks that are no longer used
+
+		Returns:
+			SharedMemoryConsoleSink: The sink
+		"""
+		for slot in range(self._slot_count):
+			if slot not in self._labels:
+				break
+		else:
+			raise RuntimeError(f"All {self._slot_count} slots of {self._name} are in use")
+		self._labels[slot] = label if label is not None else str(slot)
+		self._decoders[slot] = codecs.getincrementaldecoder("utf-8")(errors="replace")
+		self._partial_lines[slot] = ""
+		self._dropped[slot] = _HEADER.unpack_from(self._shared_memory.buf, self._header_offset(slot))[2]
+		return SharedMemoryConsoleSink(self._shared_memory.name, slot, self._slot_size, write_timeout)
+
+	def release_sink(self, sink : SharedMemoryConsoleSink) -> None:
+		"""Mark the slot of the passed sink as unused (it should no longer be written to), its remaining text is
+		displayed and the slot is then re-used for new sinks."""
+		self._released_slots.add(sink._slot) #pylint: disable=protected-access
+
+	def _header_offset(self, slot : int) -> int:
+		return slot * (_HEADER_SIZE + self._slot_size)
+
+	def _drain_slot(self, slot : int) -> str:
+		"""Returns all text that has been written to the passed slot since the last call"""
+		buffer = self._shared_memory.buf
+		header_offset = self._header_offset(slot)
+		data_offset = header_offset + _HEADER_SIZE
+		written, read, dropped = _HEADER.unpack_from(buffer, header_offset)
+		text = ""
+		if written > read:
+			start = read % self._slot_size
+			count = written - read
+			first_part = min(count, self._slot_size - start)
+			data = bytes(buffer[data_offset + start : data_offset + start + first_part])
+			if count > first_part:
+				data += bytes(buffer[data_offset : data_offset + count - first_part])
+			_COUNTER.pack_into(buffer, header_offset + 8, written) #Free the space for the writer
+			text = self._decoders[slot].decode(data)
+		if dropped != self._dropped[slot]:
+			text += f"\n[{dropped - self._dropped[slot]} bytes dropped, the console could not keep up]\n"
+			self._dropped_bytes += dropped - self._dropped[slot]
+			self._dropped[slot] = dropped
+		return text
+
+	def flush_pending(self) -> None:
+		"""Read the new text of all slots, and emit all complete lines using a single loadedLinesChanged."""
+		if not self._finalizer.alive: #Closed
+			return
+		for slot in list(self._labels):
+			text = self._drain_slot(slot)
+			released = slot in self._released_slots
+			if text:
+				lines = (self._partial_lines[slot] + text).split("\n")
+				self._partial_lines[slot] = lines.pop() #Incomplete last line, displayed once complete
+				if len(lines) > 0:
+					prefix = f"[{self._labels[slot]}] " if self._prefix_labels else ""
+					self.write("".join([prefix + line + "\n" for line in lines]))
+			if released: #Display remaining text and free the slot
+				if self._partial_lines[slot]:
+					prefix = f"[{self._labels[slot]}] " if self._prefix_labels else ""
+					self.write(prefix + self._partial_lines[slot] + "\n")
+				self._released_slots.discard(slot)
+				del self._labels[slot]
+		super().flush_pending()
+
+	def close(self) -> None:
+		"""Stop draining and remove the shared memory, text that is written by sinks afterwards is lost. Can be called
+		more than once."""
+		super().close()
+		self._finalizer()
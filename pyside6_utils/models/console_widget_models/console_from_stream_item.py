@@ -0,0 +1,193 @@
+"""Implements a console item that receives its text in-process (e.g. from sys.stdout or a logging.Handler)"""
+import collections
+import logging
+import time
+import typing
+
+from PySide6 import QtCore, QtWidgets
+
+from pyside6_utils.models.console_widget_models.console_line_processor import \
+    ConsoleLineProcessor
+from pyside6_utils.models.console_widget_models.console_model import \
+    BaseConsoleItem
+
+
+class ConsoleFromStreamItem(BaseConsoleItem):
+	"""An item that represents a single row in the console widget, of which the text is written to it in-process.
+	Can be used as a file-like object (e.g. sys.stdout replacement) using write(), or as a logging-handler using
+	ConsoleStreamHandler, without writing to/polling a file:
+
+		item = ConsoleFromStreamItem("My job")
+		sys.stdout = item #Or: contextlib.redirect_stdout(item)
+		logging.getLogger().addHandler(ConsoleStreamHandler(item))
+
+	write() can be called from any thread: text is appended to a deque (atomic in CPython, so no lock is needed) and
+	drained in the thread of this item (the UI-thread) at most once every emit_interval seconds. All text that came in
+	during that interval is emitted using a single loadedLinesChanged-emission.
+	Only the last max_lines lines are kept, older lines are dropped (ring-buffer).
+	"""
+	loadedLinesChanged = QtCore.Signal(list, int) #Emits all lines that have been changed, together with the line-index
+
+	def __init__(self,
+			name : str,
+			max_lines : int = 100_000,
+			emit_interval : float = 0.05,
+			*args, **kwargs #pylint: disable=keyword-arg-before-vararg
+		) -> None:
+		"""
+		Args:
+			name (str): The name of this item as displayed in the console widget
+			max_lines (int, optional): The maximum number of lines to keep, older lines are dropped. Defaults to
+				100_000.
+			emit_interval (float, optional): The interval in seconds at which written text is gathered and emitted.
+				Defaults to 0.05.
+		"""
+		super().__init__(*args, **kwargs)
+		self._console_pixmap = QtWidgets.QStyle.StandardPixmap.SP_TitleBarMaxButton
+		self._console_icon = QtWidgets.QApplication.style().standardIcon(self._console_pixmap)
+
+		self._name = name
+		self._max_lines = max(1, max_lines)
+		self._pending : collections.deque[str] = collections.deque() #Written, but not yet emitted text
+
+		self._lines : typing.List[str] = [] #Raw lines, including their trailing newline (if complete)
+		self._start = 0 #Index in self._lines of the first kept line, dropping is done lazily to keep it O(1)
+		self._first_line = 0 #The line-index of the first kept line
+		self._last_edited = 0.0
+		self._pending_since : float | None = None #time.time() of the first write that has not been emitted yet
+		self._last_change_time = 0.0 #time.time() of the first write of the last emitted batch
+		self._lines_read = 0 #Counters, see get_metrics()
+		self._bytes_read = 0
+		self._dropped_lines = 0
+
+		self._emit_timer = QtCore.QTimer(self)
+		self._emit_timer.setInterval(max(1, int(emit_interval * 1000)))
+		self._emit_timer.timeout.connect(self.flush_pending)
+		self._emit_timer.start()
+
+	def get_current_line_list(self) -> typing.Tuple[typing.List[str], int]:
+		"""Retrieves the lines currently kept by this item, ICW the line-index of the first line"""
+		return self._lines[self._start:], self._first_line
+
+	def get_first_line(self) -> int:
+		"""Returns the line-index of the first kept line, lines before it have been dropped (see max_lines)"""
+		return self._first_line
+
+	def data(self, role : QtCore.Qt.ItemDataRole, column : int = 0):
+		"""Retrieve the data for the given role for this item."""
+		if column == 0:
+			return self._name
+		elif column == 1:
+			return self._last_edited
+		elif column == 2:
+			return None #No path
+		raise ValueError(f"Invalid role for ConsoleFromStreamItem: {role}")
+
+	def write(self, text : str) -> int:
+		"""Append text to this item, can be called from any thread. Lines are split on newlines, text without a trailing
+		newline is displayed as an incomplete line that is extended by the next write.
+
+		Args:
+			text (str): The text to write
+
+		Returns:
+			int: The number of characters written (file-like behaviour)
+		"""
+		if text:
+			if self._pending_since is None: #Benign race: at worst the time of a slightly later write is used
+				self._pending_since = time.time()
+			self._pending.append(text)
+		return len(text)
+
+	def writelines(self, lines : typing.Iterable[str]) -> None:
+		"""Write all passed lines (file-like behaviour, no newlines are added)"""
+		for line in lines:
+			self.write(line)
+
+	def flush(self) -> None:
+		"""File-like behaviour, written text is emitted every emit_interval seconds (see flush_pending)"""
+
+	def isatty(self) -> bool:
+		"""File-like behaviour, returns False so programs do not use terminal-only features"""
+		return False
+
+	def writable(self) -> bool:
+		"""File-like behaviour"""
+		return True
+
+	def close(self) -> None:
+		"""Stop emitting written text, text that is written afterwards is no longer displayed"""
+		self._emit_timer.stop()
+
+	def get_metrics(self) -> typing.Dict[str, float]:
+		"""Returns the number of lines/characters received and the number of lines dropped because of max_lines"""
+		return {
+			"lines_read" : self._lines_read,
+			"bytes_read" : self._bytes_read,
+			"dropped_lines" : self._dropped_lines,
+			"last_change_time" : self._last_change_time,
+		}
+
+	def flush_pending(self) -> None:
+		"""Split all written (pending) text into lines, store them and emit them using a single loadedLinesChanged.
+		Called periodically in the thread of this item, should not be called from the writing threads.
+		"""
+		if len(self._pending) == 0:
+			return
+		if self._pending_since is not None: #Reset before draining, so writes during draining set a new time
+			self._last_change_time = self._pending_since
+			self._pending_since = None
+		chunks = []
+		try:
+			while True:
+				chunks.append(self._pending.popleft())
+		except IndexError: #Drained, writers might have added more text in the meantime, which is emitted next time
+			pass
+
+		text = "".join(chunks)
+		self._bytes_read += len(text)
+		parts = text.split("\n")
+		new_lines = [part + "\n" for part in parts[:-1]]
+		if parts[-1]:
+			new_lines.append(parts[-1])
+
+		from_line = self._first_line + len(self._lines) - self._start
+		if len(self._lines) > self._start and not self._lines[-1].endswith("\n"): #Extend the incomplete last line
+			new_lines[0] = ConsoleLineProcessor.compact_carriage_returns(self._lines.pop() + new_lines[0])
+			from_line -= 1
+		self._lines_read += len(new_lines)
+		if len(new_lines) > self._max_lines: #Don't store lines that would be dropped right away, drop all kept lines
+			self._dropped_lines += len(self._lines) - self._start + len(new_lines) - self._max_lines
+			from_line += len(new_lines) - self._max_lines
+			new_lines = new_lines[-self._max_lines:]
+			self._lines = []
+			self._start = 0
+			self._first_line = from_line
+		self._lines.extend(new_lines)
+
+		excess = len(self._lines) - self._start - self._max_lines
+		if excess > 0:
+			self._dropped_lines += excess
+			self._start += excess
+			self._first_line += excess
+			if self._start > len(self._lines) // 2: #Only compact once half of the list is unused -> amortized O(1)
+				del self._lines[:self._start]
+				self._start = 0
+
+		self._last_edited = time.time()
+		self.loadedLinesChanged.emit(new_lines, from_line)
+		self.dataChanged.emit()
+
+
+class ConsoleStreamHandler(logging.Handler):
+	"""Logging handler that writes formatted records to a ConsoleFromStreamItem. Can be used from any thread."""
+
+	def __init__(self, item : ConsoleFromStreamItem, level : int = logging.NOTSET) -> None:
+		super().__init__(level)
+		self._item = item
+
+	def emit(self, record : logging.LogRecord) -> None:
+		try:
+			self._item.write(self.format(record) + "\n")
+		except Exception: #pylint: disable=broad-except
+			self.handleError(record)
@@ -0,0 +1,211 @@
+"""Implements per-line log-level/regex filtering for console-views, stored as compact bitsets"""
+import re
+import typing
+
+import numpy as np
+
+
+def _bools_to_bits(bools : np.ndarray) -> int:
+	"""Packs a boolean array into an int-bitset (bit i = bools[i])"""
+	return int.from_bytes(np.packbits(bools, bitorder="little").tobytes(), "little")
+
+def _bits_to_indexes(bits : int, count : int) -> np.ndarray:
+	"""Returns the indexes of all set bits (below count) in the passed int-bitset"""
+	n_bytes = (count + 7) // 8
+	bits &= (1 << count) - 1
+	unpacked = np.unpackbits(np.frombuffer(bits.to_bytes(n_bytes, "little"), dtype=np.uint8), bitorder="little")
+	return np.flatnonzero(unpacked[:count])
+
+
+class ConsoleLineFilter():
+	"""
+	Keeps track of which lines should be shown, based on their log-level and include/exclude regex-patterns.
+
+	Every line is evaluated once, when it is added using replace_lines(). The result is stored as a bitset (python int)
+	per log-level and per pattern. Changing the enabled levels or turning a pattern on/off is then a bitset-operation
+	over the existing lines instead of a rescan. Only setting a new pattern requires the lines to be searched again.
+
+	The log-level of a line is the first upper-case level-name (e.g. "INFO", "WARNING") it contains as a whole word.
+	Lines without a log-level inherit the level of the line before them, so multi-line records (e.g. tracebacks) are
+	shown/hidden together with the line that started them. Lines before the first line with a level are always shown.
+	"""
+	LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+	LEVEL_ALIASES = {"WARN" : "WARNING", "FATAL" : "CRITICAL"}
+	LEVEL_TOKEN_REGEX = re.compile(r"\n|\b(?:DEBUG|INFO|WARNING|WARN|ERROR|CRITICAL|FATAL)\b") #Whole words only, so
+		# e.g. "INFORMATION" or "ERRORS" do not count as a level
+
+	def __init__(self) -> None:
+		self._token_codes = {"\n" : -1} #Maps each token of LEVEL_TOKEN_REGEX to its index in LEVELS
+		for level_nr, level in enumerate(self.LEVELS):
+			self._token_codes[level] = level_nr
+		for alias, level in self.LEVEL_ALIASES.items():
+			self._token_codes[alias] = self.LEVELS.index(level)
+
+		self._line_count = 0
+		self._level_masks : typing.Dict[str, int] = {level : 0 for level in self.LEVELS}
+		self._own_level_mask = 0 #Lines that contain a level-name themselves (the others inherit their level)
+		self._enabled_levels : typing.Set[str] = set(self.LEVELS)
+
+		self._include_regex : re.Pattern | None = None
+		self._include_mask = 0
+		self._exclude_regex : re.Pattern | None = None
+		self._exclude_mask = 0
+
+	def line_count(self) -> int:
+		"""Returns the number of lines that have been evaluated"""
+		return self._line_count
+
+	def is_active(self) -> bool:
+		"""Returns whether any lines can be hidden by the current filter-settings"""
+		return len(self._enabled_levels) < len(self.LEVELS) \
+			or self._include_regex is not None or self._exclude_regex is not None
+
+	def get_enabled_levels(self) -> typing.Set[str]:
+		"""Returns the log-levels that are shown"""
+		return set(self._enabled_levels)
+
+	def set_enabled_levels(self, levels : typing.Iterable[str]) -> None:
+		"""Set the log-levels to show (from LEVELS), this does not require the lines to be re-evaluated"""
+		self._enabled_levels = {self.LEVEL_ALIASES.get(level.upper(), level.upper()) for level in levels}
+
+	def _first_level_codes(self, lines : typing.List[str]) -> np.ndarray:
+		"""Returns the index (in LEVELS) of the first level-name in each line, -1 if a line contains no level-name.
+		All lines are searched at once, the newlines separating the lines are matched as well to find out to which line
+		each level-name belongs.
+		"""
+		codes = np.full(len(lines), -1, dtype=np.int64)
+		tokens = self.LEVEL_TOKEN_REGEX.findall("\n".join(lines))
+		if len(tokens) == len(lines) - 1: #Only newlines
+			return codes
+		token_codes = np.fromiter(map(self._token_codes.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+		is_newline = token_codes == -1
+		if np.count_nonzero(is_newline) != len(lines) - 1: #Some lines contain newlines themselves (not stripped)
+			return self._first_level_codes([line.replace("\n", " ") for line in lines])
+		rows = np.cumsum(is_newline)[~is_newline]
+		first_rows, first_tokens = np.unique(rows, return_index=True) #Only the first level-name of each line counts
+		codes[first_rows] = token_codes[~is_newline][first_tokens]
+		return codes
+
+	@staticmethod
+	def _pattern_bits(regex : re.Pattern, lines : typing.List[str]) -> int:
+		"""Returns the bitset of all lines in which the passed regex is found"""
+		return _bools_to_bits(np.fromiter(map(bool, map(regex.search, lines)), dtype=bool, count=len(lines)))
+
+	def _level_of_line(self, line_nr : int) -> str | None:
+		"""Returns the (possibly inherited) log-level of the passed line, None if it has no level"""
+		for level, mask in self._level_masks.items():
+			if (mask >> line_nr) & 1:
+				return level
+		return None
+
+	@staticmethod
+	def _set_range(mask : int, offset : int, count : int, bits : int) -> int:
+		"""Replace bits [offset, offset + count) of mask by bits"""
+		return (mask & ~(((1 << count) - 1) << offset)) | (bits << offset)
+
+	def replace_lines(self, lines : typing.List[str], offset : int) -> None:
+		"""Evaluate the passed lines, which replace/append the lines starting at offset
+
+		Args:
+			lines (list[str]): The new/changed lines, without trailing newlines (e.g. processed by ConsoleLineProcessor)
+			offset (int): The index of the first line (<= the current line-count)
+		"""
+		count = len(lines)
+		if count == 0:
+			return
+
+		codes = self._first_level_codes(lines)
+
+		#Lines without a level inherit the level of the line before them
+		previous_level = self._level_of_line(offset - 1) if offset > 0 else None
+		if codes[0] == -1 and previous_level is not None:
+			codes[0] = self.LEVELS.index(previous_level)
+		has_level = codes >= 0
+		self._own_level_mask = self._set_range(self._own_level_mask, offset, count, _bools_to_bits(has_level))
+		codes = codes[np.maximum.accumulate(np.where(has_level, np.arange(count), 0))] #Lines before the first line
+			# with a level map to row 0, which has no level
+
+		for level_nr, level in enumerate(self.LEVELS):
+			self._level_masks[level] = self._set_range(
+				self._level_masks[level], offset, count, _bools_to_bits(codes == level_nr))
+		if self._include_regex is not None:
+			self._include_mask = self._set_range(
+				self._include_mask, offset, count, self._pattern_bits(self._include_regex, lines))
+		if self._exclude_regex is not None:
+			self._exclude_mask = self._set_range(
+				self._exclude_mask, offset, count, self._pattern_bits(self._exclude_regex, lines))
+		self._line_count = max(self._line_count, offset + count)
+		self._propagate_level(offset + count, int(codes[-1]))
+
+	def _propagate_level(self, line_nr : int, level_nr : int) -> None:
+		"""(Re)sets the inherited level of the lines starting at line_nr up to the next line with its own level, e.g.
+		after the line they inherited their level from has been overwritten.
+
+		Args:
+			line_nr (int): The first line that (possibly) inherits its level
+			level_nr (int): The index (in LEVELS) of the level to inherit, -1 for no level
+		"""
+		if line_nr >= self._line_count:
+			return
+		own_levels = self._own_level_mask >> line_nr
+		count = ((own_levels & -own_levels).bit_length() - 1) if own_levels else self._line_count - line_nr
+		if count <= 0:
+			return
+		all_bits = (1 << count) - 1
+		for cur_level_nr, level in enumerate(self.LEVELS):
+			self._level_masks[level] = self._set_range(
+				self._level_masks[level], line_nr, count, all_bits if cur_level_nr == level_nr else 0)
+
+	def trim(self, count : int) -> None:
+		"""Remove the first count lines"""
+		count = min(count, self._line_count)
+		for level in self.LEVELS:
+			self._level_masks[level] >>= count
+		self._own_level_mask >>= count
+		self._include_mask >>= count
+		self._exclude_mask >>= count
+		self._line_count -= count
+
+	def clear_lines(self) -> None:
+		"""Remove all lines, the filter-settings are kept"""
+		self.trim(self._line_count)
+
+	def set_include_pattern(self, pattern : str, lines : typing.List[str], use_regex : bool = True) -> None:
+		"""Only show lines matching the passed pattern, an empty pattern disables the include-filter.
+
+		Args:
+			pattern (str): The pattern
+			lines (list[str]): All current lines, these are searched once using the new pattern
+			use_regex (bool, optional): Whether the pattern is a regular expression. Defaults to True.
+
+		Raises:
+			re.error: If the pattern is not a valid regular expression
+		"""
+		self._include_regex = re.compile(pattern if use_regex else re.escape(pattern)) if pattern else None
+		self._include_mask = self._pattern_bits(self._include_regex, lines) if self._include_regex else 0
+
+	def set_exclude_pattern(self, pattern : str, lines : typing.List[str], use_regex : bool = True) -> None:
+		"""Hide lines matching the passed pattern, an empty pattern disables the exclude-filter.
+		See set_include_pattern for the arguments."""
+		self._exclude_regex = re.compile(pattern if use_regex else re.escape(pattern)) if pattern else None
+		self._exclude_mask = self._pattern_bits(self._exclude_regex, lines) if self._exclude_regex else 0
+
+	def visible_mask(self) -> int:
+		"""Returns the bitset of all lines that should be shown"""
+		all_lines = (1 << self._line_count) - 1
+		any_level = 0
+		shown_levels = 0
+		for level, mask in self._level_masks.items():
+			any_level |= mask
+			if level in self._enabled_levels:
+				shown_levels |= mask
+		visible = shown_levels | (all_lines & ~any_level) #Lines without a level are always shown
+		if self._include_regex is not None:
+			visible &= self._include_mask
+		if self._exclude_regex is not None:
+			visible &= ~self._exclude_mask
+		return visible & all_lines
+
+	def visible_lines(self) -> np.ndarray:
+		"""Returns the (sorted) indexes of all lines that should be shown"""
+		return _bits_to_indexes(self.visible_mask(), self._line_count)
@@ -0,0 +1,294 @@
+"""Implements an ANSI/carriage-return aware line processor, which turns raw console-lines into plain text + styled runs"""
+import re
+import typing
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+
+from PySide6 import QtGui
+
+#(r, g, b) of the 16 basic ANSI colors (0-7 normal, 8-15 bright), same as the xterm defaults
+ANSI_COLORS = (
+	(0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0), (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+	(127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0), (92, 92, 255), (255, 0, 255), (0, 255, 255),
+	(255, 255, 255)
+)
+
+
+def _xterm_256_color(nr : int) -> typing.Tuple[int, int, int]:
+	"""Returns the (r, g, b) of the passed xterm 256-color palette index"""
+	if nr < 16:
+		return ANSI_COLORS[nr]
+	if nr < 232: #6x6x6 color cube
+		nr -= 16
+		levels = (0, 95, 135, 175, 215, 255)
+		return levels[nr // 36], levels[(nr // 6) % 6], levels[nr % 6]
+	grey = 8 + (nr - 232) * 10 #Greyscale ramp
+	return grey, grey, grey
+
+
+@dataclass(frozen=True)
+class AnsiStyle():
+	"""The text-style as set by ANSI SGR-codes, colors are (r, g, b) tuples, None for the default color"""
+	foreground : typing.Tuple[int, int, int] | None = None
+	background : typing.Tuple[int, int, int] | None = None
+	bold : bool = False
+	italic : bool = False
+	underline : bool = False
+
+DEFAULT_STYLE = AnsiStyle()
+
+StyledRun = typing.Tuple[int, int, AnsiStyle] #(start-column, end-column, style) of a styled part of a line
+
+
+class ConsoleLineProcessor():
+	"""
+	Turns raw console-lines, which might contain ANSI escape-sequences (colors, erase-line) and carriage-returns
+	(e.g. progress-bars that overwrite the same line), into the plain text that a terminal would show, together with
+	the styled runs of that text.
+
+	Results are cached per raw line, so a line is only parsed once, even if it is displayed/searched several times.
+	Lines without escape-sequences, carriage-returns or backspaces (the large majority) skip parsing altogether.
+	"""
+	#CSI-sequences (e.g. colors, erase-line), OSC-sequences (e.g. window-title), other escape-sequences, carriage-returns
+	# and backspaces
+	CONTROL_REGEX = re.compile(r"(\x1b\[([0-9;:?]*)[ -/]*([@-~])|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)?|\x1b[@-_]?|\r|\x08)")
+
+	def __init__(self, max_cache_size : int = 20_000) -> None:
+		"""
+		Args:
+			max_cache_size (int, optional): The maximum number of processed lines to cache, the least recently used
+				lines are removed first. Defaults to 20_000.
+		"""
+		self._max_cache_size = max_cache_size
+		self._cache : OrderedDict[str, typing.Tuple[str, typing.List[StyledRun] | None]] = OrderedDict()
+		self._char_formats : typing.Dict[AnsiStyle, QtGui.QTextCharFormat] = {}
+		#The same few color-codes are used over and over, so each distinct style is only created once, styles can then be
+		# compared by identity
+		self._sgr_results : typing.Dict[typing.Tuple[AnsiStyle, str], AnsiStyle] = {} #(style, SGR-params) -> new style
+		self._styles : typing.Dict[AnsiStyle, AnsiStyle] = {DEFAULT_STYLE : DEFAULT_STYLE}
+
+	def process_line(self, line : str) -> typing.Tuple[str, typing.List[StyledRun] | None]:
+		"""Returns the (plain text, styled runs) of the passed raw line, the trailing newline is removed.
+		Runs are None if the line has no styling.
+		"""
+		line = line.rstrip("\r\n") if line.endswith("\n") else line
+		if "\x1b" not in line and "\r" not in line and "\x08" not in line:
+			return line, None
+
+		cached = self._cache.get(line)
+		if cached is not None:
+			self._cache.move_to_end(line)
+			return cached
+		if "\x1b" not in line and "\x08" not in line:
+			result = (self.collapse_carriage_returns(line), None)
+		else:
+			result = (None if "\r" in line or "\x08" in line else self._parse_colors_only(line)) or self._parse(line)
+		self._cache[line] = result
+		if len(self._cache) > self._max_cache_size:
+			self._cache.popitem(last=False)
+		return result
+
+	def process_lines(self, lines : typing.Iterable[str]
+			) -> typing.Tuple[typing.List[str], typing.List[typing.List[StyledRun] | None]]:
+		"""Returns the plain texts and styled runs of the passed raw lines, see process_line"""
+		texts = []
+		runs = []
+		for line in lines:
+			text, line_runs = self.process_line(line)
+			texts.append(text)
+			runs.append(line_runs)
+		return texts, runs
+
+	def to_plain_lines(self, lines : typing.Iterable[str]) -> typing.List[str]:
+		"""Returns the plain text of each of the passed raw lines"""
+		return [self.process_line(line)[0] for line in lines]
+
+	def clear_cache(self) -> None:
+		"""Remove all cached lines"""
+		self._cache.clear()
+
+	@staticmethod
+	def collapse_carriage_returns(line : str) -> str:
+		"""Returns the text a terminal would show for the passed line (without escape-sequences): each carriage-return
+		moves the cursor back to the start of the line, after which the text overwrites the already written characters.
+		"""
+		result = ""
+		for part in line.split("\r"):
+			result = part + result[len(part):]
+		return result
+
+	def _get_sgr_result(self, style : AnsiStyle, params : str) -> AnsiStyle:
+		new_style = self._sgr_results.get((style, params))
+		if new_style is None:
+			new_style = self._apply_sgr(style, params)
+			new_style = self._styles.setdefault(new_style, new_style)
+			self._sgr_results[(style, params)] = new_style
+		return new_style
+
+	def _parse_colors_only(self, line : str) -> typing.Tuple[str, typing.List[StyledRun] | None] | None:
+		"""Fast path for lines of which all control-sequences are SGR-codes (e.g. colored log-output), text is then
+		only appended so runs can be created per text-part instead of per character.
+		Returns None if the line contains other control-sequences."""
+		parts : typing.List[str] = []
+		runs : typing.List[StyledRun] = []
+		col = 0
+		pos = 0
+		style = DEFAULT_STYLE
+		for match in self.CONTROL_REGEX.finditer(line):
+			if match.group(3) != "m":
+				return None
+			if match.start() > pos:
+				text = line[pos:match.start()]
+				parts.append(text)
+				if style is not DEFAULT_STYLE:
+					if len(runs) > 0 and runs[-1][1] == col and runs[-1][2] is style: #Merge with previous run
+						runs[-1] = (runs[-1][0], col + len(text), style)
+					else:
+						runs.append((col, col + len(text), style))
+				col += len(text)
+			pos = match.end()
+			style = self._get_sgr_result(style, match.group(2))
+		if pos < len(line):
+			parts.append(line[pos:])
+			if style is not DEFAULT_STYLE:
+				runs.append((col, col + len(line) - pos, style))
+		return "".join(parts), (runs if len(runs) > 0 else None)
+
+	@classmethod
+	def compact_carriage_returns(cls, line : str) -> str:
+		"""Collapse the carriage-return overwrites in the passed raw line up to its last carriage-return. Used for
+		incomplete lines that are still being written to, so a progress-bar that keeps overwriting the same line does
+		not keep growing it. Lines containing escape-sequences/backspaces are kept as-is, as the style/cursor at the
+		carriage-return would be lost.
+		"""
+		head, carriage_return, tail = line.rpartition("\r")
+		if "\r" not in head or "\x1b" in head or "\x08" in head:
+			return line
+		return cls.collapse_carriage_returns(head) + carriage_return + tail
+
+	def _parse(self, line : str) -> typing.Tuple[str, typing.List[StyledRun] | None]:
+		"""Emulates a single terminal-line: text is written at the cursor, carriage-returns/backspaces/cursor-moves
+		move the cursor, SGR-codes change the style and erase-line codes remove text."""
+		chars : typing.List[str] = []
+		styles : typing.List[AnsiStyle] = []
+		cursor = 0
+		style = DEFAULT_STYLE
+		pos = 0
+
+		def write(text : str) -> None:
+			nonlocal cursor
+			end = cursor + len(text)
+			if cursor > len(chars): #Cursor was moved beyond the end of the line -> pad with spaces
+				chars.extend(" " * (cursor - len(chars)))
+				styles.extend([DEFAULT_STYLE] * (cursor - len(styles)))
+			chars[cursor:end] = text
+			styles[cursor:end] = [style] * len(text)
+			cursor = end
+
+		for match in self.CONTROL_REGEX.finditer(line):
+			if match.start() > pos:
+				write(line[pos:match.start()])
+			pos = match.end()
+			token = match.group(0)
+			if token == "\r":
+				cursor = 0
+			elif token == "\x08":
+				cursor = max(0, cursor - 1)
+			elif match.group(3) is not None: #CSI-sequence
+				params, command = match.group(2), match.group(3)
+				if command == "m":
+					style = self._get_sgr_result(style, params)
+				elif command == "K":
+					mode = params or "0"
+					if mode == "0": #Erase to end of line
+						del chars[cursor:]
+						del styles[cursor:]
+					elif mode == "1": #Erase to start of line
+						end = min(cursor + 1, len(chars))
+						chars[:end] = " " * end
+						styles[:end] = [DEFAULT_STYLE] * end
+					elif mode == "2": #Erase whole line
+						chars.clear()
+						styles.clear()
+				elif command == "C": #Cursor forward
+					cursor += int(params) if params.isdigit() else 1
+				elif command == "D": #Cursor back
+					cursor = max(0, cursor - (int(params) if params.isdigit() else 1))
+				elif command == "G": #Cursor to column (1-based)
+					cursor = max(0, (int(params) if params.isdigit() else 1) - 1)
+				#Other sequences (e.g. cursor up/down, scrolling) can not be represented in a single line -> ignored
+		if pos < len(line):
+			write(line[pos:])
+
+		runs : typing.List[StyledRun] = []
+		run_start = 0
+		for col in range(1, len(styles) + 1):
+			if col == len(styles) or styles[col] is not styles[run_start]: #Styles are shared (see _sgr_results)
+				if styles[run_start] is not DEFAULT_STYLE:
+					runs.append((run_start, col, styles[run_start]))
+				run_start = col
+		return "".join(chars), (runs if len(runs) > 0 else None)
+
+	@staticmethod
+	def _apply_sgr(style : AnsiStyle, params : str) -> AnsiStyle:
+		"""Returns the style after applying the passed (;-separated) SGR-parameters"""
+		codes = [int(code) if code.isdigit() else 0 for code in params.replace(":", ";").split(";")] if params else [0]
+		changes : typing.Dict[str, typing.Any] = {}
+		i = 0
+		while i < len(codes):
+			code = codes[i]
+			if code == 0:
+				style = DEFAULT_STYLE
+				changes = {}
+			elif code == 1:
+				changes["bold"] = True
+			elif code == 3:
+				changes["italic"] = True
+			elif code == 4:
+				changes["underline"] = True
+			elif code == 22:
+				changes["bold"] = False
+			elif code == 23:
+				changes["italic"] = False
+			elif code == 24:
+				changes["underline"] = False
+			elif 30 <= code <= 37:
+				changes["foreground"] = ANSI_COLORS[code - 30]
+			elif 90 <= code <= 97:
+				changes["foreground"] = ANSI_COLORS[code - 90 + 8]
+			elif code == 39:
+				changes["foreground"] = None
+			elif 40 <= code <= 47:
+				changes["background"] = ANSI_COLORS[code - 40]
+			elif 100 <= code <= 107:
+				changes["background"] = ANSI_COLORS[code - 100 + 8]
+			elif code == 49:
+				changes["background"] = None
+			elif code in (38, 48) and i + 1 < len(codes): #Extended colors: 38;5;<n> or 38;2;<r>;<g>;<b>
+				key = "foreground" if code == 38 else "background"
+				if codes[i + 1] == 5 and i + 2 < len(codes):
+					changes[key] = _xterm_256_color(min(codes[i + 2], 255))
+					i += 2
+				elif codes[i + 1] == 2 and i + 4 < len(codes):
+					changes[key] = tuple(min(value, 255) for value in codes[i + 2 : i + 5])
+					i += 4
+			i += 1
+		return replace(style, **changes) if changes else style
+
+	def get_char_format(self, style : AnsiStyle) -> QtGui.QTextCharFormat:
+		"""Returns the (cached) QTextCharFormat of the passed style"""
+		char_format = self._char_formats.get(style)
+		if char_format is None:
+			char_format = QtGui.QTextCharFormat()
+			if style.foreground is not None:
+				char_format.setForeground(QtGui.QColor(*style.foreground))
+			if style.background is not None:
+				char_format.setBackground(QtGui.QColor(*style.background))
+			if style.bold:
+				char_format.setFontWeight(QtGui.QFont.Weight.Bold)
+			if style.italic:
+				char_format.setFontItalic(True)
+			if style.underline:
+				char_format.setFontUnderline(True)
+			self._char_formats[style] = char_format
+		return char_format
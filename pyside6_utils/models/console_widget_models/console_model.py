@@ -2,10 +2,11 @@
 We can then choose to implement custom sub-class of this model.
 """
 
+import math
 import typing
 from abc import abstractmethod
 
-from PySide6 import QtCore, QtWidgets
+from PySide6 import QtCore, QtGui, QtWidgets
 
 
 class BaseConsoleItem(QtCore.QObject): #TODO: AbstractQObjectMeta
@@ -29,6 +30,28 @@ class BaseConsoleItem(QtCore.QObject): #TODO: AbstractQObjectMeta
 		"""
 		raise NotImplementedError()
 
+	def get_first_line(self) -> int:
+		"""Returns the line-index of the first line that is still kept by this item, lines before it have been dropped
+		(e.g. because of a maximum number of lines). Uses get_current_line_list() by default, items that drop lines
+		should override this if retrieving the line-list is expensive."""
+		return self.get_current_line_list()[1]
+
+	def get_metrics(self) -> typing.Dict[str, float]:
+		"""Returns throughput counters of this item (since its creation), used for instrumentation (see
+		ConsoleWidget.get_metrics). Items can provide any of the following keys (all optional):
+			- lines_read: The number of (complete or incomplete) lines emitted
+			- bytes_read: The number of bytes (or characters) read/received
+			- dropped_lines: The number of lines dropped because the item could not keep them (e.g. max_lines)
+			- last_change_time: The time (time.time()) at which the newest emitted text was written, used to measure
+				the latency from writing to displaying
+		Returns an empty dict by default.
+		"""
+		return {}
+
+	def close(self) -> None:
+		"""Release the resources (e.g. threads, processes, shared memory) used by this item, the item should not be used
+		afterwards. Does nothing by default."""
+
 
 class ConsoleModel(QtCore.QAbstractItemModel):
 	"""Small class to overload data-representation of the file-selection treeview based on recency
@@ -36,25 +59,69 @@ class ConsoleModel(QtCore.QAbstractItemModel):
 
 	Is compatible with ConsoleFromFileItems
 
+	Keeps a item -> row index, so the row of an item that emits dataChanged (e.g. new last-edit date) is found in O(1)
+	and only that row is reported as changed. A sort-proxy on top of this model then only moves the changed row.
+	Multiple items can be added/removed at once using add_items/remove_items, which use a single insert/remove
+	per contiguous block of rows.
+
+	Items that emitted dataChanged (e.g. new output) in the past recent_activity_duration seconds are displayed in bold.
+	Expiry is tracked using a timer wheel: a single timer that only runs while items are active, which advances one
+	slot every activity_resolution seconds and only emits dataChanged for the rows whose activity expires in that slot.
+
 	NOTE: this model does not seem to work with treeviews, only tableviews
 	"""
-	def __init__(self, *args, **kwargs):
+	def __init__(self, *args, recent_activity_duration : float = 3.0, activity_resolution : float = 0.25, **kwargs):
+		"""
+		Args:
+			recent_activity_duration (float, optional): The number of seconds an item is displayed in bold after it
+				changed. 0 to disable. Defaults to 3.0.
+			activity_resolution (float, optional): The interval in seconds at which activity is expired.
+				Defaults to 0.25.
+
+		Raises:
+			ValueError: If activity_resolution is not positive, or recent_activity_duration is negative
+		"""
+		if activity_resolution <= 0:
+			raise ValueError(f"activity_resolution should be positive, got {activity_resolution}")
+		if recent_activity_duration < 0:
+			raise ValueError(f"recent_activity_duration should be 0 or positive, got {recent_activity_duration}")
 		super().__init__(*args, **kwargs)
 		self._console_pixmap = QtWidgets.QStyle.StandardPixmap.SP_TitleBarMaxButton
 		self._console_icon = QtWidgets.QApplication.style().standardIcon(self._console_pixmap)
-		self._item_list = [] #List of ConsoleStandardItem's
+		self._item_list : typing.List[BaseConsoleItem] = [] #List of ConsoleStandardItem's
+		self._item_rows : typing.Dict[BaseConsoleItem, int] = {} #Row of each item in self._item_list
+
+		self._active_font = QtGui.QFont()
+		self._active_font.setBold(True)
+		#Timer wheel, an item that is active until tick T is stored in slot T % len(slots). All items expire within
+		# activity_ticks ticks, so each slot only contains items that expire at the same tick
+		self._activity_ticks = math.ceil(recent_activity_duration / activity_resolution)
+		self._activity_slots : typing.List[typing.Set[BaseConsoleItem]] = \
+			[set() for _ in range(self._activity_ticks + 1)]
+		self._activity_expiry : typing.Dict[BaseConsoleItem, int] = {} #Tick at which each active item expires
+		self._activity_tick = 0
+		self._activity_timer = QtCore.QTimer(self)
+		self._activity_timer.setInterval(max(1, int(activity_resolution * 1000)))
+		self._activity_timer.timeout.connect(self._advance_activity_wheel)
 
 	def columnCount(self, parent : QtCore.QModelIndex = QtCore.QModelIndex()) -> int: #pylint: disable=unused-argument
 		return 3
 
-	def removeRow(self, row: int, parent : QtCore.QModelIndex) -> bool:
-		self.beginRemoveRows(parent, row, row)
-		# self._item_list.pop(row)
-		del self._item_list[row]
+	def removeRows(self, row : int, count : int, parent : QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+		if parent.isValid() or count <= 0 or row < 0 or row + count > len(self._item_list):
+			return False
+		self.beginRemoveRows(parent, row, row + count - 1)
+		for item in self._item_list[row : row + count]:
+			self._remove_from_model(item)
+		del self._item_list[row : row + count]
+		for new_row in range(row, len(self._item_list)): #Shift the rows of all items after the removed rows
+			self._item_rows[self._item_list[new_row]] = new_row
 		self.endRemoveRows()
-		self.modelReset.emit() #Why is this needed?
 		return True
 
+	def removeRow(self, row: int, parent : QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+		return self.removeRows(row, 1, parent)
+
 	def rowCount(self, parent : QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
 		if not parent.isValid(): #If model index is not valid -> top level item -> so all items
 			return len(self._item_list)
@@ -80,18 +147,63 @@ class ConsoleModel(QtCore.QAbstractItemModel):
 		else: #If item -> no children
 			return QtCore.QModelIndex()
 
+	def get_row(self, item : BaseConsoleItem) -> int:
+		"""Returns the row of the passed item, or -1 if the item is not in this model"""
+		return self._item_rows.get(item, -1)
+
+	def is_recently_active(self, item : BaseConsoleItem) -> bool:
+		"""Returns whether the passed item changed in the past recent_activity_duration seconds"""
+		return item in self._activity_expiry
+
+	def _on_item_data_changed(self) -> None:
+		"""Emit dataChanged for the row of the item that emitted dataChanged and mark it as recently active"""
+		item : BaseConsoleItem = self.sender() #type: ignore
+		row = self._item_rows.get(item, -1)
+		if row < 0:
+			return
+		if self._activity_ticks > 0: #(Re)schedule the expiry of the activity of this item
+			expiry = self._activity_tick + self._activity_ticks
+			old_expiry = self._activity_expiry.get(item, None)
+			if old_expiry != expiry:
+				if old_expiry is not None:
+					self._activity_slots[old_expiry % len(self._activity_slots)].discard(item)
+				self._activity_slots[expiry % len(self._activity_slots)].add(item)
+				self._activity_expiry[item] = expiry
+				if not self._activity_timer.isActive():
+					self._activity_timer.start()
+		self.dataChanged.emit(self.createIndex(row, 0, item), self.createIndex(row, self.columnCount() - 1, item))
+
+	def _advance_activity_wheel(self) -> None:
+		"""Advance the timer wheel by one tick and emit dataChanged (font only) for the rows whose activity expired"""
+		self._activity_tick += 1
+		slot = self._activity_tick % len(self._activity_slots)
+		expired, self._activity_slots[slot] = self._activity_slots[slot], set()
+		for item in expired:
+			del self._activity_expiry[item]
+		if len(self._activity_expiry) == 0: #Only keep ticking while items are active
+			self._activity_timer.stop()
 
+		rows = sorted(self._item_rows[item] for item in expired)
+		block_start = 0
+		for i in range(1, len(rows) + 1): #Emit a single dataChanged per block of contiguous rows
+			if i == len(rows) or rows[i] != rows[i - 1] + 1:
+				self.dataChanged.emit(self.index(rows[block_start], 0), self.index(rows[i - 1], 0),
+					[QtCore.Qt.ItemDataRole.FontRole])
+				block_start = i
+
+	def _remove_from_model(self, item : BaseConsoleItem) -> None:
+		"""Disconnect the passed item and remove it from the row-index and timer wheel, its row is removed by the caller"""
+		item.dataChanged.disconnect(self._on_item_data_changed)
+		del self._item_rows[item]
+		expiry = self._activity_expiry.pop(item, None)
+		if expiry is not None:
+			self._activity_slots[expiry % len(self._activity_slots)].discard(item)
 
 	def append_row(self, item : BaseConsoleItem):
 		"""Append a row to the model - consisting of a single ConsoleStandardItem
 
 		"""
-		self.beginInsertRows(QtCore.QModelIndex(), self.rowCount(), self.rowCount())
-		self._item_list.append(item)
-		item.dataChanged.connect(
-			lambda *_ : self.dataChanged.emit(self.index(self.rowCount()-1, 0), self.index(self.rowCount()-1, 2)))
-
-		self.endInsertRows()
+		self.add_items([item])
 
 	def add_item (self, item : BaseConsoleItem):
 		"""Add an item to the model, same as append_row
@@ -99,9 +211,76 @@ class ConsoleModel(QtCore.QAbstractItemModel):
 		Args:
 			item (ConsoleStandardItem): The item to add
 		"""
-		self.append_row(item)
+		self.add_items([item])
+
+	def add_items(self, items : typing.Iterable[BaseConsoleItem]) -> None:
+		"""Append multiple items to the model at once (a single row-insertion). Items that are already in the model
+		are skipped.
+
+		Args:
+			items (Iterable[BaseConsoleItem]): The items to add
+		"""
+		new_items = []
+		for item in items:
+			if item not in self._item_rows:
+				self._item_rows[item] = -1 #Mark as added, so duplicates in the passed items are skipped as well
+				new_items.append(item)
+		if len(new_items) == 0:
+			return
+		first_row = len(self._item_list)
+		self.beginInsertRows(QtCore.QModelIndex(), first_row, first_row + len(new_items) - 1)
+		for row, item in enumerate(new_items, start=first_row):
+			self._item_list.append(item)
+			self._item_rows[item] = row
+			item.dataChanged.connect(self._on_item_data_changed)
+		self.endInsertRows()
+
+	def remove_item(self, item : BaseConsoleItem) -> bool:
+		"""Remove the passed item from the model
+
+		Args:
+			item (BaseConsoleItem): The item to remove
+
+		Returns:
+			bool: Whether the item was found (and removed)
+		"""
+		return self.remove_items([item]) == 1
+
+	def remove_items(self, items : typing.Iterable[BaseConsoleItem]) -> int:
+		"""Remove multiple items from the model at once, using a single row-removal per block of contiguous rows.
+
+		Args:
+			items (Iterable[BaseConsoleItem]): The items to remove, items that are not in the model are ignored
+
+		Returns:
+			int: The number of removed items
+		"""
+		rows = sorted({self._item_rows[item] for item in items if item in self._item_rows})
+		if len(rows) == 0:
+			return 0
+		if len(rows) == 1:
+			self.removeRows(rows[0], 1)
+			return 1
+
+		blocks = [] #(first row, count) of each contiguous block of rows
+		for row in rows:
+			if len(blocks) > 0 and blocks[-1][0] + blocks[-1][1] == row:
+				blocks[-1][1] += 1
+			else:
+				blocks.append([row, 1])
+
+		#Remove the blocks without updating the row-index in between, so the rows after each block are only shifted once
+		for first_row, count in reversed(blocks): #Last block first, so the rows of earlier blocks remain valid
+			self.beginRemoveRows(QtCore.QModelIndex(), first_row, first_row + count - 1)
+			for item in self._item_list[first_row : first_row + count]:
+				self._remove_from_model(item)
+			del self._item_list[first_row : first_row + count]
+			self.endRemoveRows()
+		for new_row in range(rows[0], len(self._item_list)):
+			self._item_rows[self._item_list[new_row]] = new_row
+		return len(rows)
 
-	#Overload the data method to return bold text if changes have been made in the past x seconds
+	#Overload the data method to return bold text if changes have been made in the past recent_activity_duration seconds
 	def data(self, index : QtCore.QModelIndex, role : QtCore.Qt.ItemDataRole = QtCore.Qt.ItemDataRole.DisplayRole):
 		#Check if index is valid
 		if not index.isValid(): #if index is not valid, return None
@@ -116,6 +295,8 @@ class ConsoleModel(QtCore.QAbstractItemModel):
 			return item.data(role=role, column=index.column()) #Return the data (str) of the item
 		elif role == QtCore.Qt.ItemDataRole.DecorationRole:
 			return self._console_icon
+		elif role == QtCore.Qt.ItemDataRole.FontRole:
+			return self._active_font if item in self._activity_expiry else None
 		elif role == QtCore.Qt.ItemDataRole.UserRole + 1:
 			return item
 		else:
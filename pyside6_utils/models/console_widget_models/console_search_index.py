@@ -0,0 +1,216 @@
+"""Implements an incrementally built search-index over the lines of a console item"""
+import bisect
+import itertools
+import re
+import typing
+
+from PySide6 import QtCore
+
+
+class ConsoleSearchIndex(QtCore.QObject):
+	"""
+	Keeps track of all matches of a (regex) pattern over the lines of a console item.
+	Lines are indexed in chunks: the first chunk is searched right away so the first hits are available immediately,
+	the remaining chunks are searched in the background (using a zero-interval timer) so the UI stays responsive.
+
+	New/changed lines are passed using process_line_change() (same convention as BaseConsoleItem.loadedLinesChanged),
+	only those lines are searched. Matches are kept as a sorted list which is updated, not rebuilt, when lines come in.
+	Lines that the item drops (e.g. because of max_lines) should be dropped from the index as well using trim().
+
+	Each chunk is searched by joining its lines and running the compiled pattern (in multiline-mode, so ^ and $ match at
+	the start/end of each line) over the result, matches are then mapped back to (line-index, start-column, end-column).
+	Matches never span multiple lines: if a match crosses the end of its line, that line is searched on its own.
+	"""
+	matchesChanged = QtCore.Signal() #Emitted when matches have been added or removed
+
+	def __init__(self, parent : typing.Optional[QtCore.QObject] = None, chunk_size : int = 20_000) -> None:
+		"""
+		Args:
+			parent (QtCore.QObject, optional): The parent. Defaults to None.
+			chunk_size (int, optional): The number of lines to search at once before returning control to the event
+				loop. Defaults to 20_000.
+		"""
+		super().__init__(parent)
+		self._chunk_size = chunk_size
+		self._lines : typing.List[str] = [] #Mirror of the lines of the item
+		self._first_line = 0 #Line-index of self._lines[0]
+		self._indexed_up_to = 0 #Line-index up to which (exclusive) lines have been searched
+		self._regex : re.Pattern | None = None
+
+		self._match_lines : typing.List[int] = [] #Sorted line-index per match
+		self._match_spans : typing.List[typing.Tuple[int, int]] = [] #(start, end)-column per match
+
+		self._index_timer = QtCore.QTimer(self)
+		self._index_timer.setSingleShot(True)
+		self._index_timer.setInterval(0)
+		self._index_timer.timeout.connect(self._index_next_chunk)
+
+	def set_lines(self, line_list : typing.List[str], first_line : int = 0) -> None:
+		"""(Re)set the lines to search, e.g. using BaseConsoleItem.get_current_line_list(). All matches are rebuilt.
+
+		Args:
+			line_list (list[str]): The lines
+			first_line (int, optional): The line-index of the first line. Defaults to 0.
+		"""
+		self._lines = list(line_list)
+		self._first_line = first_line
+		self._reset_matches()
+
+	def trim(self, first_line : int) -> int:
+		"""Drop all lines (and their matches) before the passed line-index, e.g. when the item itself has dropped them
+		because of a maximum number of lines.
+
+		Args:
+			first_line (int): The line-index of the first line to keep
+
+		Returns:
+			int: The number of removed matches
+		"""
+		if first_line <= self._first_line:
+			return 0
+		del self._lines[:first_line - self._first_line]
+		self._first_line = first_line
+		self._indexed_up_to = max(self._indexed_up_to, first_line)
+		removed = bisect.bisect_left(self._match_lines, first_line)
+		if removed > 0:
+			del self._match_lines[:removed]
+			del self._match_spans[:removed]
+			self.matchesChanged.emit()
+		return removed
+
+	def get_first_line(self) -> int:
+		"""Returns the line-index of the first (kept) line"""
+		return self._first_line
+
+	def clear(self) -> None:
+		"""Remove all lines and matches"""
+		self.set_lines([], 0)
+
+	def set_pattern(self, pattern : str, case_sensitive : bool = False, use_regex : bool = False) -> None:
+		"""Set the pattern to search for. The first chunk of lines is searched right away.
+
+		Args:
+			pattern (str): The text or regex to search for, an empty pattern removes all matches.
+			case_sensitive (bool, optional): Whether the search is case-sensitive. Defaults to False.
+			use_regex (bool, optional): Whether the pattern is a regular expression. Defaults to False.
+
+		Raises:
+			re.error: If use_regex is True and the pattern is not a valid regular expression
+		"""
+		if not pattern:
+			self._regex = None
+		else:
+			self._regex = re.compile(
+				pattern if use_regex else re.escape(pattern),
+				re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE
+			)
+		self._reset_matches()
+
+	def has_pattern(self) -> bool:
+		"""Returns whether a pattern has been set"""
+		return self._regex is not None
+
+	def _reset_matches(self) -> None:
+		self._index_timer.stop()
+		self._match_lines = []
+		self._match_spans = []
+		self._indexed_up_to = self._first_line
+		self.matchesChanged.emit()
+		self._index_next_chunk() #Search first chunk right away
+
+	def process_line_change(self, new_line_list : typing.List[str], from_line : int) -> None:
+		"""Replace/append the passed lines, starting at from_line, only the new/changed lines are (re-)searched.
+
+		Args:
+			new_line_list (list[str]): The new/changed lines
+			from_line (int): The line-index from which the lines replace/append the current lines
+		"""
+		offset = from_line - self._first_line
+		if offset < 0:
+			new_line_list = new_line_list[-offset:]
+			offset = 0
+		offset = min(offset, len(self._lines)) #Gap in line-indexes -> append at the end
+		self._lines[offset:offset + len(new_line_list)] = new_line_list
+
+		changed_from = self._first_line + offset
+		if changed_from < self._indexed_up_to: #Lines were overwritten -> drop their matches and search them again
+			remove_from = bisect.bisect_left(self._match_lines, changed_from)
+			if remove_from < len(self._match_lines):
+				del self._match_lines[remove_from:]
+				del self._match_spans[remove_from:]
+				self.matchesChanged.emit()
+			self._indexed_up_to = changed_from
+
+		if self._regex is not None and not self._index_timer.isActive():
+			self._index_timer.start()
+
+	def _index_next_chunk(self) -> None:
+		"""Search the next chunk of lines that has not been searched yet"""
+		if self._regex is None:
+			return
+		start = self._indexed_up_to - self._first_line
+		stop = min(start + self._chunk_size, len(self._lines))
+		if start >= stop:
+			return
+
+		chunk = self._lines[start:stop]
+		text = "\n".join(chunk)
+		line_starts = None #Offset of each line in the joined chunk, only calculated if there are any matches
+		found = False
+		pos = 0
+		while pos <= len(text):
+			match = self._regex.search(text, pos)
+			if match is None:
+				break
+			if line_starts is None:
+				line_starts = [0, *itertools.accumulate(len(line) + 1 for line in chunk)]
+			row = bisect.bisect_right(line_starts, match.start()) - 1
+			if match.end() <= line_starts[row] + len(chunk[row]): #Match lies within a single line
+				pos = match.end() if match.end() > match.start() else match.end() + 1
+				if match.end() == match.start(): #Skip empty matches (e.g. "^" or ".*")
+					continue
+				self._match_lines.append(self._first_line + start + row)
+				self._match_spans.append((match.start() - line_starts[row], match.end() - line_starts[row]))
+				found = True
+				continue
+			#Match crosses the end of its line (e.g. "\s+" or a pattern containing "\n") -> search this line on its own,
+			# from where the match started, and continue at the next line
+			for line_match in self._regex.finditer(chunk[row], match.start() - line_starts[row]):
+				if line_match.end() > line_match.start():
+					self._match_lines.append(self._first_line + start + row)
+					self._match_spans.append(line_match.span())
+					found = True
+			pos = line_starts[row + 1]
+
+		self._indexed_up_to = self._first_line + stop
+		if stop < len(self._lines):
+			self._index_timer.start()
+		if found:
+			self.matchesChanged.emit()
+
+	def is_indexing(self) -> bool:
+		"""Returns whether there are still lines that have not been searched"""
+		return self._regex is not None and self._indexed_up_to < self._first_line + len(self._lines)
+
+	def match_count(self) -> int:
+		"""Returns the number of matches found so far"""
+		return len(self._match_lines)
+
+	def get_match(self, match_nr : int) -> typing.Tuple[int, int, int]:
+		"""Returns the (line-index, start-column, end-column) of the passed match"""
+		return (self._match_lines[match_nr], *self._match_spans[match_nr])
+
+	def matches_in_range(self, first_line : int, last_line : int) -> typing.List[typing.Tuple[int, int, int]]:
+		"""Returns all matches (line-index, start-column, end-column) between first_line and last_line (inclusive)"""
+		lo = bisect.bisect_left(self._match_lines, first_line)
+		hi = bisect.bisect_right(self._match_lines, last_line)
+		return [(self._match_lines[i], *self._match_spans[i]) for i in range(lo, hi)]
+
+	def next_match_nr(self, line : int) -> int:
+		"""Returns the number of the first match at or after the passed line-index, or -1 if there is none"""
+		match_nr = bisect.bisect_left(self._match_lines, line)
+		return match_nr if match_nr < len(self._match_lines) else -1
+
+	def previous_match_nr(self, line : int) -> int:
+		"""Returns the number of the last match at or before the passed line-index, or -1 if there is none"""
+		return bisect.bisect_right(self._match_lines, line) - 1
@@ -0,0 +1,154 @@
+"""
+Implements a per-dataclass-type cache of the field-metadata that is displayed by the DataclassModel, so it is derived
+from the fields only once instead of on every data()-call.
+"""
+import copy
+import dataclasses
+import datetime
+import enum
+import logging
+import typing
+import weakref
+
+from pyside6_utils.classes.constraints import make_constraint
+
+log = logging.getLogger(__name__)
+
+IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, range, frozenset, enum.Enum, datetime.datetime,
+	datetime.date, datetime.time, datetime.timedelta, type)
+
+
+def is_immutable(value : typing.Any) -> bool:
+	"""Returns whether the passed value is (known to be) immutable, tuples are immutable if all their items are"""
+	if isinstance(value, tuple):
+		return all(is_immutable(item) for item in value)
+	return isinstance(value, IMMUTABLE_TYPES)
+
+
+class HasNoDefaultError(Exception):
+	"""Raised when a field has no default value"""
+
+
+class DataclassFieldInfo():
+	"""The metadata of a single dataclass-field as displayed by the DataclassModel (see the DataclassModel-docstring
+	for the supported metadata-keywords). Derived from the field once per dataclass-type, see get_field_infos().
+	"""
+	__slots__ = ("field", "name", "display_name", "help", "type", "type_name", "has_default", "default",
+		"default_is_immutable", "required", "editable", "constraints", "compiled_constraints", "constraints_error", "tooltip",
+		"search_text")
+
+	def __init__(self, field : dataclasses.Field) -> None:
+		self.field = field
+		self.name = field.name
+		metadata = field.metadata
+		self.display_name : str = metadata.get("display_name", field.name)
+		self.help : str = metadata.get("help", "")
+		self.type = field.type
+		try:
+			self.type_name : str = field.type.__name__ #type: ignore
+		except AttributeError: #E.g. uniontype has no __name__ attribute
+			self.type_name = str(field.type)
+		self.required : bool = metadata.get("required", False)
+		self.editable : bool = metadata.get("editable", True)
+		self.constraints : typing.List[typing.Any] | None = metadata.get("constraints", None)
+		self.compiled_constraints : typing.List[typing.Any] = [] #Converted once, see validate()
+		self.constraints_error : str | None = None #Set if the constraints could not be converted
+		if self.constraints:
+			try:
+				self.compiled_constraints = [make_constraint(constraint) for constraint in self.constraints]
+			except ValueError as exception: #Unknown constraint
+				self.constraints_error = f"Could not validate, invalid constraints - {exception}"
+				log.warning(f"Invalid constraints for field {field.name} - {exception}")
+
+		self.has_default = False
+		self.default = None
+		if field.default is not dataclasses.MISSING:
+			self.has_default = True
+			self.default = field.default
+		elif field.default_factory is not dataclasses.MISSING:
+			try:
+				self.default = field.default_factory()
+				self.has_default = True
+			except Exception as exception: #pylint: disable=broad-except
+				log.warning(f"Could not create the default value of field {field.name} - "
+					f"{type(exception).__name__}: {exception}")
+		self.default_is_immutable = is_immutable(self.default) #If not, get_default() returns copies
+
+		tooltip = self.help
+		if self.required:
+			tooltip += " <b style='color:red'>(required)</b>"
+		tooltip += f" (type: {self.type_name[:20]})"
+		if self.has_default:
+			tooltip += f" (default: {str(self.default)[:20]})"
+		self.tooltip = tooltip
+		self.search_text = f"{self.name}\n{self.display_name}\n{self.help}".lower() #Searched by the filter proxy
+
+	def get_default(self) -> typing.Any:
+		"""Returns the (cached) default value of the field. Mutable defaults (e.g. from a default_factory) are copied,
+		so the cached default can not be modified through the returned value.
+
+		Raises:
+			HasNoDefaultError: If the field has no default value
+		"""
+		if not self.has_default:
+			raise HasNoDefaultError(f"Could not get default value for field {self.name}")
+		return self.default if self.default_is_immutable else copy.deepcopy(self.default)
+
+	def is_default(self, value : typing.Any) -> bool:
+		"""Returns whether the passed value equals the default value, False if the field has no default or the values
+		can not be compared"""
+		if not self.has_default:
+			return False
+		try:
+			return bool(value == self.default)
+		except Exception: #pylint: disable=broad-except #E.g. comparing arrays
+			return False
+
+	def validate(self, value : typing.Any) -> str | None:
+		"""Check the passed value against the constraints of the field (metadata["constraints"]), a value is valid if
+		it satisfies at least one of the constraints.
+
+		Returns:
+			str | None: None if the value is valid (or the field has no constraints), otherwise the error message. If
+				the constraints could not be converted, the conversion error is returned for any value.
+		"""
+		if self.constraints_error is not None:
+			return self.constraints_error
+		constraints = self.compiled_constraints
+		if not constraints:
+			return None
+		for constraint in constraints:
+			try:
+				if constraint.is_satisfied_by(value):
+					return None
+			except Exception: #pylint: disable=broad-except #E.g. comparing incompatible types -> not satisfied
+				continue
+		constraints = [constraint for constraint in constraints if not constraint.hidden] #Same as sklearn-message
+		if len(constraints) == 1:
+			constraints_str = f"{constraints[0]}"
+		else:
+			constraints_str = f"{', '.join([str(c) for c in constraints[:-1]])} or {constraints[-1]}"
+		return f"Must be {constraints_str}. Got {value!r} instead."
+
+
+_FIELD_INFO_CACHE : "weakref.WeakKeyDictionary[type, typing.Dict[str, DataclassFieldInfo]]" = \
+	weakref.WeakKeyDictionary() #Per dataclass-type, weak so dynamically created dataclasses can still be deleted
+
+
+def get_field_infos(dataclass_type_or_instance : typing.Any) -> typing.Dict[str, DataclassFieldInfo]:
+	"""Returns the DataclassFieldInfo of each field (by name) of the passed dataclass (type or instance). Built on the
+	first call for each dataclass-type, after which the cached dict is returned (which should not be modified).
+
+	Args:
+		dataclass_type_or_instance (typing.Any): The dataclass-type or an instance of it
+
+	Returns:
+		typing.Dict[str, DataclassFieldInfo]: The field-info by field-name, in field-order
+	"""
+	dataclass_type = dataclass_type_or_instance if isinstance(dataclass_type_or_instance, type) \
+		else type(dataclass_type_or_instance)
+	infos = _FIELD_INFO_CACHE.get(dataclass_type, None)
+	if infos is None:
+		infos = {field.name : DataclassFieldInfo(field) for field in dataclasses.fields(dataclass_type)}
+		_FIELD_INFO_CACHE[dataclass_type] = infos
+	return infos
@@ -0,0 +1,64 @@
+"""Implements a proxy model that filters the fields of a DataclassModel using a search query"""
+import logging
+
+from PySide6 import QtCore
+
+from pyside6_utils.models.dataclass_model import DataclassModel
+
+log = logging.getLogger(__name__)
+
+
+class DataclassFilterProxyModel(QtCore.QSortFilterProxyModel):
+	"""
+	Filters the items of a DataclassModel (or DataclassMultiModel) using a search query. An item is shown if all
+	(whitespace separated) words of the query occur in its name, display name, help text or current value. The
+	groups (display_path) of matching items are kept visible, the children of matching groups are shown as well.
+
+	The searched text is provided by the source model using the SearchTextRole, of which the metadata-part is cached per
+	dataclass-type and the value-part per item (until it changes). When values change, only the changed rows (and their
+	parents) are re-evaluated (dynamic filtering on dataChanged).
+
+	NOTE: the children of nested values (see DataclassModel) are only searched once they have been fetched (expanded).
+
+	E.g.:
+		proxy = DataclassFilterProxyModel()
+		proxy.setSourceModel(dataclass_model)
+		tree_view.setModel(proxy)
+		search_line_edit.textChanged.connect(proxy.set_search_text)
+	"""
+
+	def __init__(self, parent: QtCore.QObject | None = None) -> None:
+		super().__init__(parent)
+		self._search_terms : list[str] = []
+		self.setRecursiveFilteringEnabled(True) #Keep parents of matching items visible
+		self.setAutoAcceptChildRows(True) #Show all items in a matching group
+		self.setDynamicSortFilter(True) #Re-filter changed rows
+
+	def set_search_text(self, text : str) -> None:
+		"""Set the search query, an empty query shows all items"""
+		terms = text.lower().split()
+		if terms == self._search_terms:
+			return
+		self._search_terms = terms
+		self.invalidateFilter()
+
+	def get_search_text(self) -> str:
+		"""Returns the current search query (lowercase, normalized whitespace)"""
+		return " ".join(self._search_terms)
+
+	def filterAcceptsRow(self, source_row: int, source_parent: QtCore.QModelIndex | QtCore.QPersistentModelIndex
+			) -> bool:
+		if len(self._search_terms) == 0:
+			return True
+		source_model = self.sourceModel()
+		index = source_model.index(source_row, 0, source_parent)
+		if isinstance(source_model, DataclassModel): #Skip the data()-call
+			search_text = source_model.get_search_text(index.internalPointer()) #type: ignore
+		else:
+			search_text = index.data(DataclassModel.CustomDataRoles.SearchTextRole)
+		if search_text is None:
+			return False
+		for term in self._search_terms:
+			if term not in search_text:
+				return False
+		return True
@@ -0,0 +1,403 @@
+"""
+Defines a model that displays multiple instances of the same dataclass side by side (one column per instance), e.g. to
+compare configurations. See the class doc for more information.
+"""
+import logging
+import typing
+from dataclasses import is_dataclass
+
+from PySide6 import QtCore, QtGui
+
+from pyside6_utils.models.dataclass_field_info import (DataclassFieldInfo,
+                                                      HasNoDefaultError,
+                                                      get_field_infos)
+from pyside6_utils.models.dataclass_model import DataclassModel
+from pyside6_utils.models.dataclass_tree_item import DataclassTreeItem
+
+log = logging.getLogger(__name__)
+
+
+class SetInstanceValuesCommand(QtGui.QUndoCommand):
+	"""Sets the value of a field of one or more instances of a DataclassMultiModel, so it can be undone and redone at
+	once. The groups of equal values are only re-computed once per undo/redo, not once per instance."""
+	def __init__(self,
+				multi_model : 'DataclassMultiModel',
+				instances : typing.Sequence[typing.Any],
+				name : str,
+				value : typing.Any,
+				display_name : str | None = None,
+				parent : QtGui.QUndoCommand | None = None
+			) -> None:
+		super().__init__(parent)
+		self._model = multi_model
+		self._instances = list(instances) #Keep the instances themselves, the model might display others when undoing
+		self._name = name
+		self._old_values = [instance.__dict__.get(name, None) for instance in self._instances]
+		self._new_value = value
+		if len(self._instances) == 1:
+			self.setText(f"Set {display_name or name} ({self._old_values[0]} -> {self._new_value})")
+		else:
+			self.setText(f"Set {display_name or name} to {value} for {len(self._instances)} instances")
+
+	def undo(self):
+		self._model._set_instance_values(self._instances, self._name, self._old_values) #pylint: disable=protected-access
+
+	def redo(self):
+		self._model._set_instance_values( #pylint: disable=protected-access
+			self._instances, self._name, [self._new_value] * len(self._instances))
+
+
+class DataclassMultiModel(QtCore.QAbstractItemModel):
+	"""
+	A model that displays multiple instances of the same dataclass-type as columns: the first column contains the
+	(display-)names of the fields, each next column the values of a single instance. The fields are grouped in the same
+	way as in DataclassModel (using the "display_path"-metadata), the tree is built once and shared by all columns.
+
+	Fields of which the value differs between instances are highlighted: values are grouped by equality (using their
+	hash, or comparing to each group for unhashable values) and each group gets its own background color. The groups are
+	computed once per field and only re-computed for the fields that are edited.
+
+	Edits can be applied to several instances at once using set_multi_edit_columns() (e.g. with the selected columns),
+	the changes are pushed as a single undo command if an undo stack is provided.
+
+	NOTE: nested values (dataclasses, lists, dicts) are displayed as a single cell, use a DataclassModel to edit them.
+	"""
+	GROUP_COLORS = [ #Background color of each group of equal values of a differing field
+		QtGui.QColor(66, 133, 244, 60),
+		QtGui.QColor(244, 160, 0, 60),
+		QtGui.QColor(15, 157, 88, 60),
+		QtGui.QColor(171, 71, 188, 60),
+		QtGui.QColor(0, 172, 193, 60),
+		QtGui.QColor(219, 68, 55, 60),
+	]
+
+	def __init__(self,
+				instances : typing.Sequence[typing.Any],
+				instance_names : typing.Sequence[str] | None = None,
+				parent: typing.Optional[QtCore.QObject] = None,
+				undo_stack : QtGui.QUndoStack | None = None,
+			) -> None:
+		"""
+		Args:
+			instances (Sequence[dataclass]): The instances to display, should all be of the same dataclass-type
+			instance_names (Sequence[str], optional): The header of each instance-column. Defaults to None, in which
+				case the instances are numbered.
+			parent (QtCore.QObject, optional): The parent of this model. Defaults to None.
+			undo_stack (QtGui.QUndoStack, optional): The undo stack to push edits to. Defaults to None, in which case
+				edits can not be undone.
+		"""
+		super().__init__(parent)
+		self._undo_stack = undo_stack
+		self._bold_font = QtGui.QFont()
+		self._bold_font.setBold(True)
+		self._group_brushes = [QtGui.QBrush(color) for color in self.GROUP_COLORS]
+		self._required_brush = QtGui.QBrush(QtGui.QColor(255, 0, 0, 50))
+
+		self._instances : typing.List[typing.Any] = []
+		self._instance_names : typing.List[str] = []
+		self._dataclass_type : type | None = None
+		self._field_infos : typing.Dict[str, DataclassFieldInfo] = {}
+		self._root_node = DataclassTreeItem("Root", None, None, None)
+		self._field_nodes : typing.Dict[str, DataclassTreeItem] = {} #Tree item per field name
+		self._groups : typing.Dict[str, typing.List[int]] = {} #Group-index of the value of each instance per field
+		self._differing_fields : typing.Set[str] = set() #Fields with more than 1 group
+		self._multi_edit_columns : typing.Set[int] = set()
+		self._search_values : typing.Dict[str, str] = {} #Lowercase display-values of all instances per field
+		self.set_instances(instances, instance_names)
+
+	def set_instances(self,
+				instances : typing.Sequence[typing.Any],
+				instance_names : typing.Sequence[str] | None = None
+			) -> None:
+		"""Set the instances to display, the tree is only rebuilt if the dataclass-type changes.
+
+		Raises:
+			ValueError: If no instances are passed
+			TypeError: If the instances are not all instances of the same dataclass-type
+		"""
+		if len(instances) == 0:
+			raise ValueError("Expected at least 1 dataclass instance")
+		dataclass_type = type(instances[0])
+		if not is_dataclass(instances[0]) or isinstance(instances[0], type):
+			raise TypeError(f"Expected dataclass instances, got {dataclass_type}")
+		for instance in instances:
+			if type(instance) is not dataclass_type:
+				raise TypeError(f"All instances should be of type {dataclass_type.__name__}, got {type(instance)}")
+		if instance_names is not None and len(instance_names) != len(instances):
+			raise ValueError(f"Got {len(instance_names)} instance names for {len(instances)} instances")
+
+		same_layout = dataclass_type is self._dataclass_type and len(instances) == len(self._instances)
+		if same_layout: #Same rows and columns -> no reset needed, see DataclassModel._swap_dataclass_instance
+			self.layoutAboutToBeChanged.emit()
+		else:
+			self.beginResetModel()
+
+		self._instances = list(instances)
+		self._instance_names = list(instance_names) if instance_names is not None else \
+			[f"{dataclass_type.__name__} {nr}" for nr in range(len(instances))]
+		self._multi_edit_columns = {column for column in self._multi_edit_columns if column <= len(instances)}
+		if dataclass_type is not self._dataclass_type: #(Re)build the tree
+			self._dataclass_type = dataclass_type
+			self._field_infos = get_field_infos(dataclass_type)
+			self._root_node = DataclassTreeItem("Root", None, None, None)
+			self._field_nodes = {}
+			self._build_tree(DataclassModel._build_hierarchy(dataclass_type), self._root_node) #pylint: disable=protected-access
+		self._groups = {}
+		self._differing_fields = set()
+		self._search_values = {}
+		for name in self._field_infos:
+			self._update_groups(name)
+
+		if same_layout:
+			self.layoutChanged.emit()
+			self.headerDataChanged.emit(QtCore.Qt.Orientation.Horizontal, 1, len(instances))
+		else:
+			self.endResetModel()
+
+	def get_instances(self) -> typing.List[typing.Any]:
+		"""Returns the displayed instances (in column-order)"""
+		return list(self._instances)
+
+	def get_instance(self, column : int) -> typing.Any:
+		"""Returns the instance displayed in the passed column (column 0 contains the field names)"""
+		return self._instances[column - 1]
+
+	def get_differing_fields(self) -> typing.Set[str]:
+		"""Returns the names of the fields of which the value differs between the instances"""
+		return set(self._differing_fields)
+
+	def set_multi_edit_columns(self, columns : typing.Iterable[int]) -> None:
+		"""Set the (instance-)columns that are edited together: an edit in one of these columns is applied to all of
+		them (in a single undo command). E.g. connect to the selection of a view:
+			view.selectionModel().selectionChanged.connect(lambda *_: model.set_multi_edit_columns(
+				{index.column() for index in view.selectionModel().selectedIndexes()}))
+
+		Args:
+			columns (Iterable[int]): The columns, pass an empty iterable to only edit the edited cell itself
+		"""
+		self._multi_edit_columns = {column for column in columns if 0 < column <= len(self._instances)}
+
+	def get_multi_edit_columns(self) -> typing.Set[int]:
+		"""Returns the columns that are edited together, see set_multi_edit_columns()"""
+		return set(self._multi_edit_columns)
+
+	def _build_tree(self, data_hierarchy : typing.Dict, parent : DataclassTreeItem) -> None:
+		"""Recursively builds the (shared) tree from a hierarchy dictionary, see DataclassModel._build_hierarchy()"""
+		for key, value in data_hierarchy.items():
+			info = self._field_infos.get(key, None)
+			item = DataclassTreeItem(name=key, item_data=None, field=info.field if info else None, parent=parent,
+				key=key)
+			parent.append_child(item)
+			if info is not None:
+				self._field_nodes[key] = item
+			if isinstance(value, dict) and len(value) > 0:
+				self._build_tree(value, item)
+
+	def _update_groups(self, name : str) -> None:
+		"""(Re)compute the groups of equal values of the passed field. Hashable values are grouped using a dict,
+		unhashable values (e.g. lists) are compared to a single value of each group."""
+		groups : typing.List[int] = []
+		hashed_groups : typing.Dict[typing.Any, int] = {}
+		unhashable_groups : typing.List[typing.Tuple[typing.Any, int]] = [] #(value, group)
+		group_count = 0
+		for instance in self._instances:
+			value = instance.__dict__.get(name, None)
+			try:
+				group = hashed_groups.get(value, None)
+				if group is None:
+					group = hashed_groups[value] = group_count
+					group_count += 1
+			except TypeError: #Unhashable
+				for other_value, other_group in unhashable_groups:
+					try:
+						if bool(other_value == value):
+							group = other_group
+							break
+					except Exception: #pylint: disable=broad-except #E.g. comparing arrays -> treat as different
+						continue
+				else:
+					group = group_count
+					group_count += 1
+					unhashable_groups.append((value, group))
+			groups.append(group)
+
+		self._groups[name] = groups
+		if group_count > 1:
+			self._differing_fields.add(name)
+		else:
+			self._differing_fields.discard(name)
+
+	def _set_instance_values(self, instances : typing.Sequence[typing.Any], name : str, values : typing.Sequence) -> None:
+		"""Set the value of a field of the passed instances and update the groups/views once (if any of the instances is
+		displayed)"""
+		for instance, value in zip(instances, values):
+			instance.__dict__[name] = value
+		self._on_values_changed(instances, name)
+
+	def _on_values_changed(self, instances : typing.Sequence[typing.Any], name : str) -> None:
+		displayed = {id(instance) for instance in self._instances}
+		if not any(id(instance) in displayed for instance in instances):
+			return #No longer displayed
+		self._update_groups(name)
+		self._search_values.pop(name, None)
+		node = self._field_nodes.get(name, None)
+		if node is not None: #Whole row, other cells might be (no longer) highlighted
+			parent = self.createIndex(node.parent_item.row(), 0, node.parent_item) \
+				if node.parent_item is not self._root_node else QtCore.QModelIndex()
+			self.dataChanged.emit(self.index(node.row(), 0, parent), self.index(node.row(), len(self._instances), parent))
+
+	def set_values(self, name : str, columns : typing.Iterable[int], value : typing.Any) -> bool:
+		"""Set the field with the passed name to value for the instances in the passed columns. If an undo stack is
+		used, the changes are pushed as a single command.
+
+		Returns:
+			bool: Whether any value was changed
+		"""
+		instances = [self._instances[column - 1] for column in sorted(set(columns))]
+		instances = [instance for instance in instances if instance.__dict__.get(name, None) != value]
+		if len(instances) == 0:
+			return False
+
+		if self._undo_stack is None:
+			self._set_instance_values(instances, name, [value] * len(instances))
+			return True
+
+		display_name = self._field_infos[name].display_name if name in self._field_infos else name
+		self._undo_stack.push(SetInstanceValuesCommand(self, instances, name, value, display_name))
+		return True
+
+	def setData(self,
+				index: QtCore.QModelIndex,
+				value: typing.Any,
+				role: int = QtCore.Qt.ItemDataRole.EditRole
+			) -> bool:
+		"""
+		Sets the value of the field at index, for all multi-edit columns if the column of index is one of them.
+		"""
+		if not index.isValid() or index.column() == 0:
+			return False
+		node : DataclassTreeItem = index.internalPointer() #type: ignore
+		info = self._field_infos.get(node.name, None)
+		if info is None:
+			return False
+		if role == DataclassModel.CustomDataRoles.DefaultValueRole:
+			value = info.get_default()
+		elif role != QtCore.Qt.ItemDataRole.EditRole:
+			return False
+		columns = self._multi_edit_columns if index.column() in self._multi_edit_columns else {index.column()}
+		return self.set_values(node.name, columns, value)
+
+	def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole) -> typing.Any:
+		"""
+		Returns the data stored under the given role for the item referred to by the index.
+		"""
+		if not index.isValid():
+			return None
+		node : DataclassTreeItem = index.internalPointer() #type: ignore
+		info = self._field_infos.get(node.name, None) #None if only a header (no data)
+		column = index.column()
+
+		if column == 0:
+			if role == QtCore.Qt.ItemDataRole.DisplayRole:
+				return info.display_name if info is not None else node.name
+			elif role == QtCore.Qt.ItemDataRole.ToolTipRole:
+				return info.tooltip if info is not None else node.name
+			elif role == QtCore.Qt.ItemDataRole.FontRole: #Bold if the value differs between instances
+				return self._bold_font if node.name in self._differing_fields else None
+			elif role == DataclassModel.CustomDataRoles.AttributeNameRole:
+				return node.name
+			elif role == DataclassModel.CustomDataRoles.TreeItemRole:
+				return node
+			elif role == DataclassModel.CustomDataRoles.SearchTextRole: #See DataclassFilterProxyModel
+				if info is None:
+					return node.name.lower()
+				value_text = self._search_values.get(node.name, None)
+				if value_text is None:
+					value_text = self._search_values[node.name] = "\n".join([
+						str(DataclassModel.get_display_value(instance.__dict__.get(node.name, None))).lower()
+							for instance in self._instances
+					])
+				return f"{info.search_text}\n{value_text}"
+			return None
+
+		if info is None: #Group-header
+			if role == DataclassModel.CustomDataRoles.AttributeNameRole:
+				return node.name
+			elif role == DataclassModel.CustomDataRoles.TreeItemRole:
+				return node
+			return None
+
+		value = self._instances[column - 1].__dict__.get(node.name, None)
+		if role == QtCore.Qt.ItemDataRole.DisplayRole:
+			return DataclassModel.get_display_value(value)
+		elif role == QtCore.Qt.ItemDataRole.EditRole:
+			return value
+		elif role == QtCore.Qt.ItemDataRole.ToolTipRole:
+			return info.tooltip
+		elif role == DataclassModel.CustomDataRoles.TypeRole:
+			return info.type
+		elif role == DataclassModel.CustomDataRoles.FieldRole:
+			return info.field
+		elif role == DataclassModel.CustomDataRoles.AttributeNameRole:
+			return node.name
+		elif role == DataclassModel.CustomDataRoles.DefaultValueRole:
+			if not info.has_default:
+				raise HasNoDefaultError(f"Field {node.name} has no default value")
+			return info.get_default()
+		elif role == DataclassModel.CustomDataRoles.TreeItemRole:
+			return node
+		elif role == QtCore.Qt.ItemDataRole.FontRole: #Bold if changed from default
+			return None if not info.has_default or info.is_default(value) else self._bold_font
+		elif role == QtCore.Qt.ItemDataRole.BackgroundRole:
+			if node.name in self._differing_fields: #Color by group of equal values
+				return self._group_brushes[self._groups[node.name][column - 1] % len(self._group_brushes)]
+			if info.required and value is None:
+				return self._required_brush
+		return None
+
+	def headerData(self,
+				section: int,
+				orientation: QtCore.Qt.Orientation,
+				role: int = QtCore.Qt.ItemDataRole.DisplayRole
+			) -> typing.Any:
+		if role == QtCore.Qt.ItemDataRole.DisplayRole and orientation == QtCore.Qt.Orientation.Horizontal:
+			if section == 0:
+				return "Property"
+			elif 0 < section <= len(self._instance_names):
+				return self._instance_names[section - 1]
+		elif role == QtCore.Qt.ItemDataRole.DisplayRole:
+			return section
+		return None
+
+	def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlag:
+		if not index.isValid():
+			return QtCore.Qt.ItemFlag.NoItemFlags
+		flags = QtCore.Qt.ItemFlag.ItemIsEnabled | QtCore.Qt.ItemFlag.ItemIsSelectable
+		if index.column() > 0:
+			info = self._field_infos.get(index.internalPointer().name, None) #type: ignore
+			if info is not None and info.editable:
+				flags |= QtCore.Qt.ItemFlag.ItemIsEditable
+		return flags
+
+	def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int: #pylint: disable=unused-argument
+		return 1 + len(self._instances)
+
+	def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+		if parent.column() > 0:
+			return 0
+		parent_item = parent.internalPointer() if parent.isValid() else self._root_node
+		return parent_item.child_count() #type: ignore
+
+	def index(self, row: int, column: int, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> QtCore.QModelIndex:
+		if not self.hasIndex(row, column, parent):
+			return QtCore.QModelIndex()
+		parent_item = parent.internalPointer() if parent.isValid() else self._root_node
+		return self.createIndex(row, column, parent_item.child(row)) #type: ignore
+
+	def parent(self, index: QtCore.QModelIndex) -> QtCore.QModelIndex: #type: ignore
+		if not index.isValid():
+			return QtCore.QModelIndex()
+		parent_item = index.internalPointer().parent() #type: ignore
+		if parent_item is None or parent_item is self._root_node:
+			return QtCore.QModelIndex()
+		return self.createIndex(parent_item.row(), 0, parent_item)
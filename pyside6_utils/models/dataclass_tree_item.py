@@ -6,23 +6,58 @@ from dataclasses import Field
 class DataclassTreeItem(object):
 	"""
 	This class represents a single item in a dataclass-tree (attribute).
+	Each item stores its own row-index (updated when children are inserted/removed), so row() - which is called by
+	DataclassModel.parent() - does not have to search the children of the parent.
+
+	Items that are part of a nested value (the fields of a nested dataclass, or the items of a list/tuple/dict) store
+	the object they are part of as container, and their attribute-name/index/key in that container as key. For items
+	of the displayed dataclass itself, container is None.
 	"""
+	__slots__ = ("name", "item_data", "field", "parent_item", "child_items", "_row", "container", "key",
+		"children_fetched")
+
 	def __init__(self,
 	      		name : str,
 				item_data: typing.Any,
 				field : Field | None,
-				parent: typing.Optional["DataclassTreeItem"] = None
+				parent: typing.Optional["DataclassTreeItem"] = None,
+				container: typing.Any = None,
+				key: typing.Any = None
 			) -> None:
 		self.name = name
 		self.item_data = item_data
 		self.field = field
 		self.parent_item = parent
-		self.child_items = []
+		self.child_items : typing.List["DataclassTreeItem"] = []
+		self._row = 0 #Index of this item in parent_item.child_items
+		self.container = container
+		self.key = key
+		self.children_fetched = False #Whether the children of a nested value have been created (see DataclassModel)
 
 	def append_child(self, item: "DataclassTreeItem") -> None:
 		"""Appends a child to this item (of same type)."""
+		item.parent_item = self
+		item._row = len(self.child_items) #pylint: disable=protected-access
 		self.child_items.append(item)
 
+	def insert_child(self, row: int, item: "DataclassTreeItem") -> None:
+		"""Inserts a child at the given row, the rows of the children after it are updated."""
+		item.parent_item = self
+		self.child_items.insert(row, item)
+		self._update_rows(row)
+
+	def remove_child(self, row: int) -> "DataclassTreeItem":
+		"""Removes (and returns) the child at the given row, the rows of the children after it are updated."""
+		item = self.child_items.pop(row)
+		item.parent_item = None
+		self._update_rows(row)
+		return item
+
+	def _update_rows(self, start: int) -> None:
+		"""Re-number the stored row of the children from start onwards."""
+		for row in range(start, len(self.child_items)):
+			self.child_items[row]._row = row #pylint: disable=protected-access
+
 	def child(self, row: int) -> "DataclassTreeItem":
 		"""Returns the child at the given row."""
 		return self.child_items[row]
@@ -47,10 +82,22 @@ class DataclassTreeItem(object):
 		"""Returns the parent of this item."""
 		return self.parent_item
 
+	def is_value_item(self) -> bool:
+		"""Returns whether this item represents a value (a field or an item of a nested container), and not just a
+		group-header created by a display_path."""
+		return self.field is not None or self.container is not None
+
+	def clear_children(self) -> None:
+		"""Removes all children of this item."""
+		for child in self.child_items:
+			child.parent_item = None
+		self.child_items = []
+		self.children_fetched = False
+
 	def row(self) -> int:
 		"""Returns the row of this item."""
 		if self.parent_item:
-			return self.parent_item.child_items.index(self)
+			return self._row
 		return 0
 
 	def print(self, indent: int = 0) -> None:
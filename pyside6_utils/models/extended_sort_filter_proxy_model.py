@@ -60,7 +60,7 @@ class ExtendedSortFilterProxyModel(QtCore.QSortFilterProxyModel):
 					continue
 				else:
 					return self._val_less_than(leftval, rightval) if \
-						order == QtCore.Qt.SortOrder.AscendingOrder else self._val_less_than(leftval, rightval)
+						order == QtCore.Qt.SortOrder.AscendingOrder else self._val_less_than(rightval, leftval)
 
 		return False #If we can't differentiate the rows, return False (i.e. don't swap them)
 
@@ -1,5 +1,8 @@
 """Make all widgets importable using <package>.widgets.<widget>"""
 from pyside6_utils.widgets.collapsible_group_box import CollapsibleGroupBox
+from pyside6_utils.widgets.console_filter_bar import ConsoleFilterBar
+from pyside6_utils.widgets.console_line_view import ConsoleLineView
+from pyside6_utils.widgets.console_search_bar import ConsoleSearchBar
 from pyside6_utils.widgets.console_widget import ConsoleWidget
 from pyside6_utils.widgets.dataclass_tree_view import DataClassTreeView
 from pyside6_utils.widgets.extended_mdi_area import ExtendedMdiArea
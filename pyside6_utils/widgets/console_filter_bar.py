@@ -0,0 +1,72 @@
+"""
+Implements a small filter-bar (log-level toggles, include/exclude patterns) as used by ConsoleWidget.
+"""
+import typing
+
+from PySide6 import QtCore, QtWidgets
+
+from pyside6_utils.models.console_widget_models.console_line_filter import \
+    ConsoleLineFilter
+
+
+class ConsoleFilterBar(QtWidgets.QWidget):
+	"""
+	Filter-bar consisting of a checkable button per log-level and an include- and exclude-pattern edit.
+	Does not filter by itself, the owner should connect to the signals and mark invalid patterns using
+	set_include_error/set_exclude_error.
+	"""
+	levelsChanged = QtCore.Signal(list) #Emitted with the list of enabled log-levels
+	includePatternChanged = QtCore.Signal(str)
+	excludePatternChanged = QtCore.Signal(str)
+
+	def __init__(self, parent: typing.Optional[QtWidgets.QWidget] = None) -> None:
+		super().__init__(parent)
+		layout = QtWidgets.QHBoxLayout(self)
+		layout.setContentsMargins(2, 2, 2, 2)
+
+		self.level_buttons : typing.Dict[str, QtWidgets.QToolButton] = {}
+		for level in ConsoleLineFilter.LEVELS:
+			button = QtWidgets.QToolButton(self)
+			button.setText(level.capitalize())
+			button.setToolTip(f"Show {level}-lines")
+			button.setCheckable(True)
+			button.setChecked(True)
+			button.toggled.connect(self._emit_levels_changed)
+			layout.addWidget(button)
+			self.level_buttons[level] = button
+
+		self.include_edit = QtWidgets.QLineEdit(self)
+		self.include_edit.setPlaceholderText("Include (regex)")
+		self.include_edit.setClearButtonEnabled(True)
+		self.include_edit.textChanged.connect(self.includePatternChanged)
+		layout.addWidget(self.include_edit)
+
+		self.exclude_edit = QtWidgets.QLineEdit(self)
+		self.exclude_edit.setPlaceholderText("Exclude (regex)")
+		self.exclude_edit.setClearButtonEnabled(True)
+		self.exclude_edit.textChanged.connect(self.excludePatternChanged)
+		layout.addWidget(self.exclude_edit)
+
+	def _emit_levels_changed(self, *_) -> None:
+		self.levelsChanged.emit(self.get_enabled_levels())
+
+	def get_enabled_levels(self) -> typing.List[str]:
+		"""Returns the log-levels of which the button is checked"""
+		return [level for level, button in self.level_buttons.items() if button.isChecked()]
+
+	def set_enabled_levels(self, levels : typing.Iterable[str]) -> None:
+		"""Check the buttons of the passed log-levels and uncheck the others, emits levelsChanged once"""
+		levels = {level.upper() for level in levels}
+		for level, button in self.level_buttons.items():
+			button.blockSignals(True)
+			button.setChecked(level in levels)
+			button.blockSignals(False)
+		self._emit_levels_changed()
+
+	def set_include_error(self, error : bool) -> None:
+		"""Mark the include-edit as containing an invalid pattern"""
+		self.include_edit.setStyleSheet("QLineEdit { color: red; }" if error else "")
+
+	def set_exclude_error(self, error : bool) -> None:
+		"""Mark the exclude-edit as containing an invalid pattern"""
+		self.exclude_edit.setStyleSheet("QLineEdit { color: red; }" if error else "")
@@ -0,0 +1,521 @@
+"""
+Implements a read-only, virtualized console view that only paints the lines that are currently visible.
+Used by ConsoleWidget as an alternative to QPlainTextEdit when large amounts of console-output are expected.
+"""
+import logging
+import typing
+
+import numpy as np
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from pyside6_utils.models.console_widget_models.console_line_filter import \
+    ConsoleLineFilter
+from pyside6_utils.models.console_widget_models.console_line_processor import (
+    AnsiStyle, ConsoleLineProcessor, StyledRun)
+from pyside6_utils.models.console_widget_models.console_search_index import \
+    ConsoleSearchIndex
+
+log = logging.getLogger(__name__)
+
+
+class ConsoleLineView(QtWidgets.QAbstractScrollArea):
+	"""
+	Read-only console-view that keeps a plain list of lines and only paints the lines that fit in the viewport.
+	Rendering cost is O(visible lines), regardless of the amount of retained lines, as no QTextDocument-layout is
+	involved. A monospace font is assumed so line-widths can be derived from the number of characters.
+
+	Lines are pushed using process_line_change(), which uses the same (line-list, from-line) convention as the
+	loadedLinesChanged-signal of BaseConsoleItem, so this view can be connected directly to a console item.
+
+	Raw lines are passed through a ConsoleLineProcessor, so ANSI colors are drawn and carriage-return overwrites (e.g.
+	progress-bars) are collapsed. Searching/filtering is done on the resulting plain text.
+
+	Lines can be filtered by log-level and include/exclude patterns (see ConsoleLineFilter). Each line is evaluated
+	once when it comes in, changing the filter-settings only recalculates which of the retained lines are shown.
+	"""
+
+	LEFT_MARGIN = 4 #Margin (in pixels) between the left border of the viewport and the text
+	MATCH_COLOR = QtGui.QColor(255, 210, 0, 110) #Background of search-matches
+	CURRENT_MATCH_COLOR = QtGui.QColor(255, 140, 0, 200) #Background of the current search-match
+
+	def __init__(self,
+			parent: typing.Optional[QtWidgets.QWidget] = None,
+			max_lines : int = 1000,
+			line_processor : ConsoleLineProcessor | None = None
+		) -> None:
+		"""
+		Args:
+			parent (QtWidgets.QWidget, optional): The parent widget. Defaults to None.
+			max_lines (int, optional): The maximum number of lines to retain, older lines are trimmed from the start.
+				Defaults to 1000.
+			line_processor (ConsoleLineProcessor, optional): The processor used to turn raw lines into plain text and
+				styled runs, can be shared with other views so lines are only parsed once. Defaults to None, in which
+				case a new processor is created.
+		"""
+		super().__init__(parent)
+		self._line_processor = line_processor if line_processor is not None else ConsoleLineProcessor()
+		self._lines : typing.List[str] = []
+		self._runs : typing.List[typing.List[StyledRun] | None] = [] #Styled runs per line (same indexing as _lines)
+		self._start = 0 #Index in self._lines of the first retained line, trimming is done lazily to keep it O(1)
+		self._first_line = 0 #The (item-)line-index of the first retained line
+		self._max_lines = max(1, max_lines)
+		self._max_line_length = 0 #Longest line (in characters) seen so far, used for the horizontal scrollbar
+
+		self._selection_anchor : int | None = None #(item-)line-index at which the current selection started
+		self._selection_cursor : int | None = None #(item-)line-index at which the current selection ends
+
+		self._search_index : ConsoleSearchIndex | None = None #If set, matches are highlighted
+		self._current_match : typing.Tuple[int, int, int] | None = None #(line-index, start, end) of current match
+
+		self._filter = ConsoleLineFilter() #Bit i corresponds to retained line self._lines[self._start + i]
+		self._visible_offsets : np.ndarray | None = None #Retained-line offset per displayed row, None if not filtered
+		self._visible_offsets_dirty = False #Whether _visible_offsets should be recalculated before use
+
+		self.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.SystemFont.FixedFont))
+		self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+		self.setFocusPolicy(QtCore.Qt.FocusPolicy.StrongFocus)
+		self.setContextMenuPolicy(QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
+		self.customContextMenuRequested.connect(self._show_context_menu)
+		self.viewport().setCursor(QtCore.Qt.CursorShape.IBeamCursor)
+		self._update_font_metrics()
+
+	def _update_font_metrics(self) -> None:
+		metrics = self.fontMetrics()
+		self._line_height = max(1, metrics.lineSpacing())
+		self._char_width = max(1, metrics.horizontalAdvance("M"))
+		self._ascent = metrics.ascent()
+		self._style_fonts : typing.Dict[typing.Tuple[bool, bool, bool], QtGui.QFont] = {} #(bold, italic, underline)
+		self._update_scrollbars()
+
+	def line_count(self) -> int:
+		"""Returns the number of lines that are currently retained by this view"""
+		return len(self._lines) - self._start
+
+	def first_line_index(self) -> int:
+		"""Returns the (item-)line-index of the first retained line"""
+		return self._first_line
+
+	def _get_visible_offsets(self) -> np.ndarray | None:
+		"""Returns the retained-line offset of each displayed row, or None if all retained lines are displayed"""
+		if self._visible_offsets_dirty:
+			self._visible_offsets = self._filter.visible_lines() if self._filter.is_active() else None
+			self._visible_offsets_dirty = False
+		return self._visible_offsets
+
+	def row_count(self) -> int:
+		"""Returns the number of displayed rows, this is the number of retained lines that pass the filter"""
+		visible_offsets = self._get_visible_offsets()
+		return self.line_count() if visible_offsets is None else len(visible_offsets)
+
+	def _row_to_offset(self, row : int) -> int:
+		"""Returns the retained-line offset of the passed (displayed) row"""
+		visible_offsets = self._get_visible_offsets()
+		return row if visible_offsets is None else int(visible_offsets[row])
+
+	def _offset_to_row(self, offset : int) -> int:
+		"""Returns the row at which the passed retained-line offset is displayed. If the line is hidden, the row of the
+		first displayed line after it is returned."""
+		visible_offsets = self._get_visible_offsets()
+		return offset if visible_offsets is None else int(np.searchsorted(visible_offsets, offset))
+
+	def is_line_displayed(self, line : int) -> bool:
+		"""Returns whether the passed (item-)line-index is retained and passes the filter"""
+		offset = line - self._first_line
+		if offset < 0 or offset >= self.line_count():
+			return False
+		row = self._offset_to_row(offset)
+		return row < self.row_count() and self._row_to_offset(row) == offset
+
+	def visible_line_range(self) -> typing.Tuple[int, int]:
+		"""Returns the (first, last) (item-)line-index that is currently (partially) visible in the viewport"""
+		row_count = self.row_count()
+		if row_count == 0:
+			return self._first_line, self._first_line
+		first_row = min(self.verticalScrollBar().value(), row_count - 1)
+		last_row = min(first_row + self.verticalScrollBar().pageStep(), row_count - 1)
+		return self._first_line + self._row_to_offset(first_row), self._first_line + self._row_to_offset(last_row)
+
+	def _top_offset(self) -> int:
+		"""Returns the retained-line offset of the first visible row"""
+		row_count = self.row_count()
+		if row_count == 0:
+			return 0
+		return self._row_to_offset(min(self.verticalScrollBar().value(), row_count - 1))
+
+	def get_line_filter(self) -> ConsoleLineFilter:
+		"""Returns the filter that is used to determine which lines are shown. After changing its settings directly,
+		update_filter() should be called."""
+		return self._filter
+
+	def update_filter(self, keep_top_line : bool = True) -> None:
+		"""Recalculate which lines are displayed after the filter-settings have changed.
+
+		Args:
+			keep_top_line (bool, optional): Keep the line at the top of the viewport (or the first displayed line after
+				it) in view, unless we are scrolled to the bottom. Defaults to True.
+		"""
+		at_bottom = self.is_at_bottom()
+		top_offset = self._top_offset()
+		self._visible_offsets_dirty = True
+		self._update_scrollbars()
+		if at_bottom:
+			self.scroll_to_bottom()
+		elif keep_top_line:
+			self.verticalScrollBar().setValue(self._offset_to_row(top_offset))
+		self.viewport().update()
+
+	def set_enabled_levels(self, levels : typing.Iterable[str]) -> None:
+		"""Only show lines with the passed log-levels (see ConsoleLineFilter.LEVELS), lines without a level are always
+		shown. No lines are re-evaluated."""
+		self._filter.set_enabled_levels(levels)
+		self.update_filter()
+
+	def set_include_pattern(self, pattern : str, use_regex : bool = True) -> None:
+		"""Only show lines that match the passed pattern, an empty pattern shows all lines.
+
+		Raises:
+			re.error: If the pattern is not a valid regular expression
+		"""
+		self._filter.set_include_pattern(pattern, self._lines[self._start:], use_regex)
+		self.update_filter()
+
+	def set_exclude_pattern(self, pattern : str, use_regex : bool = True) -> None:
+		"""Hide all lines that match the passed pattern, an empty pattern hides no lines.
+
+		Raises:
+			re.error: If the pattern is not a valid regular expression
+		"""
+		self._filter.set_exclude_pattern(pattern, self._lines[self._start:], use_regex)
+		self.update_filter()
+
+	def get_max_lines(self) -> int:
+		"""Returns the maximum number of lines retained by this view"""
+		return self._max_lines
+
+	def set_max_lines(self, max_lines : int) -> None:
+		"""Set the maximum number of lines to retain, if more lines are currently retained, the oldest are trimmed
+
+		Args:
+			max_lines (int): The new maximum number of lines
+		"""
+		self._max_lines = max(1, max_lines)
+		self._trim()
+		self._update_scrollbars()
+		self.viewport().update()
+
+	def clear(self) -> None:
+		"""Remove all lines from the view"""
+		self._lines = []
+		self._runs = []
+		self._start = 0
+		self._first_line = 0
+		self._max_line_length = 0
+		self._selection_anchor = None
+		self._selection_cursor = None
+		self._filter.clear_lines()
+		self._visible_offsets_dirty = True
+		self._update_scrollbars()
+		self.viewport().update()
+
+	def to_plain_text(self) -> str:
+		"""Returns all retained lines as a single string"""
+		return "\n".join(self._lines[self._start:])
+
+	def is_at_bottom(self) -> bool:
+		"""Returns whether the view is currently scrolled (close) to the last line"""
+		return self.verticalScrollBar().value() >= self.verticalScrollBar().maximum() - 1
+
+	def scroll_to_bottom(self) -> None:
+		"""Scroll to the last line"""
+		self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+
+	def process_line_change(self, new_line_list : typing.List[str], from_line : int = 0) -> None:
+		"""Replace/append the passed lines, starting at from_line. Lines that are beyond the retained range are
+		appended, older lines are trimmed if the maximum number of lines is exceeded.
+
+		Args:
+			new_line_list (list[str]): The new/changed (raw) lines, these are processed using the line-processor
+			from_line (int, optional): The line-index (in the original buffer of the item) from which we replace/append
+				the new lines. Defaults to 0.
+		"""
+		if len(new_line_list) > self._max_lines: #Don't store lines that would be trimmed right away
+			from_line = from_line + len(new_line_list) - self._max_lines
+			new_line_list = new_line_list[-self._max_lines:]
+
+		new_lines, new_runs = self._line_processor.process_lines(new_line_list)
+		at_bottom = self.is_at_bottom()
+		top_line = self._first_line + self._top_offset()
+
+		retained = self.line_count()
+		if retained == 0:
+			self._first_line = from_line
+		offset = from_line - self._first_line
+		if offset < 0: #Lines before the retained range have already been trimmed -> skip them
+			new_lines = new_lines[-offset:]
+			new_runs = new_runs[-offset:]
+			offset = 0
+		elif offset > retained: #Gap in line-indexes -> append at the end, same as QPlainTextEdit-behaviour
+			self._first_line = from_line - retained
+			offset = retained
+
+		self._lines[self._start + offset : self._start + offset + len(new_lines)] = new_lines
+		self._runs[self._start + offset : self._start + offset + len(new_runs)] = new_runs
+		if len(new_lines) > 0:
+			self._max_line_length = max(self._max_line_length, max(map(len, new_lines)))
+			self._filter.replace_lines(new_lines, offset) #Evaluate each line once, as it comes in
+			self._visible_offsets_dirty = True
+
+		self._trim()
+		self._update_scrollbars()
+
+		if at_bottom:
+			self.scroll_to_bottom()
+		else: #Keep the same lines in view if the user has scrolled up
+			self.verticalScrollBar().setValue(self._offset_to_row(max(0, top_line - self._first_line)))
+		self.viewport().update()
+
+	def set_search_index(self, search_index : ConsoleSearchIndex | None) -> None:
+		"""Set the search-index of which the matches are highlighted, None to disable highlighting"""
+		self._search_index = search_index
+		self._current_match = None
+		self.viewport().update()
+
+	def set_current_match(self, match : typing.Tuple[int, int, int] | None) -> None:
+		"""Set the (line-index, start-column, end-column) of the search-match that is highlighted as current"""
+		self._current_match = match
+		self.viewport().update()
+
+	def scroll_to_line(self, line : int, column : int = 0) -> bool:
+		"""Scroll so that the passed (item-)line-index is centered, and the passed column is visible.
+
+		Returns:
+			bool: False if the line is not retained by this view, or hidden by the filter
+		"""
+		if not self.is_line_displayed(line):
+			return False
+		row = self._offset_to_row(line - self._first_line)
+		self.verticalScrollBar().setValue(row - self.verticalScrollBar().pageStep() // 2)
+		col_x = self.LEFT_MARGIN + column * self._char_width
+		h_scroll = self.horizontalScrollBar()
+		if col_x < h_scroll.value() or col_x > h_scroll.value() + self.viewport().width() - self._char_width:
+			h_scroll.setValue(col_x - self.viewport().width() // 2)
+		return True
+
+	def _trim(self) -> int:
+		"""Trims the retained lines to the max number of lines, returns the number of lines that were trimmed."""
+		excess = self.line_count() - self._max_lines
+		if excess <= 0:
+			return 0
+		self._start += excess
+		self._first_line += excess
+		self._filter.trim(excess)
+		self._visible_offsets_dirty = True
+		if self._start > len(self._lines) // 2: #Only compact once half of the list is unused -> amortized O(1)
+			del self._lines[:self._start]
+			del self._runs[:self._start]
+			self._start = 0
+		return excess
+
+	def _update_scrollbars(self) -> None:
+		visible_rows = max(1, self.viewport().height() // self._line_height)
+		self.verticalScrollBar().setPageStep(visible_rows)
+		self.verticalScrollBar().setSingleStep(1)
+		self.verticalScrollBar().setRange(0, max(0, self.row_count() - visible_rows))
+
+		content_width = self._max_line_length * self._char_width + 2 * self.LEFT_MARGIN
+		self.horizontalScrollBar().setPageStep(self.viewport().width())
+		self.horizontalScrollBar().setSingleStep(self._char_width)
+		self.horizontalScrollBar().setRange(0, max(0, content_width - self.viewport().width()))
+
+	def _row_at(self, pos : QtCore.QPoint) -> int:
+		"""Returns the (item-)line-index at the passed viewport-position, clamped to the displayed lines"""
+		row = self.verticalScrollBar().value() + max(0, pos.y()) // self._line_height
+		return self._first_line + self._row_to_offset(max(0, min(row, self.row_count() - 1)))
+
+	def _selected_range(self) -> typing.Tuple[int, int] | None:
+		"""Returns the (first, last) retained-line offset of the current selection (inclusive), or None if nothing is
+		selected. NOTE: lines in this range that are hidden by the filter are not part of the selection."""
+		if self._selection_anchor is None or self._selection_cursor is None:
+			return None
+		first = max(min(self._selection_anchor, self._selection_cursor) - self._first_line, 0)
+		last = min(max(self._selection_anchor, self._selection_cursor) - self._first_line, self.line_count() - 1)
+		if last < first:
+			return None
+		return first, last
+
+	def selected_text(self) -> str:
+		"""Returns the text of the currently selected lines"""
+		selected = self._selected_range()
+		if selected is None:
+			return ""
+		visible_offsets = self._get_visible_offsets()
+		if visible_offsets is None:
+			return "\n".join(self._lines[self._start + selected[0] : self._start + selected[1] + 1])
+		first_row = np.searchsorted(visible_offsets, selected[0])
+		last_row = np.searchsorted(visible_offsets, selected[1], side="right")
+		return "\n".join(self._lines[self._start + offset] for offset in visible_offsets[first_row:last_row])
+
+	def copy(self) -> None:
+		"""Copy the currently selected lines to the clipboard"""
+		text = self.selected_text()
+		if text:
+			QtWidgets.QApplication.clipboard().setText(text)
+
+	def select_all(self) -> None:
+		"""Select all retained lines"""
+		if self.row_count() == 0:
+			return
+		self._selection_anchor = self._first_line + self._row_to_offset(0)
+		self._selection_cursor = self._first_line + self._row_to_offset(self.row_count() - 1)
+		self.viewport().update()
+
+	def _show_context_menu(self, pos : QtCore.QPoint) -> None:
+		menu = QtWidgets.QMenu(self)
+		copy_action = menu.addAction("Copy", self.copy)
+		copy_action.setEnabled(self._selected_range() is not None)
+		menu.addAction("Select All", self.select_all)
+		menu.exec(self.viewport().mapToGlobal(pos))
+
+	def paintEvent(self, event : QtGui.QPaintEvent) -> None: #pylint: disable=unused-argument
+		painter = QtGui.QPainter(self.viewport())
+		palette = self.palette()
+		painter.fillRect(self.viewport().rect(), palette.base())
+
+		first_row = self.verticalScrollBar().value()
+		last_row = min(first_row + self.viewport().height() // self._line_height + 1, self.row_count() - 1)
+		if last_row < first_row:
+			return
+		#Retained-line offset of each visible row
+		visible_offsets = self._get_visible_offsets()
+		row_offsets = range(first_row, last_row + 1) if visible_offsets is None \
+			else visible_offsets[first_row:last_row + 1].tolist()
+
+		#Only draw the characters that fit in the viewport, so very long lines do not slow down painting
+		h_offset = self.horizontalScrollBar().value()
+		first_char = max(0, (h_offset - self.LEFT_MARGIN) // self._char_width)
+		x_pos = self.LEFT_MARGIN + first_char * self._char_width - h_offset
+		visible_chars = self.viewport().width() // self._char_width + 2
+
+		#Highlight search-matches
+		if self._search_index is not None:
+			screen_row_of_offset = {offset : screen_row for screen_row, offset in enumerate(row_offsets)}
+			for line, start, end in self._search_index.matches_in_range(
+					self._first_line + row_offsets[0], self._first_line + row_offsets[-1]):
+				screen_row = screen_row_of_offset.get(line - self._first_line)
+				if screen_row is None: #Hidden by the filter
+					continue
+				color = self.CURRENT_MATCH_COLOR if (line, start, end) == self._current_match else self.MATCH_COLOR
+				painter.fillRect(
+					self.LEFT_MARGIN + start * self._char_width - h_offset,
+					screen_row * self._line_height,
+					(end - start) * self._char_width,
+					self._line_height,
+					color
+				)
+
+		selected = self._selected_range()
+		painter.setPen(palette.color(QtGui.QPalette.ColorRole.Text))
+		for screen_row, offset in enumerate(row_offsets):
+			y_pos = screen_row * self._line_height
+			line = self._lines[self._start + offset][first_char:first_char + visible_chars]
+			runs = self._runs[self._start + offset]
+			if selected is not None and selected[0] <= offset <= selected[1]:
+				painter.fillRect(0, y_pos, self.viewport().width(), self._line_height, palette.highlight())
+				painter.setPen(palette.color(QtGui.QPalette.ColorRole.HighlightedText))
+				painter.drawText(x_pos, y_pos + self._ascent, line)
+				painter.setPen(palette.color(QtGui.QPalette.ColorRole.Text))
+			elif runs is not None:
+				self._draw_styled_line(painter, x_pos, y_pos, line, first_char, runs)
+			else:
+				painter.drawText(x_pos, y_pos + self._ascent, line)
+
+	def _get_style_font(self, style : AnsiStyle) -> QtGui.QFont:
+		"""Returns the (cached) font-variant for the passed style"""
+		key = (style.bold, style.italic, style.underline)
+		font = self._style_fonts.get(key)
+		if font is None:
+			font = QtGui.QFont(self.font())
+			font.setBold(style.bold)
+			font.setItalic(style.italic)
+			font.setUnderline(style.underline)
+			self._style_fonts[key] = font
+		return font
+
+	def _draw_styled_line(self,
+			painter : QtGui.QPainter,
+			x_pos : int,
+			y_pos : int,
+			line : str,
+			first_char : int,
+			runs : typing.List[StyledRun]
+		) -> None:
+		"""Draw the visible part of a line (starting at first_char) using the colors/fonts of its styled runs"""
+		default_pen = painter.pen()
+		pos = 0 #Position in (the visible part of) the line up to which we have drawn
+		for start, end, style in runs:
+			start, end = max(0, start - first_char), min(len(line), end - first_char)
+			if end <= pos:
+				continue
+			if start >= len(line):
+				break
+			if start > pos:
+				painter.drawText(x_pos + pos * self._char_width, y_pos + self._ascent, line[pos:start])
+			run_x = x_pos + start * self._char_width
+			if style.background is not None:
+				painter.fillRect(run_x, y_pos, (end - start) * self._char_width, self._line_height,
+					QtGui.QColor(*style.background))
+			if style.foreground is not None:
+				painter.setPen(QtGui.QColor(*style.foreground))
+			if style.bold or style.italic or style.underline:
+				painter.setFont(self._get_style_font(style))
+			painter.drawText(run_x, y_pos + self._ascent, line[start:end])
+			painter.setPen(default_pen)
+			painter.setFont(self.font())
+			pos = end
+		if pos < len(line):
+			painter.drawText(x_pos + pos * self._char_width, y_pos + self._ascent, line[pos:])
+
+	def scrollContentsBy(self, dx : int, dy : int) -> None: #pylint: disable=unused-argument
+		self.viewport().update()
+
+	def resizeEvent(self, event : QtGui.QResizeEvent) -> None:
+		at_bottom = self.is_at_bottom()
+		super().resizeEvent(event)
+		self._update_scrollbars()
+		if at_bottom:
+			self.scroll_to_bottom()
+
+	def changeEvent(self, event : QtCore.QEvent) -> None:
+		super().changeEvent(event)
+		if event.type() == QtCore.QEvent.Type.FontChange:
+			self._update_font_metrics()
+			self.viewport().update()
+
+	def mousePressEvent(self, event : QtGui.QMouseEvent) -> None:
+		if event.button() == QtCore.Qt.MouseButton.LeftButton and self.row_count() > 0:
+			row = self._row_at(event.position().toPoint())
+			if event.modifiers() & QtCore.Qt.KeyboardModifier.ShiftModifier and self._selection_anchor is not None:
+				self._selection_cursor = row
+			else:
+				self._selection_anchor = row
+				self._selection_cursor = row
+			self.viewport().update()
+		super().mousePressEvent(event)
+
+	def mouseMoveEvent(self, event : QtGui.QMouseEvent) -> None:
+		if event.buttons() & QtCore.Qt.MouseButton.LeftButton and self._selection_anchor is not None:
+			self._selection_cursor = self._row_at(event.position().toPoint())
+			self.viewport().update()
+		super().mouseMoveEvent(event)
+
+	def keyPressEvent(self, event : QtGui.QKeyEvent) -> None:
+		if event.matches(QtGui.QKeySequence.StandardKey.Copy):
+			self.copy()
+		elif event.matches(QtGui.QKeySequence.StandardKey.SelectAll):
+			self.select_all()
+		elif event.key() == QtCore.Qt.Key.Key_Home and event.modifiers() & QtCore.Qt.KeyboardModifier.ControlModifier:
+			self.verticalScrollBar().setValue(0)
+		elif event.key() == QtCore.Qt.Key.Key_End and event.modifiers() & QtCore.Qt.KeyboardModifier.ControlModifier:
+			self.scroll_to_bottom()
+		else:
+			super().keyPressEvent(event)
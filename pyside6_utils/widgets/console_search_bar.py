@@ -0,0 +1,106 @@
+"""
+Implements a small search-bar (find-text, case/regex toggles, previous/next buttons) as used by ConsoleWidget.
+"""
+import typing
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+
+class ConsoleSearchBar(QtWidgets.QWidget):
+	"""
+	Search-bar consisting of a line-edit, case-sensitive and regex toggles, a match-label and previous/next/close
+	buttons. Does not search by itself, the owner should connect to the signals and update the label using set_status.
+	"""
+	searchChanged = QtCore.Signal(str, bool, bool) #Emitted on (pattern, case_sensitive, use_regex) change
+	nextRequested = QtCore.Signal()
+	previousRequested = QtCore.Signal()
+	closeRequested = QtCore.Signal()
+
+	def __init__(self, parent: typing.Optional[QtWidgets.QWidget] = None) -> None:
+		super().__init__(parent)
+		layout = QtWidgets.QHBoxLayout(self)
+		layout.setContentsMargins(2, 2, 2, 2)
+
+		self.search_edit = QtWidgets.QLineEdit(self)
+		self.search_edit.setPlaceholderText("Find")
+		self.search_edit.setClearButtonEnabled(True)
+		layout.addWidget(self.search_edit)
+
+		self.case_button = QtWidgets.QToolButton(self)
+		self.case_button.setText("Aa")
+		self.case_button.setToolTip("Match case")
+		self.case_button.setCheckable(True)
+		layout.addWidget(self.case_button)
+
+		self.regex_button = QtWidgets.QToolButton(self)
+		self.regex_button.setText(".*")
+		self.regex_button.setToolTip("Use regular expression")
+		self.regex_button.setCheckable(True)
+		layout.addWidget(self.regex_button)
+
+		self.status_label = QtWidgets.QLabel(self)
+		self.status_label.setMinimumWidth(self.status_label.fontMetrics().horizontalAdvance("00000/00000 ..."))
+		layout.addWidget(self.status_label)
+
+		self.previous_button = QtWidgets.QToolButton(self)
+		self.previous_button.setArrowType(QtCore.Qt.ArrowType.UpArrow)
+		self.previous_button.setToolTip("Previous match (Shift+Enter)")
+		layout.addWidget(self.previous_button)
+
+		self.next_button = QtWidgets.QToolButton(self)
+		self.next_button.setArrowType(QtCore.Qt.ArrowType.DownArrow)
+		self.next_button.setToolTip("Next match (Enter)")
+		layout.addWidget(self.next_button)
+
+		self.close_button = QtWidgets.QToolButton(self)
+		self.close_button.setIcon(self.style().standardIcon(QtWidgets.QStyle.StandardPixmap.SP_TitleBarCloseButton))
+		self.close_button.setToolTip("Close (Escape)")
+		self.close_button.setAutoRaise(True)
+		layout.addWidget(self.close_button)
+
+		self.search_edit.textChanged.connect(self._emit_search_changed)
+		self.case_button.toggled.connect(self._emit_search_changed)
+		self.regex_button.toggled.connect(self._emit_search_changed)
+		self.previous_button.clicked.connect(self.previousRequested)
+		self.next_button.clicked.connect(self.nextRequested)
+		self.close_button.clicked.connect(self.closeRequested)
+		self.search_edit.installEventFilter(self)
+
+	def _emit_search_changed(self, *_) -> None:
+		self.searchChanged.emit(self.get_pattern(), self.case_button.isChecked(), self.regex_button.isChecked())
+
+	def get_pattern(self) -> str:
+		"""Returns the current search pattern"""
+		return self.search_edit.text()
+
+	def is_case_sensitive(self) -> bool:
+		"""Returns whether the search should be case-sensitive"""
+		return self.case_button.isChecked()
+
+	def is_regex(self) -> bool:
+		"""Returns whether the pattern should be interpreted as a regular expression"""
+		return self.regex_button.isChecked()
+
+	def set_status(self, text : str, error : bool = False) -> None:
+		"""Set the text of the status-label (e.g. "3/20"). If error is True, the search-edit is marked as invalid."""
+		self.status_label.setText(text)
+		self.search_edit.setStyleSheet("QLineEdit { color: red; }" if error else "")
+
+	def focus_search(self) -> None:
+		"""Focus the search-edit and select its text"""
+		self.search_edit.setFocus()
+		self.search_edit.selectAll()
+
+	def eventFilter(self, watched : QtCore.QObject, event : QtCore.QEvent) -> bool:
+		if watched is self.search_edit and event.type() == QtCore.QEvent.Type.KeyPress:
+			key_event = typing.cast(QtGui.QKeyEvent, event)
+			if key_event.key() in (QtCore.Qt.Key.Key_Return, QtCore.Qt.Key.Key_Enter):
+				if key_event.modifiers() & QtCore.Qt.KeyboardModifier.ShiftModifier:
+					self.previousRequested.emit()
+				else:
+					self.nextRequested.emit()
+				return True
+			elif key_event.key() == QtCore.Qt.Key.Key_Escape:
+				self.closeRequested.emit()
+				return True
+		return super().eventFilter(watched, event)
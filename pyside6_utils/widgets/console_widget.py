@@ -1,40 +1,245 @@
 """
 Implements a widget that combines a console-view and a tree-like-view so we're able to browse console outputs.
 """
+import collections
 import logging
 import os
+import re
 import threading
 import time
 import typing
 
 from PySide6 import QtCore, QtWidgets, QtGui
 
+from pyside6_utils.models.console_widget_models.console_directory_watcher import \
+    scan_directory
+from pyside6_utils.models.console_widget_models.console_line_filter import \
+    ConsoleLineFilter
+from pyside6_utils.models.console_widget_models.console_line_processor import (
+    ConsoleLineProcessor, StyledRun)
 from pyside6_utils.models.console_widget_models.console_model import (
     BaseConsoleItem, ConsoleModel)
+from pyside6_utils.models.console_widget_models.console_search_index import \
+    ConsoleSearchIndex
 from pyside6_utils.models.extended_sort_filter_proxy_model import \
     ExtendedSortFilterProxyModel
 from pyside6_utils.ui.ConsoleWidget_ui import Ui_ConsoleWidget
+from pyside6_utils.widgets.console_filter_bar import ConsoleFilterBar
+from pyside6_utils.widgets.console_line_view import ConsoleLineView
+from pyside6_utils.widgets.console_search_bar import ConsoleSearchBar
 from pyside6_utils.widgets.delegates.console_widget_delegate import \
     ConsoleWidgetDelegate
 
 log = logging.getLogger(__name__)
 
 
+class LineChangeBuffer():
+	"""Gathers (line-list, from-line) batches as emitted by BaseConsoleItem.loadedLinesChanged and merges them into a
+	single contiguous batch, so they can be displayed using a single edit. Lines that would be trimmed from the display
+	anyway (more than max_lines after them) are dropped right away.
+	"""
+	def __init__(self, max_lines : int) -> None:
+		self.max_lines = max_lines
+		self._lines : typing.List[str] = []
+		self._from_line = 0
+		self.dropped_lines = 0 #Total number of lines that were dropped before being displayed
+
+	def is_empty(self) -> bool:
+		"""Returns whether there are no pending lines"""
+		return len(self._lines) == 0
+
+	def add(self, new_line_list : typing.List[str], from_line : int) -> bool:
+		"""Merge the passed batch into the pending batch.
+
+		Args:
+			new_line_list (list[str]): The new/changed lines
+			from_line (int): The line-index from which the lines replace/append the buffer of the item
+
+		Returns:
+			bool: False if the batch is not contiguous with the pending batch (e.g. it overwrites lines before the
+				pending batch), in which case nothing is merged and the pending batch should be flushed first.
+		"""
+		if self.is_empty():
+			self._lines = list(new_line_list)
+			self._from_line = from_line
+		else:
+			offset = from_line - self._from_line
+			if offset < 0 or offset > len(self._lines):
+				return False
+			self._lines[offset:offset + len(new_line_list)] = new_line_list
+
+		excess = len(self._lines) - self.max_lines
+		if excess > 0:
+			del self._lines[:excess]
+			self._from_line += excess
+			self.dropped_lines += excess
+		return True
+
+	def take(self) -> typing.Tuple[typing.List[str], int]:
+		"""Returns the pending (line-list, from-line) batch and empties the buffer"""
+		lines, from_line = self._lines, self._from_line
+		self._lines = []
+		self._from_line = 0
+		return lines, from_line
+
+	def clear(self) -> None:
+		"""Discard all pending lines"""
+		self._lines = []
+		self._from_line = 0
+
+
+class ConsoleMetrics():
+	"""Throughput counters of a ConsoleWidget (see ConsoleWidget.get_metrics), all times are in seconds"""
+	def __init__(self, rate_window : float = 5.0) -> None:
+		"""
+		Args:
+			rate_window (float, optional): The window (in seconds) over which lines_per_second is calculated.
+				Defaults to 5.0.
+		"""
+		self.rate_window = rate_window
+		self.reset()
+
+	def reset(self) -> None:
+		"""Reset all counters to 0"""
+		self.lines_ingested = 0 #Lines received from the selected item(s)
+		self.batches_ingested = 0 #loadedLinesChanged-emissions received
+		self.flush_count = 0 #Number of (coalesced) edits of the displayed output
+		self.dropped_lines = 0 #Lines that were never displayed because of display_max_blocks
+		self.gui_time_total = 0.0 #Time spent displaying lines
+		self.gui_time_last = 0.0
+		self.gui_time_max = 0.0
+		self.latency_last = 0.0 #Time between writing (see BaseConsoleItem.get_metrics) and displaying
+		self.latency_max = 0.0
+		self._rate_samples : collections.deque[typing.Tuple[float, int]] = collections.deque() #(time, line-count)
+		self._rate_lines = 0 #Sum of the line-counts in self._rate_samples
+
+	def add_lines(self, count : int) -> None:
+		"""Register a batch of <count> received lines"""
+		now = time.perf_counter()
+		self.lines_ingested += count
+		self.batches_ingested += 1
+		self._rate_samples.append((now, count))
+		self._rate_lines += count
+		self._drop_old_samples(now)
+
+	def add_flush(self, gui_time : float, latency : float | None) -> None:
+		"""Register an edit of the displayed output that took <gui_time> seconds, and the passed latency (if known)"""
+		self.flush_count += 1
+		self.gui_time_total += gui_time
+		self.gui_time_last = gui_time
+		self.gui_time_max = max(self.gui_time_max, gui_time)
+		if latency is not None:
+			self.latency_last = latency
+			self.latency_max = max(self.latency_max, latency)
+
+	def _drop_old_samples(self, now : float) -> None:
+		while len(self._rate_samples) > 0 and self._rate_samples[0][0] < now - self.rate_window:
+			self._rate_lines -= self._rate_samples.popleft()[1]
+
+	def lines_per_second(self) -> float:
+		"""Returns the average number of lines received per second over the last rate_window seconds"""
+		self._drop_old_samples(time.perf_counter())
+		return self._rate_lines / self.rate_window
+
+	def to_dict(self) -> typing.Dict[str, float]:
+		"""Returns all counters as a dict, times are converted to milliseconds"""
+		return {
+			"lines_ingested" : self.lines_ingested,
+			"lines_per_second" : self.lines_per_second(),
+			"batches_ingested" : self.batches_ingested,
+			"flush_count" : self.flush_count,
+			"dropped_lines" : self.dropped_lines,
+			"gui_time_last_ms" : self.gui_time_last * 1000,
+			"gui_time_max_ms" : self.gui_time_max * 1000,
+			"gui_time_mean_ms" : self.gui_time_total * 1000 / max(1, self.flush_count),
+			"latency_last_ms" : self.latency_last * 1000,
+			"latency_max_ms" : self.latency_max * 1000,
+		}
+
+
+class ConsolePane():
+	"""The rendered state (document or line view, displayed range, scroll position) of a console item that is not
+	displayed by the main view of a ConsoleWidget: either hidden, or shown in a split pane next to the main view (see
+	ConsoleWidget.add_split_pane). The item stays subscribed: new lines are gathered in a LineChangeBuffer (capped to
+	the number of displayed lines) and only rendered once the pane is shown again - or, for split panes, at most once
+	every ui_text_min_update_interval seconds - so switching back to the item only inserts the lines that arrived in the
+	meantime.
+	"""
+	def __init__(self, item : BaseConsoleItem, pending_lines : LineChangeBuffer) -> None:
+		self.item = item
+		self.document : QtGui.QTextDocument | None = None #Set if rendered by the text edit
+		self.line_view : ConsoleLineView | None = None #Set if rendered by the virtualized view
+		self.filter_settings : typing.Tuple[typing.List[str], str, str] | None = None #Filters applied to line_view
+		self.loaded_lines = [0, 0]
+		self.scroll_value = 0
+		self.at_bottom = True
+		self.pending_lines = pending_lines
+		self.needs_reload = False #Set if the lines that arrived can not be merged, the pane is then re-loaded
+		self.frame : QtWidgets.QWidget | None = None #Set while shown as a split pane (header + line_view)
+		self.lines_added : typing.Callable[[], None] | None = None #Called when lines were gathered (e.g. to schedule a
+			# flush of a split pane)
+		self._connection = item.loadedLinesChanged.connect(self._on_loaded_lines_changed)
+
+	def _on_loaded_lines_changed(self, new_line_list : typing.List[str], from_line : int) -> None:
+		if self.needs_reload: #All lines are re-loaded once shown
+			pass
+		elif not self.pending_lines.add(new_line_list, from_line): #Not contiguous (e.g. the file was reset)
+			self.pending_lines.clear()
+			self.needs_reload = True
+		if self.lines_added is not None:
+			self.lines_added()
+
+	def flush_to_line_view(self) -> None:
+		"""Render the gathered lines in the line view of this pane, all lines of the item are re-loaded if the gathered
+		lines could not be merged"""
+		if self.line_view is None:
+			return
+		if self.needs_reload:
+			self.needs_reload = False
+			self.pending_lines.clear()
+			self.line_view.clear()
+			cur_line_list, from_index = self.item.get_current_line_list()
+			self.line_view.process_line_change(cur_line_list, from_index)
+		elif not self.pending_lines.is_empty():
+			self.line_view.process_line_change(*self.pending_lines.take())
+
+	def close(self) -> None:
+		"""Stop gathering lines of the item and delete the rendered document/view"""
+		if self._connection is not None:
+			QtCore.QObject.disconnect(self._connection)
+			self._connection = None
+		if self.document is not None:
+			self.document.deleteLater()
+			self.document = None
+		if self.line_view is not None:
+			self.line_view.deleteLater()
+			self.line_view = None
+		if self.frame is not None:
+			self.frame.deleteLater()
+			self.frame = None
+		self.lines_added = None
 
 
 class ConsoleWidget(QtWidgets.QWidget):
 	"""Widget that dynamically displayes multiple console -
 	E.g. in the case of ConsoleModel + ConsoleFromFileItems : watches the selected file for changes and updates the
 	widget accordingly.	Mainly intended for use with a file to which stdout/stderr can be redirected to.
+
+	Other items can be followed at the same time in split panes below the output of the selected item (see
+	add_split_pane, or use the context-menu of the item-list).
 	"""
 
+	metricsChanged = QtCore.Signal(dict) #Emitted every metrics-interval seconds (see set_metrics_interval)
+
 	DESCRIPTION = ("Widget that dynamically displayes multiple console - "
 	"E.g. in the case of ConsoleModel + ConsoleFromFileItems : watches the selected file for changes and updates the"
 	"widget accordingly. Mainly intended for use with a file to which stdout/stderr can be redirected to.")
 
 	def __init__(self, parent: typing.Optional[QtWidgets.QWidget] = None,
 			display_max_blocks = 1000, #How many blocks of text to display (lines)
-		    ui_text_min_update_interval : float = 0.05
+		    ui_text_min_update_interval : float = 0.05,
+			use_virtualized_view : bool = False,
+			max_hidden_panes : int = 8
 		) -> None:
 		"""
 		Args:
@@ -42,17 +247,35 @@ class ConsoleWidget(QtWidgets.QWidget):
 			name_date_path_model (QtCore.QStandardItemModel): The table model that contains the <name>, <last edit date>
 				and <path> of the file in column 1, 2 and 3 respectively
 			ui_text_min_update_interval (float, optional): The minimum interval in seconds between updating the
-				current text in the UI. Defaults to 0.1.
+				current text in the UI. Line-changes that arrive in the meantime are merged and displayed using a single
+				edit. If <= 0, every change is displayed right away. Defaults to 0.05.
 				NOTE that setting this too low might cause the UI to become unresponsive if the console-output is updated
 				too frequently (e.g. when logging a lot).
+			use_virtualized_view (bool, optional): Whether to display the console-output using a ConsoleLineView
+				instead of a QPlainTextEdit. The ConsoleLineView only paints the visible lines, which makes it suitable
+				for high-rate logs and a large display_max_blocks. Defaults to False.
+			max_hidden_panes (int, optional): The number of previously selected items (or closed split panes) of
+				which the rendered console-output is kept (see ConsolePane), so switching back to them is instant. The
+				least recently selected panes are discarded first. 0 to always re-load the selected item. Defaults to 8.
 		"""
 		super().__init__(parent)
 		self.ui = Ui_ConsoleWidget() #pylint: disable=invalid-name
 		self.ui.setupUi(self)
+		#The output of the selected item (consoleTextEdit or a ConsoleLineView) is the first widget of the pane-splitter,
+		# the split panes of other items (see add_split_pane) are added below it
+		self._pane_splitter = QtWidgets.QSplitter(QtCore.Qt.Orientation.Vertical)
+		self._pane_splitter.setObjectName("paneSplitter")
+		self._pane_splitter.setChildrenCollapsible(False)
+		self.ui.splitter.replaceWidget(self.ui.splitter.indexOf(self.ui.consoleTextEdit), self._pane_splitter)
+		self._pane_splitter.addWidget(self.ui.consoleTextEdit)
+		self.ui.consoleTextEdit.show()
 
 
 		self._display_max_blocks = display_max_blocks #The maximum number of blocks to display in the text edit
-		self.ui.consoleTextEdit.setMaximumBlockCount(display_max_blocks)
+		self._line_processor = ConsoleLineProcessor() #Renders ANSI colors and collapses carriage-return overwrites,
+			# shared by the views and the search so each line is only parsed once
+		self.ui.consoleTextEdit.setDocument(self._create_document()) #Owned by this widget, so it can be kept in a pane
+		self._tail_cursor = QtGui.QTextCursor(self.ui.consoleTextEdit.document()) #Kept at the end for appends
 		# self.ui.consoleTextEdit.setCenterOnScroll(True)
 		self._files_proxy_model = ExtendedSortFilterProxyModel(self) #TODO: this doesn't really seem to work yet
 		self.ui.fileSelectionTableView.setModel(self._files_proxy_model)
@@ -101,12 +324,529 @@ class ConsoleWidget(QtWidgets.QWidget):
 		self._current_linechange_connect = None
 		self.ui.fileSelectionTableView.viewport().setMouseTracking(True)
 
-		self.ui.fileSelectionTableView.selectionModel().selectionChanged.connect(self.selection_changed)
+		#NOTE: selectionChanged only passes the changed part of the selection (e.g. nothing when the selected row is moved
+		# because a row before it is removed), so always pass the full selection
+		self.ui.fileSelectionTableView.selectionModel().selectionChanged.connect(
+			lambda *_: self.selection_changed(self.ui.fileSelectionTableView.selectionModel().selection()))
 		self._ui_text_min_update_interval = ui_text_min_update_interval #The minimum interval in seconds between updating the
+			# displayed text, incoming line-changes are gathered in self._pending_lines in the meantime
+		self._pending_lines = LineChangeBuffer(display_max_blocks)
+		self._last_flush_time = 0.0
+		self._flush_timer = QtCore.QTimer(self)
+		self._flush_timer.setSingleShot(True)
+		self._flush_timer.timeout.connect(self.flush_pending_lines)
 
 
 		self.currently_loaded_lines = [0, 0] #Start with no lines
 
+		self._line_view : ConsoleLineView | None = None #If set, used instead of consoleTextEdit to display the lines
+		self._current_item : BaseConsoleItem | None = None
+		self._max_hidden_panes = max(0, max_hidden_panes)
+		self._hidden_panes : collections.OrderedDict[BaseConsoleItem, ConsolePane] = collections.OrderedDict() #Least
+			# recently selected first
+		self._source_model : QtCore.QAbstractItemModel | None = None
+		self._current_item_removed = False #Whether the current item has been removed from the model (no pane is kept)
+
+		#============Split panes==================
+		#Other items that are shown live below the selected item, opened using the context-menu of the item-list
+		self._split_panes : typing.Dict[BaseConsoleItem, ConsolePane] = {}
+		self._split_flush_timer = QtCore.QTimer(self)
+		self._split_flush_timer.setSingleShot(True)
+		self._split_flush_timer.timeout.connect(self.flush_split_panes)
+		self.ui.fileSelectionTableView.setContextMenuPolicy(QtCore.Qt.ContextMenuPolicy.CustomContextMenu)
+		self.ui.fileSelectionTableView.customContextMenuRequested.connect(self._show_item_context_menu)
+
+		#============Search==================
+		#Searches the full line-buffer of the current item (not just the displayed lines), opened using Ctrl+F
+		self._search_active = False
+		self._search_index = ConsoleSearchIndex(self)
+		self._search_index.matchesChanged.connect(self._on_search_matches_changed)
+		self._current_match_nr = -1
+		self._search_bar = ConsoleSearchBar(self)
+		self._search_bar.hide()
+		self.ui.verticalLayout.insertWidget(0, self._search_bar)
+		self._search_bar.searchChanged.connect(self._on_search_changed)
+		self._search_bar.nextRequested.connect(self.go_to_next_match)
+		self._search_bar.previousRequested.connect(self.go_to_previous_match)
+		self._search_bar.closeRequested.connect(self.hide_search_bar)
+		self._search_shortcut = QtGui.QShortcut(QtGui.QKeySequence(QtGui.QKeySequence.StandardKey.Find), self)
+		self._search_shortcut.setContext(QtCore.Qt.ShortcutContext.WidgetWithChildrenShortcut)
+		self._search_shortcut.activated.connect(self.show_search_bar)
+		self.ui.consoleTextEdit.verticalScrollBar().valueChanged.connect(self._update_text_edit_search_highlights)
+
+		#============Filter==================
+		#Show-only filters (log-level, include/exclude pattern), applied by the (virtualized) ConsoleLineView
+		self._filter_levels : typing.List[str] = list(ConsoleLineFilter.LEVELS)
+		self._filter_include_pattern = ""
+		self._filter_exclude_pattern = ""
+		self._filter_bar = ConsoleFilterBar(self)
+		self._filter_bar.hide()
+		self.ui.verticalLayout.insertWidget(1, self._filter_bar)
+		self._filter_bar.levelsChanged.connect(self.set_enabled_levels)
+		self._filter_bar.includePatternChanged.connect(self.set_include_pattern)
+		self._filter_bar.excludePatternChanged.connect(self.set_exclude_pattern)
+
+		#============Metrics==================
+		self._metrics = ConsoleMetrics()
+		self._metrics_interval = 0.0
+		self._metrics_timer = QtCore.QTimer(self)
+		self._metrics_timer.timeout.connect(self._on_metrics_timer)
+		self._metrics_overlay = QtWidgets.QLabel(self)
+		self._metrics_overlay.setObjectName("consoleMetricsOverlay")
+		self._metrics_overlay.setAttribute(QtCore.Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+		self._metrics_overlay.setStyleSheet(
+			"QLabel#consoleMetricsOverlay { background-color: rgba(0, 0, 0, 160); color: white; padding: 4px; }")
+		self._metrics_overlay.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.SystemFont.FixedFont))
+		self._metrics_overlay.hide()
+
+		self.set_use_virtualized_view(use_virtualized_view)
+
+	def get_metrics(self) -> typing.Dict[str, typing.Any]:
+		"""Returns the throughput counters of this widget (since creation or reset_metrics), e.g. to tune
+		display_max_blocks, ui_text_min_update_interval or polling intervals:
+			- lines_ingested / lines_per_second: Lines received from the selected item
+			- batches_ingested / flush_count: Received loadedLinesChanged-emissions and the number of (coalesced) edits
+				of the display they resulted in
+			- dropped_lines: Lines that were never displayed because of display_max_blocks
+			- gui_time_last_ms / gui_time_max_ms / gui_time_mean_ms: Time spent per edit of the display
+			- latency_last_ms / latency_max_ms: Time between the text being written (as reported by the item) and it
+				being displayed
+			- item: The metrics of the selected item (see BaseConsoleItem.get_metrics)
+		"""
+		metrics : typing.Dict[str, typing.Any] = self._metrics.to_dict()
+		metrics["item"] = self._current_item.get_metrics() if self._current_item is not None else {}
+		return metrics
+
+	def reset_metrics(self) -> None:
+		"""Reset the throughput counters of this widget (not those of the items)"""
+		self._metrics.reset()
+
+	def get_metrics_interval(self) -> float:
+		"""Returns the interval in seconds at which metricsChanged is emitted, 0 if disabled"""
+		return self._metrics_interval
+
+	def set_metrics_interval(self, interval : float) -> None:
+		"""Set the interval in seconds at which metricsChanged is emitted (and the overlay is updated), 0 to disable
+
+		Args:
+			interval (float): The interval in seconds
+		"""
+		self._metrics_interval = max(0.0, interval)
+		if self._metrics_interval > 0:
+			self._metrics_timer.start(max(1, int(self._metrics_interval * 1000)))
+		elif self._metrics_overlay.isHidden():
+			self._metrics_timer.stop()
+		else: #Keep updating the overlay
+			self._metrics_timer.start(1000)
+
+	def get_metrics_overlay_visible(self) -> bool:
+		"""Returns whether the metrics are displayed on top of the console-output"""
+		return not self._metrics_overlay.isHidden()
+
+	def set_metrics_overlay_visible(self, visible : bool) -> None:
+		"""Show/hide the metrics on top of the console-output (debug-overlay), updated every metrics-interval seconds,
+		or every second if no interval is set"""
+		self._metrics_overlay.setVisible(visible)
+		self.set_metrics_interval(self._metrics_interval)
+		if visible:
+			self._on_metrics_timer()
+
+	def _on_metrics_timer(self) -> None:
+		metrics = self.get_metrics()
+		if self._metrics_overlay.isVisible():
+			item_metrics = metrics["item"]
+			lines = [f"{key}: {value:.1f}" if isinstance(value, float) else f"{key}: {value}"
+				for key, value in metrics.items() if key != "item"]
+			lines += [f"item.{key}: {value:.1f}" if isinstance(value, float) else f"item.{key}: {value}"
+				for key, value in item_metrics.items() if key != "last_change_time"]
+			self._metrics_overlay.setText("\n".join(lines))
+			self._metrics_overlay.adjustSize()
+			self._position_metrics_overlay()
+		self.metricsChanged.emit(metrics)
+
+	def _position_metrics_overlay(self) -> None:
+		"""Place the overlay in the top-right corner of the console-output"""
+		display = self._line_view if self._line_view is not None else self.ui.consoleTextEdit
+		top_right = display.mapTo(self, QtCore.QPoint(display.width(), 0))
+		self._metrics_overlay.move(max(0, top_right.x() - self._metrics_overlay.width() - 20), top_right.y())
+		self._metrics_overlay.raise_()
+
+	def resizeEvent(self, event : QtGui.QResizeEvent) -> None:
+		super().resizeEvent(event)
+		if self._metrics_overlay.isVisible():
+			self._position_metrics_overlay()
+
+	def get_use_virtualized_view(self) -> bool:
+		"""Returns whether the console-output is displayed using a (virtualized) ConsoleLineView"""
+		return self._line_view is not None
+
+	def set_use_virtualized_view(self, use_virtualized_view : bool) -> None:
+		"""Switch between displaying the console-output using a QPlainTextEdit and a (virtualized) ConsoleLineView.
+		The ConsoleLineView only paints the lines that are visible, so its rendering-cost does not depend on the
+		number of displayed lines. The contents of the currently selected item are re-loaded into the new view.
+		NOTE: line-filters (see set_enabled_levels) are only applied by the ConsoleLineView.
+
+		Args:
+			use_virtualized_view (bool): Whether to use the ConsoleLineView
+		"""
+		if use_virtualized_view == self.get_use_virtualized_view():
+			return
+
+		self.clear_hidden_panes() #Panes are rendered by the previous view
+
+		if use_virtualized_view:
+			self._line_view = self._create_line_view()
+			self._apply_line_filter(levels=True, include=True, exclude=True, views=[self._line_view])
+			self._pane_splitter.replaceWidget(self._pane_splitter.indexOf(self.ui.consoleTextEdit), self._line_view)
+			self.ui.consoleTextEdit.setParent(self) #Keep the text edit alive so we can switch back
+			self.ui.consoleTextEdit.hide()
+			if self._search_active:
+				self._line_view.set_search_index(self._search_index)
+		else:
+			assert self._line_view is not None
+			self._pane_splitter.replaceWidget(self._pane_splitter.indexOf(self._line_view), self.ui.consoleTextEdit)
+			self.ui.consoleTextEdit.show()
+			self._line_view.deleteLater()
+			self._line_view = None
+
+		self._current_match_nr = -1
+		self.ui.consoleTextEdit.setPlainText("")
+		self.currently_loaded_lines = [0, 0]
+		self._flush_timer.stop()
+		self._pending_lines.clear() #Pending lines are part of the item-buffer that is re-loaded below
+		if self._current_item is not None: #Re-load the current item into the new view
+			cur_line_list, from_index = self._current_item.get_current_line_list()
+			self.process_line_change(cur_line_list, from_index)
+			self._scroll_to_bottom()
+
+	def _create_line_view(self) -> ConsoleLineView:
+		line_view = ConsoleLineView(max_lines=self._display_max_blocks, line_processor=self._line_processor)
+		line_view.setObjectName("consoleLineView")
+		return line_view
+
+	def _create_document(self) -> QtGui.QTextDocument:
+		document = QtGui.QTextDocument(self)
+		document.setDocumentLayout(QtWidgets.QPlainTextDocumentLayout(document))
+		document.setDefaultFont(self.ui.consoleTextEdit.font())
+		document.setMaximumBlockCount(self._display_max_blocks + 1) #+1 for the trailing empty block
+		return document
+
+	def get_max_hidden_panes(self) -> int:
+		"""Returns the number of previously selected items of which the rendered console-output is kept"""
+		return self._max_hidden_panes
+
+	def set_max_hidden_panes(self, max_hidden_panes : int) -> None:
+		"""Set the number of previously selected items of which the rendered console-output is kept (see ConsolePane),
+		so switching back to them does not re-load their lines. The least recently selected panes are discarded first.
+
+		Args:
+			max_hidden_panes (int): The maximum number of hidden panes, 0 to always re-load the selected item
+		"""
+		self._max_hidden_panes = max(0, max_hidden_panes)
+		while len(self._hidden_panes) > self._max_hidden_panes:
+			self._hidden_panes.popitem(last=False)[1].close()
+
+	def clear_hidden_panes(self) -> None:
+		"""Discard the rendered console-output of all items that are not currently displayed"""
+		while len(self._hidden_panes) > 0:
+			self._hidden_panes.popitem(last=False)[1].close()
+
+	def add_split_pane(self, item : BaseConsoleItem) -> None:
+		"""Show the output of the passed item live in a split pane below the output of the selected item, so multiple
+		items can be followed at once. Split panes are always displayed using a (virtualized) ConsoleLineView and use
+		the same line-filters as the selected item. Search and metrics only apply to the selected item.
+		If the rendered output of the item has been kept (see max_hidden_panes), it is re-used.
+
+		Args:
+			item (BaseConsoleItem): The item to show, nothing happens if it is already shown in a split pane
+		"""
+		if item in self._split_panes:
+			return
+		pane = self._hidden_panes.pop(item, None)
+		if pane is not None and pane.line_view is None: #Rendered by the text edit -> can not be re-used
+			pane.close()
+			pane = None
+		if pane is None:
+			pane = ConsolePane(item, LineChangeBuffer(self._display_max_blocks))
+			pane.line_view = self._create_line_view()
+			pane.needs_reload = True #Load all lines of the item on the first flush
+
+		frame = QtWidgets.QWidget()
+		layout = QtWidgets.QVBoxLayout(frame)
+		layout.setContentsMargins(0, 0, 0, 0)
+		layout.setSpacing(0)
+		header = QtWidgets.QHBoxLayout()
+		header.setContentsMargins(4, 0, 0, 0)
+		header.addWidget(QtWidgets.QLabel(str(item.data(QtCore.Qt.ItemDataRole.DisplayRole, 0)), frame), 1)
+		close_button = QtWidgets.QToolButton(frame)
+		close_button.setIcon(self.style().standardIcon(QtWidgets.QStyle.StandardPixmap.SP_TitleBarCloseButton))
+		close_button.setAutoRaise(True)
+		close_button.setToolTip("Close split pane")
+		close_button.clicked.connect(lambda: self.remove_split_pane(item))
+		header.addWidget(close_button)
+		layout.addLayout(header)
+		layout.addWidget(pane.line_view)
+		pane.line_view.show()
+		pane.frame = frame
+		pane.lines_added = self._schedule_split_pane_flush
+		self._split_panes[item] = pane
+		self._pane_splitter.addWidget(frame)
+
+		self._apply_pane_line_filter(pane, pane.line_view)
+		reloaded = pane.needs_reload
+		pane.flush_to_line_view()
+		if reloaded:
+			pane.line_view.scroll_to_bottom()
+
+	def remove_split_pane(self, item : BaseConsoleItem) -> None:
+		"""Close the split pane of the passed item (if any). Its rendered output is kept as a hidden pane (see
+		max_hidden_panes) if the virtualized view is used, so selecting the item afterwards is instant."""
+		pane = self._split_panes.pop(item, None)
+		if pane is None:
+			return
+		frame, pane.frame = pane.frame, None
+		pane.lines_added = None
+		assert pane.line_view is not None
+		if self._line_view is not None and self._max_hidden_panes > 0 and item is not self._current_item:
+			pane.line_view.setParent(self) #Keep the view alive, the frame is deleted below
+			pane.line_view.hide()
+			pane.filter_settings = (list(self._filter_levels), self._filter_include_pattern, self._filter_exclude_pattern)
+			old_pane = self._hidden_panes.pop(item, None) #E.g. if the item was also shown by the main view before
+			if old_pane is not None:
+				old_pane.close()
+			self._hidden_panes[item] = pane
+			while len(self._hidden_panes) > self._max_hidden_panes:
+				self._hidden_panes.popitem(last=False)[1].close()
+		else:
+			pane.close()
+		if frame is not None:
+			frame.deleteLater()
+
+	def clear_split_panes(self) -> None:
+		"""Close all split panes, their rendered output is discarded"""
+		for pane in self._split_panes.values():
+			pane.close()
+		self._split_panes = {}
+
+	def get_split_pane_items(self) -> typing.List[BaseConsoleItem]:
+		"""Returns the items that are shown in a split pane (top to bottom)"""
+		return list(self._split_panes)
+
+	def _schedule_split_pane_flush(self) -> None:
+		if not self._split_flush_timer.isActive():
+			self._split_flush_timer.start(max(0, int(self._ui_text_min_update_interval * 1000)))
+
+	def flush_split_panes(self) -> None:
+		"""Display the gathered lines of all split panes, called at most once every ui_text_min_update_interval
+		seconds when new lines arrive"""
+		self._split_flush_timer.stop()
+		for pane in self._split_panes.values():
+			pane.flush_to_line_view()
+
+	def _show_item_context_menu(self, pos : QtCore.QPoint) -> None:
+		"""Context-menu of the item-list, used to open/close the split pane of an item"""
+		index = self.ui.fileSelectionTableView.indexAt(pos)
+		if not index.isValid():
+			return
+		item = self._files_proxy_model.data(index, role=QtCore.Qt.ItemDataRole.UserRole + 1)
+		if not isinstance(item, BaseConsoleItem):
+			return
+		menu = QtWidgets.QMenu(self)
+		if item in self._split_panes:
+			menu.addAction("Close split pane").triggered.connect(lambda: self.remove_split_pane(item))
+		else:
+			menu.addAction("Show in split pane").triggered.connect(lambda: self.add_split_pane(item))
+		menu.exec(self.ui.fileSelectionTableView.viewport().mapToGlobal(pos))
+
+	def _hide_current_pane(self) -> None:
+		"""Move the rendered output of the current item into a hidden pane, which keeps gathering its new lines"""
+		assert self._current_item is not None
+		pane = ConsolePane(self._current_item, self._pending_lines) #Lines that were not yet displayed are kept
+		self._pending_lines = LineChangeBuffer(self._display_max_blocks)
+		if self._line_view is not None:
+			pane.line_view = self._line_view
+			pane.filter_settings = (
+				list(self._filter_levels), self._filter_include_pattern, self._filter_exclude_pattern)
+		else:
+			pane.document = self.ui.consoleTextEdit.document()
+			pane.loaded_lines = list(self.currently_loaded_lines)
+			scrollbar = self.ui.consoleTextEdit.verticalScrollBar()
+			pane.scroll_value = scrollbar.value()
+			pane.at_bottom = scrollbar.value() > scrollbar.maximum() - 4
+		self._hidden_panes[self._current_item] = pane
+		while len(self._hidden_panes) > self._max_hidden_panes:
+			self._hidden_panes.popitem(last=False)[1].close()
+
+	def _show_pane(self, pane : ConsolePane | None) -> bool:
+		"""Display the passed pane (or an empty view if None) instead of the current document/line view, the previous
+		document/view is deleted unless it has been moved into a hidden pane. Lines that arrived while the pane was
+		hidden are displayed right away.
+
+		Returns:
+			bool: False if the pane could not be restored (e.g. its lines were reset), an empty view is shown instead
+		"""
+		if pane is not None and (pane.needs_reload or (pane.line_view is None) != (self._line_view is None)):
+			pane.close()
+			pane = None
+		hidden_widgets = {hidden.line_view for hidden in self._hidden_panes.values()} | \
+			{hidden.document for hidden in self._hidden_panes.values()}
+
+		if self._line_view is not None:
+			new_view = pane.line_view if pane is not None else self._create_line_view()
+			self._pane_splitter.replaceWidget(self._pane_splitter.indexOf(self._line_view), new_view)
+			new_view.show()
+			self._line_view.setParent(self) #Replaced widget has no parent anymore
+			self._line_view.hide()
+			if self._line_view not in hidden_widgets:
+				self._line_view.deleteLater()
+			self._line_view = new_view
+			self._apply_pane_line_filter(pane, new_view)
+			if self._search_active:
+				self._line_view.set_search_index(self._search_index)
+		else:
+			old_document = self.ui.consoleTextEdit.document()
+			self.ui.consoleTextEdit.setDocument(pane.document if pane is not None else self._create_document())
+			if old_document not in hidden_widgets:
+				old_document.deleteLater()
+			self._tail_cursor = QtGui.QTextCursor(self.ui.consoleTextEdit.document())
+			self.currently_loaded_lines = list(pane.loaded_lines) if pane is not None else [0, 0]
+			if pane is not None:
+				scrollbar = self.ui.consoleTextEdit.verticalScrollBar()
+				scrollbar.setValue(scrollbar.maximum() if pane.at_bottom else pane.scroll_value)
+
+		if pane is None:
+			return False
+		pane.document = None #Now owned by the widget again
+		pane.line_view = None
+		self._pending_lines = pane.pending_lines
+		pane.close()
+		self.flush_pending_lines()
+		self._update_text_edit_search_highlights()
+		return True
+
+	def _on_model_rows_about_to_be_removed(self, parent : QtCore.QModelIndex, first : int, last : int) -> None:
+		"""Discard the hidden- and split panes of the items that are removed"""
+		if self._source_model is None:
+			return
+		for row in range(first, last + 1):
+			item = self._source_model.index(row, 0, parent).data(QtCore.Qt.ItemDataRole.UserRole + 1)
+			if item is not None and item is self._current_item: #Don't keep a pane once another item is selected
+				self._current_item_removed = True
+			for panes in (self._hidden_panes, self._split_panes):
+				pane = panes.pop(item, None)
+				if pane is not None:
+					pane.close()
+
+	def get_filter_bar_visible(self) -> bool:
+		"""Returns whether the filter-bar (log-level toggles, include/exclude patterns) is shown"""
+		return not self._filter_bar.isHidden()
+
+	def set_filter_bar_visible(self, visible : bool) -> None:
+		"""Show/hide the filter-bar. Filters are only applied by the virtualized view, so showing the filter-bar
+		switches to it. Hiding the filter-bar does not reset the filters."""
+		if visible:
+			self.set_use_virtualized_view(True)
+		self._filter_bar.setVisible(visible)
+
+	def set_enabled_levels(self, levels : typing.Iterable[str]) -> None:
+		"""Only show lines with the passed log-levels (from ConsoleLineFilter.LEVELS), lines without a level are always
+		shown. Toggling levels does not re-evaluate the lines. Switches to the virtualized view if any level is hidden.
+
+		Args:
+			levels (Iterable[str]): The log-levels to show, e.g. ["INFO", "WARNING", "ERROR", "CRITICAL"]
+		"""
+		self._filter_levels = [level.upper() for level in levels]
+		self._filter_bar.blockSignals(True)
+		self._filter_bar.set_enabled_levels(self._filter_levels)
+		self._filter_bar.blockSignals(False)
+		if len(set(ConsoleLineFilter.LEVELS) - set(self._filter_levels)) > 0:
+			self.set_use_virtualized_view(True)
+		self._apply_line_filter(levels=True)
+
+	def set_include_pattern(self, pattern : str) -> None:
+		"""Only show lines matching the passed regex-pattern, an empty pattern disables the include-filter.
+		Switches to the virtualized view if the pattern is not empty. Invalid patterns are ignored (and marked as such
+		in the filter-bar)."""
+		self._filter_include_pattern = pattern
+		if self._filter_bar.include_edit.text() != pattern: #Not set by the user -> mirror in the filter-bar
+			self._filter_bar.blockSignals(True)
+			self._filter_bar.include_edit.setText(pattern)
+			self._filter_bar.blockSignals(False)
+		if pattern:
+			self.set_use_virtualized_view(True)
+		self._apply_line_filter(include=True)
+
+	def set_exclude_pattern(self, pattern : str) -> None:
+		"""Hide lines matching the passed regex-pattern, an empty pattern disables the exclude-filter.
+		Switches to the virtualized view if the pattern is not empty. Invalid patterns are ignored (and marked as such
+		in the filter-bar)."""
+		self._filter_exclude_pattern = pattern
+		if self._filter_bar.exclude_edit.text() != pattern: #Not set by the user -> mirror in the filter-bar
+			self._filter_bar.blockSignals(True)
+			self._filter_bar.exclude_edit.setText(pattern)
+			self._filter_bar.blockSignals(False)
+		if pattern:
+			self.set_use_virtualized_view(True)
+		self._apply_line_filter(exclude=True)
+
+	def _apply_pane_line_filter(self, pane : ConsolePane | None, view : ConsoleLineView) -> None:
+		"""Apply the current filter-settings to the line view of a (new or previously hidden) pane"""
+		if pane is None or pane.filter_settings is None:
+			self._apply_line_filter(levels=True, include=True, exclude=True, views=[view])
+		else: #Only re-evaluate the patterns that changed while the pane was hidden
+			levels, include, exclude = pane.filter_settings
+			self._apply_line_filter(levels=levels != self._filter_levels,
+				include=include != self._filter_include_pattern, exclude=exclude != self._filter_exclude_pattern,
+				views=[view])
+
+	def _apply_line_filter(self,
+			levels : bool = False,
+			include : bool = False,
+			exclude : bool = False,
+			views : typing.List[ConsoleLineView] | None = None
+		) -> None:
+		"""Pass the passed filter-settings to the line views (if used). Only setting a pattern re-evaluates the lines.
+
+		Args:
+			views (list[ConsoleLineView], optional): The views to apply the settings to. Defaults to None, in which case
+				the main line view (if used) and the views of all split panes are updated.
+		"""
+		if views is None:
+			views = [pane.line_view for pane in self._split_panes.values() if pane.line_view is not None]
+			if self._line_view is not None:
+				views.insert(0, self._line_view)
+		for view in views:
+			if levels:
+				view.set_enabled_levels(self._filter_levels)
+			if include:
+				try:
+					view.set_include_pattern(self._filter_include_pattern)
+					self._filter_bar.set_include_error(False)
+				except re.error:
+					view.set_include_pattern("")
+					self._filter_bar.set_include_error(True)
+			if exclude:
+				try:
+					view.set_exclude_pattern(self._filter_exclude_pattern)
+					self._filter_bar.set_exclude_error(False)
+				except re.error:
+					view.set_exclude_pattern("")
+					self._filter_bar.set_exclude_error(True)
+
+	def _clear_console(self) -> None:
+		"""Remove all text from the console-view"""
+		if self._line_view is not None:
+			self._line_view.clear()
+		else:
+			self.ui.consoleTextEdit.setPlainText("")
+		self.currently_loaded_lines = [0, 0]
+
+	def _scroll_to_bottom(self) -> None:
+		"""Scroll the console-view to the last line"""
+		if self._line_view is not None:
+			self._line_view.scroll_to_bottom()
+		else:
+			self.ui.consoleTextEdit.verticalScrollBar().setValue(self.ui.consoleTextEdit.verticalScrollBar().maximum())
 
 	def selection_changed(self, selection : QtCore.QItemSelection):
 		"""
@@ -117,43 +857,244 @@ class ConsoleWidget(QtWidgets.QWidget):
 		Args:
 			selection (PySide6.QtCore.QItemSelection): The new selection
 		"""
+		new_item = None
+		if len(selection.indexes()) > 0 and selection.indexes()[0].isValid():
+			new_item = self._files_proxy_model.data(selection.indexes()[0], role = QtCore.Qt.ItemDataRole.UserRole + 1)
+			assert isinstance(new_item, BaseConsoleItem), "Item is not of type BaseConsoleItem"
+		if new_item is not None and new_item is self._current_item: #Still subscribed and displayed
+			return
+
 		if self._current_linechange_connect is not None: #If selection changed -> stop subscribing to the old item
 			# self._current_linechange_connect.disconnect()
 			self.disconnect(self._current_linechange_connect)
 			self._current_linechange_connect = None
+		self._flush_timer.stop()
 
-		if len(selection.indexes()) == 0:
-			self.ui.consoleTextEdit.setPlainText("")
+		hidden_current = False
+		if self._current_item is not None and not self._current_item_removed and self._max_hidden_panes > 0:
+			self._hide_current_pane() #Keep the rendered output of the previous item, so switching back is instant
+			hidden_current = True
+		else:
+			self._pending_lines.clear() #Pending lines belong to the previous item
+
+		self._current_item_removed = False
+		if new_item is None:
+			self._current_item = None
+			if hidden_current: #Display an empty document/view instead
+				self._show_pane(None)
+			self._clear_console()
+			if self._search_active:
+				self._reload_search_lines()
 			return
-		elif selection.indexes()[0].isValid():
-			self.ui.consoleTextEdit.setPlainText("")
-			index = selection.indexes()[0]
-			item = self._files_proxy_model.data(index, role = QtCore.Qt.ItemDataRole.UserRole + 1)
-			assert isinstance(item, BaseConsoleItem), "Item is not of type BaseConsoleItem"
 
-			#Subscribe to new lines
-			self._current_linechange_connect = item.loadedLinesChanged.connect(self.process_line_change)
+		self._current_item = new_item
+		#Subscribe to new lines
+		self._current_linechange_connect = new_item.loadedLinesChanged.connect(self._on_loaded_lines_changed)
 
-			#Get the current text of the item
-			cur_line_list, from_index = item.get_current_line_list()
+		if self._search_active:
+			self._reload_search_lines()
+
+		pane = self._hidden_panes.pop(new_item, None)
+		restored = self._show_pane(pane) if (pane is not None or hidden_current) else False
+		if not restored: #Not rendered before -> load all lines
+			self._clear_console()
+			cur_line_list, from_index = new_item.get_current_line_list()
 			self.process_line_change(cur_line_list, from_index)
 			#Set slider to bottom
-			self.ui.consoleTextEdit.verticalScrollBar().setValue(self.ui.consoleTextEdit.verticalScrollBar().maximum())
+			self._scroll_to_bottom()
+
+	def show_search_bar(self) -> None:
+		"""Show and focus the search-bar, matches of the search-pattern in the full line-buffer of the current item
+		are highlighted."""
+		if not self._search_active:
+			self._search_active = True
+			self._search_bar.show()
+			if self._line_view is not None:
+				self._line_view.set_search_index(self._search_index)
+			self._reload_search_lines()
+			self._on_search_changed(
+				self._search_bar.get_pattern(), self._search_bar.is_case_sensitive(), self._search_bar.is_regex())
+		self._search_bar.focus_search()
+
+	def hide_search_bar(self) -> None:
+		"""Hide the search-bar and remove all search-highlights"""
+		if not self._search_active:
+			return
+		self._search_active = False
+		self._search_bar.hide()
+		self._current_match_nr = -1
+		self._search_index.set_pattern("")
+		self._search_index.clear()
+		if self._line_view is not None:
+			self._line_view.set_search_index(None)
+			self._line_view.setFocus()
+		else:
+			self.ui.consoleTextEdit.setExtraSelections([])
+			self.ui.consoleTextEdit.setFocus()
+
+	def _reload_search_lines(self) -> None:
+		"""(Re)load the full line-buffer of the current item into the search-index"""
+		self._current_match_nr = -1
+		if self._current_item is None:
+			self._search_index.clear()
+		else:
+			cur_line_list, from_index = self._current_item.get_current_line_list()
+			self._search_index.set_lines(self._line_processor.to_plain_lines(cur_line_list), from_index)
 
+	def _trim_search_index(self, first_line : int) -> None:
+		"""Drop the lines (and matches) the current item no longer keeps from the search-index, so it does not grow
+		beyond the lines of the item"""
+		if first_line <= self._search_index.get_first_line():
+			return
+		if self._current_match_nr >= 0: #Keep pointing at the same match, matches before first_line are removed
+			self._current_match_nr -= self._search_index.previous_match_nr(first_line - 1) + 1
+			self._current_match_nr = max(self._current_match_nr, -1)
+		self._search_index.trim(first_line)
+
+	def _on_search_changed(self, pattern : str, case_sensitive : bool, use_regex : bool) -> None:
+		self._current_match_nr = -1
+		try:
+			self._search_index.set_pattern(pattern, case_sensitive, use_regex)
+		except re.error:
+			self._search_index.set_pattern("")
+			self._search_bar.set_status("Invalid", error=True)
+
+	def _on_search_matches_changed(self) -> None:
+		if self._current_match_nr >= self._search_index.match_count(): #Current match was removed
+			self._current_match_nr = -1
+		self._update_search_status()
+		if self._line_view is not None:
+			self._line_view.set_current_match(
+				self._search_index.get_match(self._current_match_nr) if self._current_match_nr >= 0 else None)
+		else:
+			self._update_text_edit_search_highlights()
 
-	@staticmethod
-	def _get_index_nth_occurence(string : str, char : str, occurence : int) -> int:
-		counter = 0
-		if occurence <= 0:
-			return 0
-		for i, char in enumerate(string):
-			if char == "\n":
-				counter += 1
-			if counter >= occurence:
-				# self._prev_textedit_index = i
-				return i
+	def _update_search_status(self, suffix : str = "") -> None:
+		if not self._search_index.has_pattern():
+			self._search_bar.set_status("")
+			return
+		current = str(self._current_match_nr + 1) if self._current_match_nr >= 0 else "?"
+		indexing = " ..." if self._search_index.is_indexing() else ""
+		self._search_bar.set_status(f"{current}/{self._search_index.match_count()}{indexing}{suffix}")
+
+	def _visible_line_range(self) -> typing.Tuple[int, int]:
+		"""Returns the (first, last) (item-)line-index that is currently visible in the console-view"""
+		if self._line_view is not None:
+			return self._line_view.visible_line_range()
+		text_edit = self.ui.consoleTextEdit
+		first = text_edit.cursorForPosition(QtCore.QPoint(0, 0)).blockNumber()
+		last = text_edit.cursorForPosition(QtCore.QPoint(0, text_edit.viewport().height())).blockNumber()
+		return self.currently_loaded_lines[0] + first, self.currently_loaded_lines[0] + last
+
+	def go_to_next_match(self) -> None:
+		"""Scroll to the next search-match (or the first match in/after the visible lines if there is none)"""
+		self._go_to_match(forward=True)
+
+	def go_to_previous_match(self) -> None:
+		"""Scroll to the previous search-match (or the last match in/before the visible lines if there is none)"""
+		self._go_to_match(forward=False)
+
+	def _go_to_match(self, forward : bool) -> None:
+		match_count = self._search_index.match_count()
+		if match_count == 0:
+			return
+		if self._current_match_nr >= 0:
+			match_nr = (self._current_match_nr + (1 if forward else -1)) % match_count
+		elif forward:
+			match_nr = max(0, self._search_index.next_match_nr(self._visible_line_range()[0]))
+		else:
+			match_nr = self._search_index.previous_match_nr(self._visible_line_range()[1]) % match_count
+
+		self._current_match_nr = match_nr
+		line, start, end = self._search_index.get_match(match_nr)
+		if self._line_view is not None:
+			self._line_view.set_current_match((line, start, end))
+			shown = self._line_view.scroll_to_line(line, start)
+		else:
+			shown = self._select_text_edit_match(line, start, end)
+		self._update_search_status("" if shown else f" (line {line} not displayed)")
+
+	def _select_text_edit_match(self, line : int, start : int, end : int) -> bool:
+		"""Select and scroll to the passed match in the text edit, returns False if the line is not displayed"""
+		block_nr = line - self.currently_loaded_lines[0]
+		if block_nr < 0 or line >= self.currently_loaded_lines[1]:
+			return False
+		block = self.ui.consoleTextEdit.document().findBlockByNumber(block_nr)
+		cursor = QtGui.QTextCursor(block)
+		cursor.setPosition(block.position() + min(start, block.length() - 1))
+		cursor.setPosition(block.position() + min(end, block.length() - 1), QtGui.QTextCursor.MoveMode.KeepAnchor)
+		self.ui.consoleTextEdit.setTextCursor(cursor)
+		self.ui.consoleTextEdit.centerCursor()
+		return True
+
+	def _update_text_edit_search_highlights(self, *_) -> None:
+		"""Highlight the search-matches in the visible part of the text edit"""
+		if not self._search_active or self._line_view is not None:
+			return
+		text_edit = self.ui.consoleTextEdit
+		document = text_edit.document()
+		first_line, last_line = self._visible_line_range()
+		selections = []
+		for line, start, end in self._search_index.matches_in_range(first_line, last_line):
+			block = document.findBlockByNumber(line - self.currently_loaded_lines[0])
+			if not block.isValid():
+				continue
+			selection = QtWidgets.QTextEdit.ExtraSelection()
+			cursor = QtGui.QTextCursor(block)
+			cursor.setPosition(block.position() + min(start, block.length() - 1))
+			cursor.setPosition(block.position() + min(end, block.length() - 1), QtGui.QTextCursor.MoveMode.KeepAnchor)
+			selection.cursor = cursor #type: ignore
+			selection.format.setBackground(ConsoleLineView.MATCH_COLOR) #type: ignore
+			selections.append(selection)
+		text_edit.setExtraSelections(selections)
+
+
+	def _on_loaded_lines_changed(self, new_line_list : typing.List[str], from_line : int) -> None:
+		"""Called when the subscribed item emits new lines. Lines are gathered and displayed at most once every
+		ui_text_min_update_interval seconds, so high-rate output results in a single edit per interval instead of an
+		edit per emission.
+		"""
+		self._metrics.add_lines(len(new_line_list))
+		if self._search_active: #Search all lines, including the ones that are never displayed
+			self._search_index.process_line_change(self._line_processor.to_plain_lines(new_line_list), from_line)
+			if self._current_item is not None:
+				self._trim_search_index(self._current_item.get_first_line())
+
+		if self._ui_text_min_update_interval <= 0:
+			self._display_lines(new_line_list, from_line)
+			return
 
-		return -1
+		if not self._pending_lines.add(new_line_list, from_line): #Not contiguous -> display pending lines first
+			self.flush_pending_lines()
+			self._pending_lines.add(new_line_list, from_line)
+
+		if self._flush_timer.isActive():
+			return
+		remaining = self._ui_text_min_update_interval - (time.perf_counter() - self._last_flush_time)
+		if remaining <= 0: #Last update was long enough ago -> display right away
+			self.flush_pending_lines()
+		else:
+			self._flush_timer.start(int(remaining * 1000))
+
+	def flush_pending_lines(self) -> None:
+		"""Display all gathered line-changes using a single edit"""
+		self._flush_timer.stop()
+		self._last_flush_time = time.perf_counter()
+		self._metrics.dropped_lines += self._pending_lines.dropped_lines
+		self._pending_lines.dropped_lines = 0
+		if self._pending_lines.is_empty():
+			return
+		new_line_list, from_line = self._pending_lines.take()
+		self._display_lines(new_line_list, from_line)
+
+	def _display_lines(self, new_line_list : typing.List[str], from_line : int) -> None:
+		"""Display the passed new lines of the current item and register the time it took in the metrics"""
+		self._metrics.dropped_lines += max(0, len(new_line_list) - self._display_max_blocks)
+		start = time.perf_counter()
+		self.process_line_change(new_line_list, from_line)
+		gui_time = time.perf_counter() - start
+		change_time = self._current_item.get_metrics().get("last_change_time", 0) if self._current_item else 0
+		self._metrics.add_flush(gui_time, time.time() - change_time if change_time else None)
 
 	def process_line_change(self, new_line_list : list[str], from_line : int = 0):
 		"""
@@ -161,54 +1102,97 @@ class ConsoleWidget(QtWidgets.QWidget):
 		NOTE: it is probably most efficient if we only call this method with the new text, not the entire text, pyside
 			might not be able to send python-lists efficiently TODO: check
 
+		Pure tail-appends are inserted without re-positioning the cursor, overwrites of already displayed lines are
+		positioned using QTextDocument.findBlockByNumber. Lines are passed through the line-processor first, so ANSI
+		colors are rendered and carriage-return overwrites (e.g. progress-bars) are collapsed.
+
 		#TODO: also implement a reset (e.g. when file is cleared)? Right now we can only add to an existing file
 		Args:
 			new_line_list (list[str]): The new text of the item
 			from_line (int, optional): The line-index (in the original) buffer of the item from which we replace/append the new
 				lines.
 		"""
+		if self._line_view is not None:
+			self._line_view.process_line_change(new_line_list, from_line)
+			return
+
 		if len(new_line_list) > self._display_max_blocks: #Don't just append useless new lines that will be removed anyway
 			from_line = from_line + len(new_line_list) - self._display_max_blocks
 			new_line_list = new_line_list[-self._display_max_blocks:]
 
-		new_loaded_lines = [ #Calculate the new currently loaded lines
-			# max(self.currently_loaded_lines[0], from_line),
-			min(self.currently_loaded_lines[0], from_line),
-			max(from_line + len(new_line_list), self.currently_loaded_lines[1])
-		]
-		shift = 0
-		#If we're exceeding the block-limit, shift the currently loaded lines
-		if new_loaded_lines[1] - new_loaded_lines[0] > self._display_max_blocks:
-			# new_line_list = new_line_list[new_loaded_lines[1] - new_loaded_lines[0] - self._display_max_blocks:]
-			shift = new_loaded_lines[1] - self._display_max_blocks - new_loaded_lines[0]
-			new_loaded_lines = new_loaded_lines[1]- self._display_max_blocks, new_loaded_lines[1] #Only keep the last x lines
+		loaded_start, loaded_end = self.currently_loaded_lines
+		if loaded_start == loaded_end: #Nothing displayed yet -> start displaying from the passed line
+			loaded_start = loaded_end = from_line
+		elif from_line < loaded_start: #Lines before the displayed range have already been trimmed -> skip them
+			new_line_list = new_line_list[loaded_start - from_line:]
+			from_line = loaded_start
+		elif from_line > loaded_end: #Gap in line-indexes -> append at the end
+			loaded_start += from_line - loaded_end
+			loaded_end = from_line
 
-		start_line = max(from_line - self.currently_loaded_lines[0], 0) #Relative to the left-most line
+		new_texts, new_runs = self._line_processor.process_lines(new_line_list)
 
 		at_end_scrollbar = (
 			self.ui.consoleTextEdit.verticalScrollBar().value() > self.ui.consoleTextEdit.verticalScrollBar().maximum()-4
 		)
 
-		#Set cursor to the desired position
-		cur_cursor = self.ui.consoleTextEdit.textCursor()
-		cur_cursor.movePosition(QtGui.QTextCursor.MoveOperation.Start)
-		cur_cursor.movePosition(QtGui.QTextCursor.MoveOperation.Down, QtGui.QTextCursor.MoveMode.MoveAnchor, start_line)
+		if from_line == loaded_end: #Pure tail-append -> the tail-cursor is already at the end of the document
+			if not self._tail_cursor.atEnd():
+				self._tail_cursor.movePosition(QtGui.QTextCursor.MoveOperation.End)
+			self._insert_lines(self._tail_cursor, new_texts, new_runs)
+		else: #Overwrite -> select the replaced blocks, findBlockByNumber does not walk the document line by line
+			document = self.ui.consoleTextEdit.document()
+			start_block_nr = from_line - loaded_start #Relative to the left-most line
+			cur_cursor = QtGui.QTextCursor(document.findBlockByNumber(start_block_nr))
+			end_block = document.findBlockByNumber(start_block_nr + len(new_line_list))
+			if end_block.isValid():
+				cur_cursor.setPosition(end_block.position(), QtGui.QTextCursor.MoveMode.KeepAnchor)
+			else:
+				cur_cursor.movePosition(QtGui.QTextCursor.MoveOperation.End, QtGui.QTextCursor.MoveMode.KeepAnchor)
+			self._insert_lines(cur_cursor, new_texts, new_runs)
 
-		#Set to overwrite mode
-		cur_cursor.insertText("".join([i + "\n" for i in new_line_list]))
+		#If we're exceeding the block-limit, the document trims the first lines, shift the loaded lines accordingly
+		loaded_end = max(loaded_end, from_line + len(new_line_list))
+		shift = max(0, loaded_end - loaded_start - self._display_max_blocks)
+		self.currently_loaded_lines = [loaded_start + shift, loaded_end]
 
-		#Move scrollbar <shift> lines up if not at the bottom 
+		#Move scrollbar <shift> lines up if not at the bottom
 		if at_end_scrollbar:
 			self.ui.consoleTextEdit.verticalScrollBar().setValue(self.ui.consoleTextEdit.verticalScrollBar().maximum()-1)
 		else:
 			self.ui.consoleTextEdit.verticalScrollBar().setValue(
 				self.ui.consoleTextEdit.verticalScrollBar().value() - shift)
-
-		# self.currently_loaded_lines = [from_line, from_line + len(new_line_list)]
-		self.currently_loaded_lines = new_loaded_lines
-
+		self._update_text_edit_search_highlights()
 
 
+	def _insert_lines(self,
+			cursor : QtGui.QTextCursor,
+			texts : typing.List[str],
+			runs : typing.List[typing.List[StyledRun] | None]
+		) -> None:
+		"""Insert the passed (processed) lines at the cursor, each line is exactly one block (the document always ends
+		with an empty block). Unstyled lines are inserted together, styled runs using their (cached) char-format.
+		"""
+		if not any(runs):
+			cursor.insertText("".join([text + "\n" for text in texts]), QtGui.QTextCharFormat())
+			return
+		cursor.beginEditBlock() #Single layout-pass for all inserts
+		plain_text : typing.List[str] = []
+		default_format = QtGui.QTextCharFormat()
+		for text, line_runs in zip(texts, runs):
+			if line_runs is None:
+				plain_text.append(text + "\n")
+				continue
+			pos = 0
+			for start, end, style in line_runs:
+				plain_text.append(text[pos:start])
+				cursor.insertText("".join(plain_text), default_format)
+				plain_text = []
+				cursor.insertText(text[start:end], self._line_processor.get_char_format(style))
+				pos = end
+			plain_text.append(text[pos:] + "\n")
+		cursor.insertText("".join(plain_text), default_format)
+		cursor.endEditBlock()
 
 	def dragMoveEvent(self, event) -> bool:
 		"""Block dragmove events from re-selecting deleted items in the treeview.
@@ -228,7 +1212,8 @@ class ConsoleWidget(QtWidgets.QWidget):
 		return super().mouseReleaseEvent(event)
 
 	def delete_file_selector_at_index(self, index : QtCore.QModelIndex):
-		"""Deletes the item-selector at the passed index, the console will no longer be available to the user
+		"""Deletes the item-selector at the passed index, the console will no longer be available to the user. The item
+		is closed (e.g. stopping its process or file-watcher).
 
 		Args:
 			index (QtCore.QModelIndex): The index of the item to delete
@@ -236,7 +1221,10 @@ class ConsoleWidget(QtWidgets.QWidget):
 		original_index = self._files_proxy_model.mapToSource(index)
 		#Check if that index is the currently selected index
 		selected_indexes = self.ui.fileSelectionTableView.selectionModel().selectedIndexes()
+		item = original_index.internalPointer()
 		self._files_proxy_model.sourceModel().removeRow(original_index.row(), original_index.parent()) #TODO: parent?
+		if isinstance(item, BaseConsoleItem):
+			item.close()
 
 		selected_row = selected_indexes[0].row() if len(selected_indexes) > 0 else -1
 		deleted_row = index.row()
@@ -274,19 +1262,17 @@ class ConsoleWidget(QtWidgets.QWidget):
 
 		Args:
 			path (str): The path to the directory
+			only_extensions (list, optional): Only include files with these extensions (e.g. [".txt"]).
+				Defaults to None.
 
 		Returns:
-			list: The list of files in the path in the order of the last modified time
+			dict: The files in the path in the order of the last modified time (newest first)
 		"""
-		filelist = sorted(os.listdir(path), key=lambda x: os.path.getmtime(os.path.join(path, x)), reverse=True)
-
-		for filename in filelist: #Remove files that do not have the required extension
-			if only_extensions is not None:
-				if os.path.splitext(filename)[1] not in only_extensions:
-					filelist.remove(filename)
+		stats = scan_directory(path, only_extensions) #Single scandir-pass, instead of a stat-call per sort-comparison
+		filelist = sorted(stats, key=lambda file_path: stats[file_path].st_mtime, reverse=True)
 
 		return { #Return a dictionary of the form: filename_without_extension : full_path
-			os.path.splitext(filename)[0] : os.path.join(path, filename) for filename in filelist
+			os.path.splitext(os.path.basename(file_path))[0] : file_path for file_path in filelist
 		}
 
 
@@ -296,6 +1282,16 @@ class ConsoleWidget(QtWidgets.QWidget):
 		Args:
 			model (QtCore.QAbstractTableModel | QtCore.QAbstractItemModel): The new QAbastractTableModel
 		"""
+		if self._source_model is not None:
+			self._source_model.rowsAboutToBeRemoved.disconnect(self._on_model_rows_about_to_be_removed)
+			self._source_model.modelReset.disconnect(self.clear_hidden_panes)
+			self._source_model.modelReset.disconnect(self.clear_split_panes)
+		self.clear_hidden_panes()
+		self.clear_split_panes()
+		self._source_model = model
+		model.rowsAboutToBeRemoved.connect(self._on_model_rows_about_to_be_removed)
+		model.modelReset.connect(self.clear_hidden_panes)
+		model.modelReset.connect(self.clear_split_panes)
 		self._files_proxy_model.setSourceModel(model)
 		self.ui.fileSelectionTableView.hideColumn(1)
 		self.ui.fileSelectionTableView.hideColumn(2)
@@ -327,6 +1323,10 @@ class ConsoleWidget(QtWidgets.QWidget):
 		self.ui.splitter.setStretchFactor(1, 100-percentage)
 
 	ConsoleWidthPercentage = QtCore.Property(int, get_console_width_percentage, set_console_width_percentage)
+	VirtualizedView = QtCore.Property(bool, get_use_virtualized_view, set_use_virtualized_view)
+	FilterBarVisible = QtCore.Property(bool, get_filter_bar_visible, set_filter_bar_visible)
+	MaxHiddenPanes = QtCore.Property(int, get_max_hidden_panes, set_max_hidden_panes)
+	MetricsOverlayVisible = QtCore.Property(bool, get_metrics_overlay_visible, set_metrics_overlay_visible)
 
 
 
@@ -347,7 +1347,7 @@ def run_example_app():
 
 	app = QtWidgets.QApplication([])
 	test_console_model = ConsoleModel()
-	console_widget = ConsoleWidget(ui_text_min_update_interval=0.1, display_max_blocks=5000)
+	console_widget = ConsoleWidget(ui_text_min_update_interval=0.1, display_max_blocks=5000, use_virtualized_view=True)
 	console_widget.set_model(test_console_model)
 
 
@@ -400,7 +1400,7 @@ def run_example_app():
 				newmsg.append("kaas\n")
 			newmsg.append("Lastrow")
 			test_console_item._line_list.extend(newmsg) #pylint: disable=protected-access
-			test_console_item.loadedLinesChanged.emit(newmsg, len(test_console_item._line_list))
+			test_console_item.loadedLinesChanged.emit(newmsg, len(test_console_item._line_list) - len(newmsg))
 			cur += 1
 			time.sleep(0.01)
 		print("DONE!")
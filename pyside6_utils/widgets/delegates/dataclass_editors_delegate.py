@@ -12,7 +12,7 @@ from pyside6_utils.classes.constraints import (ConstrainedList, Interval,
                                                Options, StrOptions,
                                                _Constraint, _InstancesOf,
                                                _NoneConstraint, _Booleans, _VerboseHelper,
-                                               make_constraint)
+                                               make_constraint, make_constraints)
 from pyside6_utils.widgets.widget_list import WidgetList
 from pyside6_utils.widgets.widget_switcher import WidgetSwitcher
 
@@ -281,10 +281,12 @@ class DataclassEditorsDelegate(QtWidgets.QStyledItemDelegate):
 			metadata = field.metadata
 			entry_type = field.type
 			constraints = metadata.get("constraints", None)
+		else: #E.g. items of a list/dict -> use the type of the current value
+			entry_type = index.data(QtCore.Qt.ItemDataRole.UserRole)
 		self._parent = parent
 
 		if constraints:
-			constraints = [make_constraint(constraint) for constraint in constraints]
+			constraints = make_constraints(constraints)
 		elif constraints is None and entry_type is not None: #If no constraints, set constraints to current type
 			#Get used types from field.type (e.g. typing.Literal, typing.Union, typing.List, typing.Dict, typing.Tuple,
 			# typing.Callable, typing.Optional, typing.Any, typing.ClassVar, typing.Final, typing.TypeVar,
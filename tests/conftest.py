@@ -0,0 +1,29 @@
+"""Shared fixtures, all tests run using the offscreen Qt platform so no display is needed"""
+import os
+import time
+import typing
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest #pylint: disable=wrong-import-position
+from PySide6 import QtWidgets #pylint: disable=wrong-import-position
+
+
+@pytest.fixture(scope="session")
+def qapp() -> QtWidgets.QApplication:
+	"""The (single) QApplication, widgets and most items require one"""
+	app = QtWidgets.QApplication.instance()
+	if app is None:
+		app = QtWidgets.QApplication([])
+	return app #type: ignore
+
+
+def wait_until(app : QtWidgets.QApplication, condition : typing.Callable[[], bool], timeout : float = 5.0) -> bool:
+	"""Process events until condition() returns True, returns False if the timeout (in seconds) was reached first"""
+	deadline = time.monotonic() + timeout
+	while not condition():
+		if time.monotonic() > deadline:
+			return False
+		app.processEvents()
+		time.sleep(0.001)
+	return True
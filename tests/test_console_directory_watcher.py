@@ -0,0 +1,38 @@
+"""Tests for ConsoleDirectoryWatcher and scan_directory"""
+import os
+
+from pyside6_utils.models.console_widget_models.console_directory_watcher import (
+    ConsoleDirectoryWatcher, scan_directory)
+from pyside6_utils.models.console_widget_models.console_model import \
+    ConsoleModel
+
+
+def _touch(path, text=""):
+	with open(path, "w", encoding="utf-8") as out_file:
+		out_file.write(text)
+
+
+def test_extensions_are_case_insensitive(tmp_path):
+	for name in ("a.log", "b.LOG", "c.Txt", "d.csv", "e"):
+		_touch(tmp_path / name)
+	found = {os.path.basename(path) for path in scan_directory(str(tmp_path), [".log", ".TXT"])}
+	assert found == {"a.log", "b.LOG", "c.Txt"}
+	assert len(scan_directory(str(tmp_path))) == 5
+
+
+def test_watcher_adds_and_removes_items(qapp, tmp_path):
+	_touch(tmp_path / "first.LOG", "line 1\n")
+	model = ConsoleModel()
+	watcher = ConsoleDirectoryWatcher(model, str(tmp_path), only_extensions=[".log"], polling_interval=60)
+	try:
+		assert model.rowCount() == 1
+		item = watcher.get_items()[str(tmp_path / "first.LOG")]
+		assert item.get_current_line_list() == (["line 1\n"], 0) #Loaded lazily, once requested
+
+		_touch(tmp_path / "second.log")
+		os.remove(tmp_path / "first.LOG")
+		watcher.scan()
+		assert list(watcher.get_items()) == [str(tmp_path / "second.log")]
+		assert model.rowCount() == 1
+	finally:
+		watcher.stop()
@@ -0,0 +1,87 @@
+"""Tests for export_console_item"""
+import gzip
+
+import pytest
+import shiboken6
+from conftest import wait_until
+
+from pyside6_utils.models.console_widget_models.console_exporter import \
+    export_console_item
+from pyside6_utils.models.console_widget_models.console_from_file_item import \
+    ConsoleFromFileItem
+from pyside6_utils.models.console_widget_models.console_from_stream_item import \
+    ConsoleFromStreamItem
+
+LINES = [f"line {nr} " + "x" * (nr % 50) + "\n" for nr in range(5000)]
+
+
+@pytest.fixture
+def stream_item(qapp):
+	item = ConsoleFromStreamItem("stream", emit_interval=10)
+	item.write("".join(LINES))
+	item.flush_pending()
+	yield item
+	item.close()
+
+
+@pytest.mark.parametrize("file_name, opener", [("out.log", open), ("out.log.gz", gzip.open)])
+def test_export_stream_item(qapp, tmp_path, stream_item, file_name, opener): #pylint: disable=redefined-outer-name
+	results = []
+	task = export_console_item(stream_item, str(tmp_path / file_name), start=False)
+	task.exportFinished.connect(results.append)
+	task.exportFailed.connect(results.append)
+	task.start()
+	assert task.wait(10_000) #Does not require the event loop to run
+	assert task.is_finished()
+	with opener(tmp_path / file_name, "rt", encoding="utf-8") as in_file:
+		assert in_file.read() == "".join(LINES)
+	assert wait_until(qapp, lambda: len(results) == 1)
+	assert results == [str(tmp_path / file_name)]
+
+
+def test_export_file_item_copies_loaded_range(qapp, tmp_path):
+	source = tmp_path / "source.log"
+	source.write_text("".join(LINES), encoding="utf-8")
+	item = ConsoleFromFileItem("file", str(source), watch_file=False)
+	with open(source, "a", encoding="utf-8") as out_file: #Not read by the item yet -> not exported
+		out_file.write("late line\n")
+	task = export_console_item(item, str(tmp_path / "copy.log"))
+	assert task.wait()
+	assert (tmp_path / "copy.log").read_text(encoding="utf-8") == "".join(LINES)
+
+
+def test_failed_export_removes_target(qapp, tmp_path, stream_item): #pylint: disable=redefined-outer-name
+	errors = []
+	task = export_console_item(stream_item, str(tmp_path / "missing_dir" / "out.log"), start=False)
+	task.exportFailed.connect(errors.append)
+	task.start()
+	assert task.wait(10_000)
+	assert wait_until(qapp, lambda: len(errors) == 1)
+	assert not (tmp_path / "missing_dir" / "out.log").exists()
+
+
+def test_unknown_compression(qapp, tmp_path, stream_item): #pylint: disable=redefined-outer-name
+	with pytest.raises(ValueError):
+		export_console_item(stream_item, str(tmp_path / "out.log"), compression="lzma")
+
+
+def test_finished_thread_is_deleted(qapp, tmp_path, stream_item): #pylint: disable=redefined-outer-name
+	task = export_console_item(stream_item, str(tmp_path / "out.log"))
+	thread = task._worker_thread #pylint: disable=protected-access
+	assert task.wait(10_000)
+	assert wait_until(qapp, lambda: not shiboken6.isValid(thread))
+	assert task.is_finished() and task.wait()
+
+
+def test_destroying_the_item_cancels_the_export(qapp, tmp_path):
+	item = ConsoleFromStreamItem("stream", emit_interval=10)
+	item.write("".join(LINES * 20))
+	item.flush_pending()
+	item.close()
+	task = export_console_item(item, str(tmp_path / "out.log.gz")) #Parent is the item
+	results = []
+	task.exportFinished.connect(results.append)
+	task.exportFailed.connect(results.append)
+	shiboken6.delete(item) #Deletes the task as well -> should wait for the thread instead of aborting
+	assert not shiboken6.isValid(task)
+	qapp.processEvents()
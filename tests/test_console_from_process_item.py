@@ -0,0 +1,57 @@
+"""Tests for ConsoleFromProcessItem"""
+import sys
+
+from conftest import wait_until
+from PySide6 import QtCore
+
+from pyside6_utils.models.console_widget_models.console_from_process_item import \
+    ConsoleFromProcessItem
+
+
+def test_output_and_exit_code(qapp):
+	item = ConsoleFromProcessItem("job", sys.executable,
+		["-c", "import sys; print('out 1'); sys.stdout.flush(); print('err 1', file=sys.stderr); sys.exit(3)"],
+		timestamps=False, emit_interval=0.01)
+	emitted = []
+	item.loadedLinesChanged.connect(lambda lines, from_line: emitted.append((list(lines), from_line)))
+	assert wait_until(qapp, lambda: not item.is_running() and item.get_metrics()["lines_read"] >= 3)
+	item.flush_pending()
+
+	lines, first_line = item.get_current_line_list()
+	assert first_line == 0
+	assert sorted(lines[:2]) == ["err 1\n", "out 1\n"]
+	assert lines[2] == "Process finished (exit code 3)\n"
+	assert item.get_status_text() == "exit code 3"
+	assert "exit code 3" in item.data(QtCore.Qt.ItemDataRole.DisplayRole, 0)
+	assert [line for batch, _ in emitted for line in batch] == lines #Line-indexes of the batches follow each other
+	assert all(from_line == sum(len(batch) for batch, _ in emitted[:nr]) for nr, (_, from_line) in enumerate(emitted))
+	item.close()
+
+
+def test_timestamps_and_max_lines(qapp):
+	item = ConsoleFromProcessItem("job", sys.executable, ["-c", "for i in range(10): print(f'line {i}')"],
+		max_lines=4, emit_interval=0.01)
+	assert wait_until(qapp, lambda: not item.is_running())
+	item.flush_pending()
+	lines, first_line = item.get_current_line_list()
+	assert first_line == 7 #11 lines (including the finished-line), of which the last 4 are kept
+	assert len(lines) == 4
+	assert lines[0].startswith("[") and lines[0].endswith("] line 7\n")
+	assert item.get_metrics()["dropped_lines"] == 7
+	item.close()
+
+
+def test_failed_to_start(qapp):
+	item = ConsoleFromProcessItem("job", "this-program-does-not-exist-12345", emit_interval=0.01)
+	assert wait_until(qapp, lambda: item.get_status_text() == "failed to start")
+	item.flush_pending()
+	lines, _ = item.get_current_line_list()
+	assert any("Failed to start" in line for line in lines)
+	item.close()
+
+
+def test_close_stops_running_process(qapp):
+	item = ConsoleFromProcessItem("job", sys.executable, ["-c", "import time; time.sleep(60)"], emit_interval=0.01)
+	assert wait_until(qapp, lambda: item.get_process().state() == QtCore.QProcess.ProcessState.Running)
+	item.close(timeout=5)
+	assert not item.is_running()
@@ -0,0 +1,114 @@
+"""Tests for ConsoleFromSharedMemoryItem and SharedMemoryConsoleSink"""
+import gc
+import multiprocessing
+import pickle
+from multiprocessing import shared_memory
+
+import pytest
+from PySide6 import QtCore
+
+from pyside6_utils.models.console_widget_models.console_from_shared_memory_item import \
+    ConsoleFromSharedMemoryItem
+
+
+def _write_lines(sink, count):
+	for nr in range(count):
+		sink.write(f"child {nr}\n")
+	sink.close()
+
+
+@pytest.fixture
+def item(qapp): #pylint: disable=redefined-outer-name
+	shm_item = ConsoleFromSharedMemoryItem("shm", slot_count=4, slot_size=1024, emit_interval=10)
+	yield shm_item
+	shm_item.close()
+
+
+def test_complete_lines_with_labels(item): #pylint: disable=redefined-outer-name
+	emitted = []
+	item.loadedLinesChanged.connect(lambda lines, from_line: emitted.append((list(lines), from_line)))
+	sink_a = item.create_sink("a")
+	sink_b = item.create_sink("b")
+	sink_a.write("hello ")
+	sink_b.write("first b\nsecond")
+	item.flush_pending()
+	assert emitted == [(["[b] first b\n"], 0)] #Incomplete lines are not shown yet
+	sink_a.write("world\n")
+	item.flush_pending()
+	assert emitted[-1] == (["[a] hello world\n"], 1)
+
+	item.release_sink(sink_b) #Remaining text is shown, slot is freed
+	item.flush_pending()
+	assert item.get_current_line_list() == (["[b] first b\n", "[a] hello world\n", "[b] second\n"], 0)
+	sink_a.close()
+	sink_b.close()
+
+
+def test_slots_are_reused_and_limited(item): #pylint: disable=redefined-outer-name
+	sinks = [item.create_sink() for _ in range(4)]
+	with pytest.raises(RuntimeError):
+		item.create_sink()
+	item.release_sink(sinks[0])
+	item.flush_pending()
+	item.create_sink() #Released slot can be used again
+	for sink in sinks:
+		sink.close()
+
+
+def test_full_buffer_drops_text(item): #pylint: disable=redefined-outer-name
+	sink = item.create_sink("x", write_timeout=0.01)
+	sink.write("a" * 2000 + "\n") #Does not fit in the 1024-byte ring-buffer, nobody reads in the meantime
+	item.flush_pending()
+	lines, _ = item.get_current_line_list()
+	assert any("bytes dropped" in line for line in lines)
+	assert item.get_metrics()["dropped_bytes"] > 0
+	sink.close()
+
+
+def test_max_lines_numbering(qapp):
+	shm_item = ConsoleFromSharedMemoryItem("shm", slot_count=1, slot_size=4096, max_lines=3, prefix_labels=False,
+		emit_interval=10)
+	try:
+		emitted = []
+		shm_item.loadedLinesChanged.connect(lambda lines, from_line: emitted.append((list(lines), from_line)))
+		sink = shm_item.create_sink()
+		sink.write("".join(f"{nr}\n" for nr in range(5)))
+		shm_item.flush_pending()
+		assert emitted == [(["2\n", "3\n", "4\n"], 2)]
+		sink.write("5\n")
+		shm_item.flush_pending()
+		assert emitted[-1] == (["5\n"], 5)
+		assert shm_item.get_current_line_list() == (["3\n", "4\n", "5\n"], 3)
+		sink.close()
+	finally:
+		shm_item.close()
+
+
+def test_sink_in_other_process(item): #pylint: disable=redefined-outer-name
+	sink = pickle.loads(pickle.dumps(item.create_sink("child"))) #Sinks are passed to other processes pickled
+	process = multiprocessing.get_context("spawn").Process(target=_write_lines, args=(sink, 20))
+	process.start()
+	process.join(30)
+	assert process.exitcode == 0
+	item.flush_pending()
+	lines, _ = item.get_current_line_list()
+	assert lines == [f"[child] child {nr}\n" for nr in range(20)]
+
+
+def test_close_is_idempotent(qapp):
+	shm_item = ConsoleFromSharedMemoryItem("shm", slot_count=1, slot_size=64, emit_interval=10)
+	shm_item.close()
+	shm_item.close()
+	shm_item.flush_pending() #Ignored once closed
+	assert shm_item.data(QtCore.Qt.ItemDataRole.DisplayRole, 2).startswith("Shared memory")
+	with pytest.raises(FileNotFoundError):
+		shared_memory.SharedMemory(shm_item.get_shared_memory_name())
+
+
+def test_shared_memory_is_removed_without_close(qapp):
+	shm_item = ConsoleFromSharedMemoryItem("shm", slot_count=1, slot_size=64, emit_interval=10)
+	name = shm_item.get_shared_memory_name()
+	del shm_item
+	gc.collect()
+	with pytest.raises(FileNotFoundError):
+		shared_memory.SharedMemory(name)
@@ -0,0 +1,81 @@
+"""Tests for ConsoleFromStreamItem and ConsoleStreamHandler"""
+import logging
+import threading
+
+from pyside6_utils.models.console_widget_models.console_from_stream_item import (
+    ConsoleFromStreamItem, ConsoleStreamHandler)
+
+
+def _collect(item : ConsoleFromStreamItem):
+	emitted = []
+	item.loadedLinesChanged.connect(lambda lines, from_line: emitted.append((list(lines), from_line)))
+	return emitted
+
+
+def test_lines_are_batched_and_incomplete_lines_extended(qapp):
+	item = ConsoleFromStreamItem("stream", emit_interval=10) #Flushed manually
+	emitted = _collect(item)
+	item.write("first\nsec")
+	item.write("ond\nthi")
+	assert emitted == [] #Nothing is emitted until flushed
+	item.flush_pending()
+	assert emitted == [(["first\n", "second\n", "thi"], 0)]
+	item.write("rd\n")
+	item.flush_pending()
+	assert emitted[-1] == (["third\n"], 2) #Replaces the incomplete last line
+	assert item.get_current_line_list() == (["first\n", "second\n", "third\n"], 0)
+	item.flush_pending() #Nothing new -> no emission
+	assert len(emitted) == 2
+	item.close()
+
+
+def test_max_lines_drops_old_lines(qapp):
+	item = ConsoleFromStreamItem("stream", max_lines=3, emit_interval=10)
+	emitted = _collect(item)
+	item.write("".join(f"line {nr}\n" for nr in range(5)))
+	item.flush_pending()
+	assert emitted == [([f"line {nr}\n" for nr in range(2, 5)], 2)] #Only the kept lines, with their real line-index
+	assert item.get_current_line_list() == ([f"line {nr}\n" for nr in range(2, 5)], 2)
+
+	item.write("line 5\nline 6\n")
+	item.flush_pending()
+	assert emitted[-1] == (["line 5\n", "line 6\n"], 5)
+	assert item.get_current_line_list() == (["line 4\n", "line 5\n", "line 6\n"], 4)
+	metrics = item.get_metrics()
+	assert metrics["lines_read"] == 7
+	assert metrics["dropped_lines"] == 4
+	item.close()
+
+
+def test_carriage_returns_are_compacted(qapp):
+	item = ConsoleFromStreamItem("stream", emit_interval=10)
+	item.write("progress 10%")
+	item.flush_pending()
+	item.write("\rprogress 100%\n")
+	item.flush_pending()
+	lines, _ = item.get_current_line_list()
+	assert len(lines) == 1 and lines[0].endswith("progress 100%\n")
+	item.close()
+
+
+def test_write_from_threads_and_logging_handler(qapp):
+	item = ConsoleFromStreamItem("stream", emit_interval=10)
+	logger = logging.getLogger("test_console_stream_item")
+	logger.propagate = False
+	logger.setLevel(logging.INFO)
+	handler = ConsoleStreamHandler(item)
+	logger.addHandler(handler)
+	try:
+		threads = [threading.Thread(target=lambda nr=nr: [logger.info(f"{nr}-{i}") for i in range(100)])
+			for nr in range(4)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+	finally:
+		logger.removeHandler(handler)
+	item.flush_pending()
+	lines, first_line = item.get_current_line_list()
+	assert first_line == 0
+	assert sorted(lines) == sorted(f"{nr}-{i}\n" for nr in range(4) for i in range(100))
+	item.close()
@@ -0,0 +1,99 @@
+"""Tests for ConsoleLineFilter"""
+from pyside6_utils.models.console_widget_models.console_line_filter import \
+    ConsoleLineFilter
+
+LINES = [
+	"starting up",
+	"12:00 INFO loading",
+	"12:01 WARNING disk almost full",
+	"12:02 ERROR failed to open file",
+	"Traceback (most recent call last):",
+	"  File 'x.py', line 1",
+	"12:03 DEBUG retrying",
+	"12:04 INFO done",
+]
+
+
+def _visible(line_filter : ConsoleLineFilter):
+	return line_filter.visible_lines().tolist()
+
+
+def test_levels_and_inheritance():
+	line_filter = ConsoleLineFilter()
+	line_filter.replace_lines(LINES, 0)
+	assert not line_filter.is_active()
+	assert _visible(line_filter) == list(range(8))
+
+	line_filter.set_enabled_levels(["error"])
+	assert line_filter.is_active()
+	assert _visible(line_filter) == [0, 3, 4, 5] #Traceback inherits ERROR, line 0 has no level
+
+	line_filter.set_enabled_levels(["WARN", "DEBUG"]) #Aliases are mapped to the level
+	assert _visible(line_filter) == [0, 2, 6]
+
+
+def test_levels_are_whole_words():
+	line_filter = ConsoleLineFilter()
+	line_filter.replace_lines([
+		"INFORMATION about ERRORS, WARNING follows",
+		"DEBUGGER attached, INFO",
+		"WARNINGS only",
+	], 0)
+	line_filter.set_enabled_levels(["WARNING"])
+	assert _visible(line_filter) == [0]
+	line_filter.set_enabled_levels(["INFO"])
+	assert _visible(line_filter) == [1, 2] #Line 2 has no level -> inherits INFO of line 1
+	line_filter.set_enabled_levels(["ERROR", "DEBUG"])
+	assert _visible(line_filter) == []
+
+
+def test_include_exclude_patterns():
+	line_filter = ConsoleLineFilter()
+	line_filter.replace_lines(LINES, 0)
+	line_filter.set_include_pattern(r"^12:0[0-2]", LINES)
+	assert _visible(line_filter) == [1, 2, 3]
+	line_filter.set_exclude_pattern("disk", LINES, use_regex=False)
+	assert _visible(line_filter) == [1, 3]
+	line_filter.set_include_pattern("", LINES)
+	line_filter.set_exclude_pattern("", LINES)
+	assert not line_filter.is_active()
+
+
+def test_incremental_replace_and_trim():
+	line_filter = ConsoleLineFilter()
+	line_filter.replace_lines(LINES[:3], 0)
+	line_filter.set_exclude_pattern("full", LINES[:3])
+	line_filter.replace_lines(["12:01 WARNING disk is full again", *LINES[3:]], 2) #Replace the last line, append
+	assert line_filter.line_count() == 8
+	line_filter.set_enabled_levels(["WARNING", "ERROR"])
+	assert _visible(line_filter) == [0, 3, 4, 5]
+
+	line_filter.trim(3) #Lines are renumbered
+	assert line_filter.line_count() == 5
+	assert _visible(line_filter) == [0, 1, 2]
+	line_filter.clear_lines()
+	assert line_filter.line_count() == 0
+	assert _visible(line_filter) == []
+
+
+def test_overwrite_updates_inherited_levels():
+	line_filter = ConsoleLineFilter()
+	line_filter.replace_lines(LINES, 0)
+	line_filter.replace_lines(["12:02 INFO opened file"], 3) #The traceback lines now inherit INFO
+	line_filter.set_enabled_levels(["ERROR"])
+	assert _visible(line_filter) == [0]
+	line_filter.set_enabled_levels(["INFO"])
+	assert _visible(line_filter) == [0, 1, 3, 4, 5, 7]
+
+	line_filter.replace_lines(["no level anymore"], 1) #Line 2 has its own level, so nothing is propagated past it
+	assert _visible(line_filter) == [0, 1, 3, 4, 5, 7]
+	line_filter.replace_lines(["no level anymore"], 3) #Lines 3-5 inherit WARNING from line 2
+	line_filter.set_enabled_levels(["WARNING"])
+	assert _visible(line_filter) == [0, 1, 2, 3, 4, 5]
+
+
+def test_lines_with_trailing_newlines():
+	line_filter = ConsoleLineFilter()
+	line_filter.replace_lines([line + "\n" for line in LINES], 0)
+	line_filter.set_enabled_levels(["ERROR"])
+	assert _visible(line_filter) == [0, 3, 4, 5]
@@ -0,0 +1,48 @@
+"""Tests for ConsoleLineProcessor"""
+from pyside6_utils.models.console_widget_models.console_line_processor import (
+    ANSI_COLORS, DEFAULT_STYLE, ConsoleLineProcessor)
+
+
+def test_plain_lines_are_not_parsed():
+	processor = ConsoleLineProcessor()
+	assert processor.process_line("plain text\n") == ("plain text", None)
+	assert processor.to_plain_lines(["a\n", "b"]) == ["a", "b"]
+
+
+def test_colors_and_styles():
+	processor = ConsoleLineProcessor()
+	text, runs = processor.process_line("\x1b[31mred\x1b[0m plain \x1b[1;38;5;46mbold green\x1b[22m green\x1b[m")
+	assert text == "red plain bold green green"
+	assert [(start, end) for start, end, _ in runs] == [(0, 3), (10, 20), (20, 26)]
+	assert runs[0][2].foreground == ANSI_COLORS[1]
+	assert runs[1][2].foreground == (0, 255, 0) and runs[1][2].bold
+	assert runs[2][2].foreground == (0, 255, 0) and not runs[2][2].bold
+
+	_, runs = processor.process_line("\x1b[31mred \x1b[31mstill red\x1b[0m")
+	assert runs == [(0, 13, runs[0][2])] #Runs with the same style are merged
+	assert processor.process_line("\x1b[0mno style")[1] is None
+	assert processor.process_line("\x1b]0;window title\x07text") == ("text", None) #OSC-sequences are removed
+
+
+def test_carriage_returns_and_cursor_moves():
+	processor = ConsoleLineProcessor()
+	assert processor.process_line("progress 10%\rprogress 100%\n") == ("progress 100%", None)
+	assert processor.process_line("abcdef\rxy") == ("xycdef", None)
+	assert processor.process_line("abc\x08\x08X") == ("aXc", None)
+	assert processor.process_line("abcdef\r\x1b[Kxy") == ("xy", None) #Erase to end of line
+	assert processor.process_line("abc\x1b[5Gx") == ("abc x", None) #Cursor to column 5
+
+	text, runs = processor.process_line("waiting\r\x1b[32mdone\x1b[0m")
+	assert text == "doneing"
+	assert [(start, end) for start, end, _ in runs] == [(0, 4)]
+	assert all(style is not DEFAULT_STYLE for _, _, style in runs)
+
+
+def test_results_are_cached():
+	processor = ConsoleLineProcessor(max_cache_size=2)
+	first = processor.process_line("\x1b[31mred")
+	assert processor.process_line("\x1b[31mred") is first
+	processor.process_line("\x1b[32mgreen")
+	processor.process_line("\x1b[33myellow") #Removes the least recently used line
+	assert processor.process_line("\x1b[31mred") is not first
+	assert processor.process_line("\x1b[31mred") == first
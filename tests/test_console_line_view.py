@@ -0,0 +1,52 @@
+"""Tests for ConsoleLineView"""
+from pyside6_utils.widgets.console_line_view import ConsoleLineView
+
+
+def test_append_overwrite_and_trim(qapp):
+	view = ConsoleLineView(max_lines=5)
+	view.process_line_change(["line 0\n", "line 1\n", "line 2"], 0)
+	assert view.line_count() == 3
+	assert view.to_plain_text() == "line 0\nline 1\nline 2" #Trailing newlines are stripped
+
+	view.process_line_change(["line 2 (done)", "line 3", "line 4", "line 5", "line 6"], 2) #Overwrite + append
+	assert view.line_count() == 5
+	assert view.first_line_index() == 2 #Lines 0 and 1 are trimmed
+	assert view.to_plain_text().splitlines() == ["line 2 (done)", "line 3", "line 4", "line 5", "line 6"]
+
+	view.process_line_change(["old 1", "new 2"], 1) #Line 1 was trimmed already -> only line 2 is replaced
+	assert view.to_plain_text().splitlines()[:2] == ["new 2", "line 3"]
+
+	view.process_line_change(["line 20"], 20) #Gap in line-indexes -> appended at the end
+	assert view.to_plain_text().splitlines()[-1] == "line 20"
+	assert view.first_line_index() == 16 #The lines are renumbered so they end at the passed line
+
+	view.set_max_lines(2)
+	assert view.to_plain_text().splitlines() == ["line 6", "line 20"]
+	view.clear()
+	assert view.line_count() == 0 and view.to_plain_text() == ""
+
+
+def test_large_batches_only_keep_the_last_lines(qapp):
+	view = ConsoleLineView(max_lines=10)
+	view.process_line_change([f"line {nr}" for nr in range(10000)], 0)
+	assert view.line_count() == 10
+	assert view.first_line_index() == 9990
+	for nr in range(10010, 12000): #Trimming is done lazily, the retained lines stay correct
+		view.process_line_change([f"line {nr}"], nr)
+	assert view.to_plain_text().splitlines() == [f"line {nr}" for nr in range(11990, 12000)]
+
+
+def test_select_all_and_scroll_to_bottom(qapp):
+	view = ConsoleLineView(max_lines=1000)
+	view.resize(300, 200)
+	view.show()
+	view.process_line_change([f"line {nr}" for nr in range(500)], 0)
+	assert view.is_at_bottom() #Follows the output while at the bottom
+	view.verticalScrollBar().setValue(0)
+	view.process_line_change(["line 500"], 500)
+	assert view.verticalScrollBar().value() == 0 #Stays scrolled up
+
+	assert view.selected_text() == ""
+	view.select_all()
+	assert view.selected_text() == view.to_plain_text()
+	view.close()
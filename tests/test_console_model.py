@@ -0,0 +1,72 @@
+"""Tests for ConsoleModel"""
+import pytest
+from conftest import wait_until
+from PySide6 import QtCore
+
+from pyside6_utils.models.console_widget_models.console_from_stream_item import \
+    ConsoleFromStreamItem
+from pyside6_utils.models.console_widget_models.console_model import \
+    ConsoleModel
+
+
+def _names(model : ConsoleModel):
+	return [model.index(row, 0).internalPointer().data(QtCore.Qt.ItemDataRole.DisplayRole, 0)
+		for row in range(model.rowCount())]
+
+
+@pytest.mark.parametrize("kwargs", [{"activity_resolution" : 0}, {"activity_resolution" : -1},
+	{"recent_activity_duration" : -1}])
+def test_invalid_activity_arguments(qapp, kwargs):
+	with pytest.raises(ValueError):
+		ConsoleModel(**kwargs)
+
+
+def test_add_and_remove_items_keeps_rows(qapp):
+	model = ConsoleModel()
+	items = [ConsoleFromStreamItem(f"item {nr}", emit_interval=10) for nr in range(6)]
+	model.add_items(items)
+	model.add_item(items[0]) #Already in the model -> skipped
+	assert model.rowCount() == 6
+	assert model.remove_items([items[1], items[2], items[4]]) == 3
+	assert _names(model) == ["item 0", "item 3", "item 5"]
+	assert [model.get_row(item) for item in items] == [0, -1, -1, 1, -1, 2]
+	assert model.remove_item(items[0])
+	assert not model.remove_item(items[0])
+	assert model.get_row(items[5]) == 1
+	for item in items:
+		item.close()
+
+
+def test_data_changed_uses_the_row_of_the_item(qapp):
+	model = ConsoleModel(recent_activity_duration=0) #No activity-timer
+	items = [ConsoleFromStreamItem(f"item {nr}", emit_interval=10) for nr in range(4)]
+	model.add_items(items[:3])
+	changed_rows = []
+	model.dataChanged.connect(lambda top_left, bottom_right, *_: changed_rows.append((top_left.row(),
+		bottom_right.row(), top_left.internalPointer())))
+	resets = []
+	model.modelReset.connect(lambda: resets.append(True))
+
+	model.remove_item(items[0]) #Rows of the other items shift
+	model.add_item(items[3])
+	assert not resets #Removing rows does not reset the model
+	for item in items:
+		item.dataChanged.emit()
+	assert changed_rows == [(0, 0, items[1]), (1, 1, items[2]), (2, 2, items[3])] #Removed item is ignored
+	for item in items:
+		item.close()
+
+
+def test_recent_activity_expires(qapp):
+	model = ConsoleModel(recent_activity_duration=0.05, activity_resolution=0.01)
+	item = ConsoleFromStreamItem("item", emit_interval=10)
+	model.add_item(item)
+	index = model.index(0, 0)
+	assert not model.is_recently_active(item)
+	item.write("text\n")
+	item.flush_pending() #Emits dataChanged
+	assert model.is_recently_active(item)
+	assert wait_until(qapp, lambda: not model.is_recently_active(item), timeout=2)
+	assert not model.data(index, QtCore.Qt.ItemDataRole.FontRole) or \
+		not model.data(index, QtCore.Qt.ItemDataRole.FontRole).bold()
+	item.close()
@@ -0,0 +1,82 @@
+"""Tests for ConsoleSearchIndex"""
+from conftest import wait_until
+
+from pyside6_utils.models.console_widget_models.console_search_index import \
+    ConsoleSearchIndex
+
+
+def _all_matches(index : ConsoleSearchIndex):
+	return [index.get_match(nr) for nr in range(index.match_count())]
+
+
+def test_plain_text_matches(qapp):
+	index = ConsoleSearchIndex()
+	index.set_lines(["an error\n", "nothing\n", "Error again, ERROR\n"])
+	index.set_pattern("error")
+	assert _all_matches(index) == [(0, 3, 8), (2, 0, 5), (2, 13, 18)]
+	index.set_pattern("error", case_sensitive=True)
+	assert _all_matches(index) == [(0, 3, 8)]
+
+
+def test_anchors_match_per_line(qapp):
+	index = ConsoleSearchIndex()
+	index.set_lines(["more text\n", "more lines\n", "no more\n"])
+	index.set_pattern("^more", use_regex=True)
+	assert _all_matches(index) == [(0, 0, 4), (1, 0, 4)]
+	index.set_pattern("more$", use_regex=True)
+	assert _all_matches(index) == [(2, 3, 7)]
+
+
+def test_matches_do_not_cross_lines(qapp):
+	index = ConsoleSearchIndex()
+	index.set_lines(["abc", "def", "c d"])
+	index.set_pattern(r"c\sd", use_regex=True)
+	assert _all_matches(index) == [(2, 0, 3)]
+	index.set_pattern(r"\w+\s*", use_regex=True) #Crosses into the next line in the joined text
+	assert _all_matches(index) == [(0, 0, 3), (1, 0, 3), (2, 0, 2), (2, 2, 3)]
+
+
+def test_chunk_boundaries(qapp):
+	index = ConsoleSearchIndex(chunk_size=3)
+	lines = [f"line {nr}" for nr in range(10)]
+	index.set_lines(lines)
+	index.set_pattern(r"^line \d$", use_regex=True)
+	assert index.match_count() == 3 #First chunk is searched right away
+	assert wait_until(qapp, lambda: not index.is_indexing())
+	assert [match[0] for match in _all_matches(index)] == list(range(10))
+
+
+def test_incremental_append_and_replace(qapp):
+	index = ConsoleSearchIndex()
+	index.set_lines(["first hit\n", "partial"])
+	index.set_pattern("hit")
+	assert _all_matches(index) == [(0, 6, 9)]
+
+	index.process_line_change(["partial hit\n", "hit\n"], 1) #Replaces the incomplete last line and appends one
+	assert wait_until(qapp, lambda: not index.is_indexing())
+	assert _all_matches(index) == [(0, 6, 9), (1, 8, 11), (2, 0, 3)]
+
+	index.process_line_change(["no match\n"], 1) #Overwrites the matches from line 1 onwards
+	assert wait_until(qapp, lambda: not index.is_indexing())
+	assert _all_matches(index) == [(0, 6, 9), (2, 0, 3)]
+	assert index.matches_in_range(1, 2) == [(2, 0, 3)]
+	assert index.next_match_nr(1) == 1
+	assert index.previous_match_nr(1) == 0
+
+
+def test_trim_drops_lines_and_matches(qapp):
+	index = ConsoleSearchIndex()
+	index.set_lines([f"hit {nr}" for nr in range(10)])
+	index.set_pattern("hit")
+	assert index.match_count() == 10
+	assert index.trim(4) == 4
+	assert index.get_first_line() == 4
+	assert [match[0] for match in _all_matches(index)] == list(range(4, 10))
+	assert index.trim(2) == 0 #Already trimmed
+
+	index.process_line_change(["hit 10", "hit 11"], 10) #Appending after trimming uses the real line-indexes
+	assert wait_until(qapp, lambda: not index.is_indexing())
+	assert index.trim(11) == 7
+	assert _all_matches(index) == [(11, 0, 3)]
+	assert index.trim(20) == 1 #Beyond the last line -> everything is dropped
+	assert index.match_count() == 0 and not index.is_indexing()
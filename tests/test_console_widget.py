@@ -0,0 +1,308 @@
+"""Tests for ConsoleWidget and its helpers"""
+import typing
+
+from conftest import wait_until
+from PySide6 import QtCore, QtGui
+
+from pyside6_utils.models.console_widget_models.console_from_stream_item import \
+    ConsoleFromStreamItem
+from pyside6_utils.models.console_widget_models.console_model import (
+    BaseConsoleItem, ConsoleModel)
+from pyside6_utils.widgets.console_widget import (ConsoleMetrics,
+                                                  ConsoleWidget,
+                                                  LineChangeBuffer)
+
+
+class _ListItem(BaseConsoleItem):
+	"""Console item of which the lines are written directly by the tests"""
+	def __init__(self, name : str = "item") -> None:
+		super().__init__()
+		self.name = name
+		self.lines : typing.List[str] = []
+
+	def write_lines(self, lines : typing.List[str], from_line : int | None = None) -> None:
+		"""Replace/append the passed lines (appended if from_line is None) and emit the change"""
+		from_line = len(self.lines) if from_line is None else from_line
+		self.lines[from_line : from_line + len(lines)] = lines
+		self.loadedLinesChanged.emit(lines, from_line)
+
+	def get_current_line_list(self) -> typing.Tuple[list[str], int]:
+		return self.lines, 0
+
+	def data(self, role : QtCore.Qt.ItemDataRole, column : int = 0):
+		if role == QtCore.Qt.ItemDataRole.DisplayRole and column == 0:
+			return self.name
+		return None
+
+
+class _TrimmingItem(_ListItem):
+	"""Console item that only keeps its last max_lines lines"""
+	def __init__(self, max_lines : int, name : str = "item") -> None:
+		super().__init__(name)
+		self.max_lines = max_lines
+		self.first_line = 0
+
+	def write_lines(self, lines : typing.List[str], from_line : int | None = None) -> None:
+		from_line = self.first_line + len(self.lines) if from_line is None else from_line
+		offset = from_line - self.first_line
+		self.lines[offset : offset + len(lines)] = lines
+		excess = len(self.lines) - self.max_lines
+		if excess > 0:
+			del self.lines[:excess]
+			self.first_line += excess
+		self.loadedLinesChanged.emit(lines, from_line)
+
+	def get_current_line_list(self) -> typing.Tuple[list[str], int]:
+		return self.lines, self.first_line
+
+
+def _show_item(widget : ConsoleWidget, item : BaseConsoleItem) -> ConsoleModel:
+	"""Add the passed item to a new model of the widget and select it"""
+	model = ConsoleModel(widget)
+	model.add_item(item)
+	widget.set_model(model)
+	widget.ui.fileSelectionTableView.selectRow(0)
+	return model
+
+
+def _select(widget : ConsoleWidget, item : BaseConsoleItem | None) -> None:
+	"""Select the row of the passed item in the item-list of the widget, or clear the selection if None"""
+	table_view = widget.ui.fileSelectionTableView
+	if item is None:
+		table_view.clearSelection()
+		return
+	for row in range(table_view.model().rowCount()):
+		if table_view.model().index(row, 0).data(QtCore.Qt.ItemDataRole.UserRole + 1) is item:
+			table_view.selectRow(row)
+			return
+	raise ValueError("Item is not in the model of the widget")
+
+
+def _spy_process_line_change(widget : ConsoleWidget) -> typing.List[typing.Tuple[typing.List[str], int]]:
+	"""Returns the list to which the (lines, from-line) of each process_line_change call of the widget is appended"""
+	displayed = []
+	process_line_change = widget.process_line_change
+	widget.process_line_change = lambda lines, from_line=0: (displayed.append((list(lines), from_line)),
+		process_line_change(lines, from_line))
+	return displayed
+
+
+def _text_lines(widget : ConsoleWidget) -> typing.List[str]:
+	return widget.ui.consoleTextEdit.toPlainText().splitlines()
+
+
+def test_line_change_buffer_merges_batches():
+	buffer = LineChangeBuffer(max_lines=5)
+	assert buffer.is_empty()
+	assert buffer.add(["a", "b"], 10)
+	assert buffer.add(["b2", "c"], 11) #Overwrite + append
+	assert buffer.add(["d"], 13)
+	assert not buffer.add(["x"], 9) #Before the pending batch
+	assert not buffer.add(["x"], 15) #Gap after the pending batch
+	assert buffer.take() == (["a", "b2", "c", "d"], 10)
+	assert buffer.is_empty()
+
+	buffer.add([str(nr) for nr in range(8)], 0) #Lines that would be trimmed anyway are dropped
+	assert buffer.dropped_lines == 3
+	assert buffer.take() == (["3", "4", "5", "6", "7"], 3)
+	buffer.add(["a"], 0)
+	buffer.clear()
+	assert buffer.is_empty()
+
+
+def test_line_changes_are_coalesced(qapp):
+	widget = ConsoleWidget(ui_text_min_update_interval=60)
+	item = _ListItem()
+	item.lines = ["line 0"]
+	_show_item(widget, item)
+	assert _text_lines(widget) == ["line 0"]
+
+	displayed = _spy_process_line_change(widget)
+	item.write_lines(["line 1"]) #First change after a quiet period is displayed right away
+	item.write_lines(["line 2"])
+	item.write_lines(["line 3"])
+	assert displayed == [(["line 1"], 1)]
+	widget.flush_pending_lines()
+	assert displayed == [(["line 1"], 1), (["line 2", "line 3"], 2)] #Single edit for all gathered changes
+	assert _text_lines(widget) == ["line 0", "line 1", "line 2", "line 3"]
+	widget.close()
+
+
+def test_line_changes_without_update_interval(qapp):
+	widget = ConsoleWidget(ui_text_min_update_interval=0)
+	item = _ListItem()
+	_show_item(widget, item)
+	for nr in range(5):
+		item.write_lines([f"line {nr}"])
+		assert _text_lines(widget) == [f"line {nr}" for nr in range(nr + 1)] #Displayed right away
+	widget.close()
+
+
+def test_overwrite_and_tail_append(qapp):
+	widget = ConsoleWidget(ui_text_min_update_interval=0, display_max_blocks=4)
+	item = _ListItem()
+	item.lines = ["line 0\n", "line 1\n"] #Trailing newlines are stripped, each line is a single block
+	_show_item(widget, item)
+	assert _text_lines(widget) == ["line 0", "line 1"]
+
+	item.write_lines(["line 1 (done)"], 1) #Overwrite of the last line
+	item.write_lines(["line 2", "line 3"]) #Tail-append
+	assert _text_lines(widget) == ["line 0", "line 1 (done)", "line 2", "line 3"]
+	assert widget.ui.consoleTextEdit.document().blockCount() == 5 #Including the trailing empty block
+
+	item.write_lines(["line 2 (done)", "line 3 (done)", "line 4"], 2) #Overwrite + append, trims the first line
+	assert _text_lines(widget) == ["line 1 (done)", "line 2 (done)", "line 3 (done)", "line 4"]
+	assert widget.currently_loaded_lines == [1, 5]
+
+	item.write_lines(["line 0 (done)", "line 1 (again)"], 0) #Line 0 is no longer displayed -> skipped
+	assert _text_lines(widget) == ["line 1 (again)", "line 2 (done)", "line 3 (done)", "line 4"]
+
+	item.write_lines([f"line {nr}" for nr in range(5, 15)]) #More lines than displayed at once
+	assert _text_lines(widget) == ["line 11", "line 12", "line 13", "line 14"]
+	assert widget.currently_loaded_lines == [11, 15]
+	widget.close()
+
+
+def test_search_index_only_keeps_the_lines_of_the_item(qapp):
+	widget = ConsoleWidget(ui_text_min_update_interval=0)
+	item = _TrimmingItem(max_lines=100)
+	_show_item(widget, item)
+	widget.show_search_bar()
+	search_bar = widget._search_bar #pylint: disable=protected-access
+	search_index = widget._search_index #pylint: disable=protected-access
+	search_bar.search_edit.setText("match")
+	for batch in range(50):
+		item.write_lines([f"match {batch * 10 + nr}" for nr in range(10)])
+		assert wait_until(qapp, lambda: not search_index.is_indexing())
+	assert search_index.get_first_line() == 400
+	assert search_index.match_count() == 100
+	assert search_index.get_match(0) == (400, 0, 5)
+	assert search_bar.status_label.text() == "?/100"
+	widget.close()
+
+
+def test_ansi_colors_and_carriage_returns_are_rendered(qapp):
+	widget = ConsoleWidget(ui_text_min_update_interval=0)
+	item = _ListItem()
+	item.lines = ["\x1b[31mred\x1b[0m plain", "progress 10%\rprogress 100%"]
+	_show_item(widget, item)
+	assert _text_lines(widget) == ["red plain", "progress 100%"]
+	cursor = QtGui.QTextCursor(widget.ui.consoleTextEdit.document())
+	cursor.setPosition(1) #Format of the character before the cursor
+	assert cursor.charFormat().foreground().color() == QtGui.QColor(205, 0, 0)
+	cursor.setPosition(5)
+	assert cursor.charFormat().foreground().style() == QtCore.Qt.BrushStyle.NoBrush
+	widget.close()
+
+
+def test_stream_item_with_max_lines(qapp):
+	widget = ConsoleWidget(ui_text_min_update_interval=0, display_max_blocks=50)
+	item = ConsoleFromStreamItem("stream", max_lines=100, emit_interval=10) #Flushed manually
+	_show_item(widget, item)
+	widget.show_search_bar()
+	search_bar = widget._search_bar #pylint: disable=protected-access
+	search_index = widget._search_index #pylint: disable=protected-access
+	search_bar.search_edit.setText("match")
+	for batch in range(50):
+		item.write("".join(f"match {batch * 10 + nr}\n" for nr in range(10)))
+		item.flush_pending()
+		assert wait_until(qapp, lambda: not search_index.is_indexing())
+	assert item.get_first_line() == 400
+	assert search_index.get_first_line() == 400
+	assert search_index.match_count() == 100
+	assert _text_lines(widget) == [f"match {nr}" for nr in range(450, 500)]
+	widget.close()
+	item.close()
+
+
+def test_switching_back_only_renders_new_lines(qapp):
+	widget = ConsoleWidget(ui_text_min_update_interval=0)
+	first, second = _ListItem("first"), _ListItem("second")
+	first.lines, second.lines = ["first 0"], ["second 0"]
+	model = _show_item(widget, first)
+	model.add_item(second)
+	_select(widget, first)
+	document = widget.ui.consoleTextEdit.document()
+
+	_select(widget, second)
+	assert _text_lines(widget) == ["second 0"]
+	first.write_lines(["first 1"]) #Gathered while hidden
+	displayed = _spy_process_line_change(widget)
+	_select(widget, first)
+	assert widget.ui.consoleTextEdit.document() is document #Re-used instead of re-loaded
+	assert displayed == [(["first 1"], 1)]
+	assert _text_lines(widget) == ["first 0", "first 1"]
+
+	widget.set_max_hidden_panes(0)
+	_select(widget, second)
+	_select(widget, first)
+	assert displayed[-1] == (["first 0", "first 1"], 0) #Re-loaded
+	widget.close()
+
+
+def test_split_panes(qapp):
+	widget = ConsoleWidget(ui_text_min_update_interval=0, use_virtualized_view=True)
+	first, second = _ListItem("first"), _ListItem("second")
+	first.lines, second.lines = ["first 0"], ["second 0"]
+	model = _show_item(widget, first)
+	model.add_item(second)
+	_select(widget, first)
+
+	widget.add_split_pane(second)
+	assert widget.get_split_pane_items() == [second]
+	split_view = widget._split_panes[second].line_view #pylint: disable=protected-access
+	assert split_view.to_plain_text() == "second 0"
+	second.write_lines(["second 1"])
+	first.write_lines(["first 1"])
+	assert wait_until(qapp, lambda: split_view.to_plain_text() == "second 0\nsecond 1") #Both are followed live
+	assert widget._line_view.to_plain_text() == "first 0\nfirst 1" #pylint: disable=protected-access
+
+	widget.remove_split_pane(second) #Kept as a hidden pane
+	assert widget.get_split_pane_items() == []
+	second.write_lines(["second 2"])
+	displayed = _spy_process_line_change(widget)
+	_select(widget, second)
+	assert widget._line_view is split_view #pylint: disable=protected-access
+	assert displayed == [(["second 2"], 2)] #Only the lines that arrived in the meantime are rendered
+	assert split_view.to_plain_text() == "second 0\nsecond 1\nsecond 2"
+
+	widget.add_split_pane(first)
+	model.remove_item(first) #Closes the split pane of the removed item
+	assert widget.get_split_pane_items() == []
+	widget.close()
+
+
+def test_metrics(qapp):
+	metrics = ConsoleMetrics(rate_window=10)
+	metrics.add_lines(30)
+	metrics.add_lines(20)
+	metrics.add_flush(0.002, None)
+	metrics.add_flush(0.004, 0.5)
+	assert metrics.lines_per_second() == 5
+	assert metrics.to_dict()["gui_time_mean_ms"] == 3
+	assert metrics.to_dict()["latency_max_ms"] == 500
+
+	widget = ConsoleWidget(ui_text_min_update_interval=60, display_max_blocks=5)
+	item = ConsoleFromStreamItem("stream", emit_interval=10) #Flushed manually
+	_show_item(widget, item)
+	for batch in range(3): #First batch is displayed right away, the others are gathered
+		item.write("".join(f"line {batch * 4 + nr}\n" for nr in range(4)))
+		item.flush_pending()
+	widget.flush_pending_lines()
+	widget_metrics = widget.get_metrics()
+	assert widget_metrics["lines_ingested"] == 12
+	assert widget_metrics["batches_ingested"] == 3
+	assert widget_metrics["flush_count"] == 2
+	assert widget_metrics["dropped_lines"] == 3 #8 gathered lines, only 5 are displayed
+	assert widget_metrics["item"]["lines_read"] == 12
+	assert widget_metrics["latency_last_ms"] >= 0
+
+	emitted = []
+	widget.metricsChanged.connect(emitted.append)
+	widget.set_metrics_interval(0.01)
+	assert wait_until(qapp, lambda: len(emitted) > 0)
+	widget.set_metrics_interval(0)
+	widget.reset_metrics()
+	assert widget.get_metrics()["lines_ingested"] == 0
+	widget.close()
+	item.close()
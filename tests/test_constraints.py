@@ -0,0 +1,38 @@
+"""Tests for the constraint-list cache of classes.constraints"""
+import numbers
+
+import pytest
+
+from pyside6_utils.classes.constraints import (Interval, InvalidParameterError,
+                                               clear_constraints_cache,
+                                               make_constraints,
+                                               validate_parameter_constraints)
+
+
+def test_make_constraints_is_cached_per_list():
+	constraints = [Interval(numbers.Integral, 0, 10, closed="both"), None, "boolean"]
+	compiled = make_constraints(constraints)
+	assert len(compiled) == 3
+	assert make_constraints(constraints) is compiled
+	assert make_constraints(list(constraints)) is not compiled #Keyed by identity, not by value
+
+	constraints.append(str) #Modified in place -> still cached until the cache is cleared
+	assert make_constraints(constraints) is compiled
+	clear_constraints_cache()
+	assert len(make_constraints(constraints)) == 4
+
+
+def test_invalid_constraints_are_not_cached():
+	constraints = ["not a constraint"]
+	with pytest.raises(ValueError):
+		make_constraints(constraints)
+	constraints[0] = "boolean"
+	assert len(make_constraints(constraints)) == 1
+
+
+def test_validate_parameter_constraints_uses_the_cache():
+	parameter_constraints = {"count" : [Interval(numbers.Integral, 1, None, closed="left")]}
+	validate_parameter_constraints(parameter_constraints, {"count" : 3}, "caller")
+	assert make_constraints(parameter_constraints["count"]) is make_constraints(parameter_constraints["count"])
+	with pytest.raises(InvalidParameterError):
+		validate_parameter_constraints(parameter_constraints, {"count" : 0}, "caller")
@@ -0,0 +1,53 @@
+"""Tests for the per-dataclass-type field-info cache"""
+import dataclasses
+import gc
+import typing
+import weakref
+
+from PySide6 import QtCore
+
+from pyside6_utils.models.dataclass_field_info import get_field_infos
+from pyside6_utils.models.dataclass_model import DataclassModel
+
+
+@dataclasses.dataclass
+class Config():
+	no_default : int
+	name : str = dataclasses.field(default="default", metadata={"display_name" : "Name", "help" : "The name",
+		"required" : True})
+	items : typing.List[int] = dataclasses.field(default_factory=lambda: [1, 2], metadata={"editable" : False})
+
+
+def test_field_infos_are_built_once_per_type():
+	infos = get_field_infos(Config)
+	assert get_field_infos(Config(no_default=1)) is infos #Same cached dict for the type and its instances
+	assert list(infos) == ["no_default", "name", "items"]
+
+	name = infos["name"]
+	assert (name.display_name, name.help, name.type_name, name.required) == ("Name", "The name", "str", True)
+	assert name.tooltip == "The name <b style='color:red'>(required)</b> (type: str) (default: default)"
+	assert infos["items"].default == [1, 2] and not infos["items"].editable
+	assert not infos["no_default"].has_default
+	assert infos["no_default"].tooltip == " (type: int)" #No default is shown
+
+
+def test_dynamic_dataclasses_are_not_kept_alive():
+	dynamic = dataclasses.make_dataclass("Dynamic", [("value", int, dataclasses.field(default=1))])
+	assert "value" in get_field_infos(dynamic)
+	dynamic_ref = weakref.ref(dynamic)
+	del dynamic
+	gc.collect()
+	assert dynamic_ref() is None
+
+
+def test_model_uses_field_infos(qapp):
+	model = DataclassModel(Config(no_default=1))
+	names = {}
+	for row in range(model.rowCount()):
+		index = model.index(row, 0)
+		names[index.data(DataclassModel.CustomDataRoles.AttributeNameRole)] = index
+	assert names["name"].data(QtCore.Qt.ItemDataRole.DisplayRole) == "Name"
+	assert names["name"].data(QtCore.Qt.ItemDataRole.ToolTipRole) == get_field_infos(Config)["name"].tooltip
+	assert names["no_default"].data(QtCore.Qt.ItemDataRole.ToolTipRole) == " (type: int)"
+	assert not model.flags(names["items"].siblingAtColumn(1)) & QtCore.Qt.ItemFlag.ItemIsEditable
+	assert model.flags(names["name"].siblingAtColumn(1)) & QtCore.Qt.ItemFlag.ItemIsEditable
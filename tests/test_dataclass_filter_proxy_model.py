@@ -0,0 +1,76 @@
+"""Tests for DataclassFilterProxyModel"""
+import dataclasses
+
+import pytest
+from PySide6 import QtCore, QtGui
+
+from pyside6_utils.models.dataclass_filter_proxy_model import DataclassFilterProxyModel
+from pyside6_utils.models.dataclass_model import DataclassModel
+from pyside6_utils.models.dataclass_multi_model import DataclassMultiModel
+
+
+@dataclasses.dataclass
+class Config():
+	name : str = dataclasses.field(default="alpha", metadata={"help" : "The name of the run"})
+	learning_rate : float = dataclasses.field(default=0.1, metadata={"display_name" : "Learning Rate",
+		"display_path" : "Optimizer"})
+	momentum : float = dataclasses.field(default=0.9, metadata={"display_path" : "Optimizer"})
+
+
+def _visible_names(proxy : QtCore.QSortFilterProxyModel, parent : QtCore.QModelIndex = QtCore.QModelIndex()
+		) -> list:
+	names = []
+	for row in range(proxy.rowCount(parent)):
+		index = proxy.index(row, 0, parent)
+		names.append(index.data(DataclassModel.CustomDataRoles.AttributeNameRole))
+		names += _visible_names(proxy, index)
+	return names
+
+
+@pytest.fixture
+def undo_stack(qapp):
+	stack = QtGui.QUndoStack()
+	yield stack
+	stack.clear() #Delete the commands (and their persistent indexes) while the models still exist
+
+
+def test_search_terms(undo_stack): #pylint: disable=redefined-outer-name
+	proxy = DataclassFilterProxyModel()
+	proxy.setSourceModel(DataclassModel(Config(), undo_stack=undo_stack))
+	assert len(_visible_names(proxy)) == 4 #Including the group
+
+	proxy.set_search_text("  LEARNING   rate ") #Display name, case/whitespace insensitive
+	assert proxy.get_search_text() == "learning rate"
+	assert _visible_names(proxy) == ["Optimizer", "learning_rate"] #Parent of a match is kept
+	proxy.set_search_text("run") #Help text
+	assert _visible_names(proxy) == ["name"]
+	proxy.set_search_text("alpha") #Value
+	assert _visible_names(proxy) == ["name"]
+	proxy.set_search_text("alpha momentum") #All terms should match
+	assert _visible_names(proxy) == []
+	proxy.set_search_text("optimizer") #Matching group -> all children are shown
+	assert _visible_names(proxy) == ["Optimizer", "learning_rate", "momentum"]
+	proxy.set_search_text("")
+	assert len(_visible_names(proxy)) == 4
+
+
+def test_refilters_on_edit(undo_stack): #pylint: disable=redefined-outer-name
+	model = DataclassModel(Config(), undo_stack=undo_stack)
+	proxy = DataclassFilterProxyModel()
+	proxy.setSourceModel(model)
+	proxy.set_search_text("beta")
+	assert _visible_names(proxy) == []
+	model.set_many({"name" : "beta"})
+	assert _visible_names(proxy) == ["name"]
+	undo_stack.undo()
+	assert _visible_names(proxy) == []
+
+
+def test_multi_model_source(undo_stack): #pylint: disable=redefined-outer-name
+	model = DataclassMultiModel([Config(), Config(momentum=0.5)], undo_stack=undo_stack)
+	proxy = DataclassFilterProxyModel()
+	proxy.setSourceModel(model)
+	proxy.set_search_text("0.5") #Values of all instances are searched
+	assert _visible_names(proxy) == ["Optimizer", "momentum"]
+	model.set_values("learning_rate", [2], 0.5)
+	assert _visible_names(proxy) == ["Optimizer", "learning_rate", "momentum"]
@@ -0,0 +1,157 @@
+"""Tests for DataclassModel"""
+import dataclasses
+import typing
+
+import pytest
+from PySide6 import QtCore, QtGui
+
+from pyside6_utils.models.dataclass_filter_proxy_model import DataclassFilterProxyModel
+from pyside6_utils.models.dataclass_model import DataclassModel
+
+
+@dataclasses.dataclass
+class Inner():
+	value : int = 1
+
+
+@dataclasses.dataclass
+class Config():
+	name : str = "default"
+	count : int = dataclasses.field(default=3, metadata={"display_name" : "Count", "display_path" : "Group"})
+	items : typing.List[int] = dataclasses.field(default_factory=lambda: [1, 2, 3])
+	inner : Inner = dataclasses.field(default_factory=Inner)
+
+
+def _find(model : DataclassModel, name : str, parent : QtCore.QModelIndex = QtCore.QModelIndex()) -> QtCore.QModelIndex:
+	"""Returns the index (column 0) of the field with the passed attribute name"""
+	for row in range(model.rowCount(parent)):
+		index = model.index(row, 0, parent)
+		if index.data(DataclassModel.CustomDataRoles.AttributeNameRole) == name:
+			return index
+		found = _find(model, name, index)
+		if found.isValid():
+			return found
+	return QtCore.QModelIndex()
+
+
+def _is_bold(index : QtCore.QModelIndex) -> bool:
+	font = index.data(QtCore.Qt.ItemDataRole.FontRole)
+	return font is not None and font.bold()
+
+
+@pytest.fixture
+def undo_stack(qapp):
+	stack = QtGui.QUndoStack()
+	yield stack
+	stack.clear() #Delete the commands (and their persistent indexes) while the models still exist
+
+
+def test_non_default_tracking_with_undo_redo(undo_stack): #pylint: disable=redefined-outer-name
+	config = Config()
+	model = DataclassModel(config, undo_stack=undo_stack)
+	count = _find(model, "count")
+	assert count.isValid() and count.parent().isValid() #Grouped under "Group"
+	assert model.is_default(count) and not _is_bold(count)
+
+	model.setData(count.siblingAtColumn(1), 5, QtCore.Qt.ItemDataRole.EditRole)
+	assert config.count == 5
+	assert not model.is_default(count) and _is_bold(count)
+
+	undo_stack.undo()
+	assert config.count == 3
+	assert model.is_default(count) and not _is_bold(count)
+	undo_stack.redo()
+	assert config.count == 5 and _is_bold(count)
+
+	model.set_to_default(count.siblingAtColumn(1))
+	assert config.count == 3 and not _is_bold(count)
+	undo_stack.undo()
+	assert config.count == 5 and _is_bold(count)
+
+
+def test_mutable_defaults_are_copied(undo_stack): #pylint: disable=redefined-outer-name
+	config = Config(items=[7])
+	model = DataclassModel(config, undo_stack=undo_stack)
+	items = _find(model, "items")
+	assert not model.is_default(items)
+	model.set_to_default(items.siblingAtColumn(1))
+	assert config.items == [1, 2, 3]
+	config.items.append(4) #Must not modify the cached default
+	assert model.get_default_value(dataclasses.fields(Config)[2]) == [1, 2, 3]
+
+
+def test_swap_instance_keeps_tree(undo_stack): #pylint: disable=redefined-outer-name
+	first, second = Config(), Config(name="second", count=8, items=[4, 5])
+	model = DataclassModel(first, undo_stack=undo_stack)
+	items = _find(model, "items")
+	model.fetchMore(items)
+	persistent_count = QtCore.QPersistentModelIndex(_find(model, "count"))
+	resets, layout_changes = [], []
+	model.modelReset.connect(lambda: resets.append(True))
+	model.layoutChanged.connect(lambda *_: layout_changes.append(True))
+
+	model.set_dataclass_instance(second)
+	assert not resets and len(layout_changes) == 1
+	assert persistent_count.isValid()
+	count = QtCore.QModelIndex(persistent_count)
+	assert count.siblingAtColumn(1).data(QtCore.Qt.ItemDataRole.EditRole) == 8
+	assert _is_bold(count)
+	assert not _is_bold(_find(model, "inner"))
+	items = _find(model, "items")
+	assert model.rowCount(items) == 2 #Fetched children with a different structure are re-created
+	assert model.index(1, 1, items).data(QtCore.Qt.ItemDataRole.EditRole) == 5
+
+
+def test_undo_after_swap_applies_to_original_instance(undo_stack): #pylint: disable=redefined-outer-name
+	first, second = Config(), Config(count=8)
+	model = DataclassModel(first, undo_stack=undo_stack)
+	model.setData(_find(model, "count").siblingAtColumn(1), 5, QtCore.Qt.ItemDataRole.EditRole)
+	model.set_dataclass_instance(second)
+	undo_stack.undo()
+	assert first.count == 3
+	assert second.count == 8
+
+
+def test_filter_proxy_is_updated_after_swap(undo_stack): #pylint: disable=redefined-outer-name
+	model = DataclassModel(Config(name="alpha"), undo_stack=undo_stack)
+	proxy = DataclassFilterProxyModel()
+	proxy.setSourceModel(model)
+	proxy.set_search_text("alpha")
+	assert proxy.rowCount() == 1
+	model.set_dataclass_instance(Config(name="beta"))
+	assert proxy.rowCount() == 0
+	proxy.set_search_text("beta")
+	assert proxy.rowCount() == 1
+
+
+def test_set_many_is_a_single_undo_step(undo_stack): #pylint: disable=redefined-outer-name
+	config = Config()
+	model = DataclassModel(config, undo_stack=undo_stack)
+	assert model.set_many({"name" : "new", "count" : 9, "items" : [1, 2, 3]}) == 2 #items is unchanged
+	assert (config.name, config.count) == ("new", 9)
+	assert undo_stack.count() == 1
+	assert _is_bold(_find(model, "name")) and _is_bold(_find(model, "count"))
+
+	undo_stack.undo()
+	assert (config.name, config.count) == ("default", 3)
+	assert not _is_bold(_find(model, "name")) and not _is_bold(_find(model, "count"))
+	undo_stack.redo()
+	assert (config.name, config.count) == ("new", 9)
+
+	with pytest.raises(KeyError):
+		model.set_many({"not_a_field" : 1})
+	assert model.set_many({"name" : "new"}) == 0
+	assert undo_stack.count() == 1
+
+
+def test_reset_all_to_default_is_a_single_undo_step(undo_stack): #pylint: disable=redefined-outer-name
+	config = Config(name="changed", count=0, items=[])
+	model = DataclassModel(config, undo_stack=undo_stack)
+	assert model.reset_all_to_default() == 3
+	assert config == Config()
+	assert undo_stack.count() == 1
+	assert model.reset_all_to_default() == 0
+
+	undo_stack.undo()
+	assert (config.name, config.count, config.items) == ("changed", 0, [])
+	assert _is_bold(_find(model, "items"))
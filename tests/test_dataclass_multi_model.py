@@ -0,0 +1,104 @@
+"""Tests for DataclassMultiModel"""
+import dataclasses
+import typing
+
+import pytest
+from PySide6 import QtCore, QtGui
+
+from pyside6_utils.models.dataclass_model import DataclassModel
+from pyside6_utils.models.dataclass_multi_model import DataclassMultiModel
+
+
+@dataclasses.dataclass
+class Config():
+	name : str = "default"
+	count : int = dataclasses.field(default=3, metadata={"display_path" : "Group"})
+	items : typing.List[int] = dataclasses.field(default_factory=list)
+
+
+def _row(model : DataclassMultiModel, name : str, parent : QtCore.QModelIndex = QtCore.QModelIndex()
+		) -> QtCore.QModelIndex:
+	"""Returns the index (column 0) of the field with the passed name"""
+	for row in range(model.rowCount(parent)):
+		index = model.index(row, 0, parent)
+		if index.data(DataclassModel.CustomDataRoles.AttributeNameRole) == name:
+			return index
+		found = _row(model, name, index)
+		if found.isValid():
+			return found
+	return QtCore.QModelIndex()
+
+
+@pytest.fixture
+def undo_stack(qapp):
+	stack = QtGui.QUndoStack()
+	yield stack
+	stack.clear() #Delete the commands (and their persistent indexes) while the models still exist
+
+
+def test_groups_of_equal_values(undo_stack): #pylint: disable=redefined-outer-name
+	instances = [Config(items=[1]), Config(count=4, items=[1]), Config(count=4, items=[2])]
+	model = DataclassMultiModel(instances, undo_stack=undo_stack)
+	assert model.columnCount() == 4
+	assert model.get_differing_fields() == {"count", "items"}
+
+	count = _row(model, "count")
+	assert count.parent().isValid() #Grouped under "Group"
+	assert count.data(QtCore.Qt.ItemDataRole.FontRole).bold()
+	brushes = [count.siblingAtColumn(column).data(QtCore.Qt.ItemDataRole.BackgroundRole) for column in (1, 2, 3)]
+	assert brushes[0] != brushes[1] and brushes[1] == brushes[2]
+	items = _row(model, "items") #Unhashable values
+	brushes = [items.siblingAtColumn(column).data(QtCore.Qt.ItemDataRole.BackgroundRole) for column in (1, 2, 3)]
+	assert brushes[0] == brushes[1] and brushes[1] != brushes[2]
+	assert _row(model, "name").siblingAtColumn(1).data(QtCore.Qt.ItemDataRole.BackgroundRole) is None
+
+
+def test_edit_updates_differing_fields(undo_stack): #pylint: disable=redefined-outer-name
+	instances = [Config(), Config(name="other")]
+	model = DataclassMultiModel(instances, undo_stack=undo_stack)
+	assert model.get_differing_fields() == {"name"}
+	name = _row(model, "name")
+	assert model.setData(name.siblingAtColumn(2), "default")
+	assert model.get_differing_fields() == set()
+	undo_stack.undo()
+	assert instances[1].name == "other"
+	assert model.get_differing_fields() == {"name"}
+
+
+def test_multi_edit_is_a_single_undo_command(undo_stack): #pylint: disable=redefined-outer-name
+	instances = [Config(), Config(), Config(count=1)]
+	model = DataclassMultiModel(instances, undo_stack=undo_stack)
+	group_updates = []
+	update_groups = model._update_groups #pylint: disable=protected-access
+	model._update_groups = lambda name: (group_updates.append(name), update_groups(name)) #pylint: disable=protected-access
+	model.set_multi_edit_columns({1, 3, 5}) #Out of range columns are ignored
+	assert model.get_multi_edit_columns() == {1, 3}
+	assert model.setData(_row(model, "count").siblingAtColumn(3), 7)
+	assert [instance.count for instance in instances] == [7, 3, 7]
+	assert undo_stack.count() == 1
+	assert group_updates == ["count"] #Groups are only re-computed once for all edited instances
+	undo_stack.undo()
+	assert [instance.count for instance in instances] == [3, 3, 1]
+	assert group_updates == ["count", "count"]
+	assert model.get_differing_fields() == {"count"}
+	undo_stack.redo()
+	assert [instance.count for instance in instances] == [7, 3, 7]
+	assert not model.set_values("count", [2], 3) #Unchanged
+
+
+def test_set_instances(undo_stack): #pylint: disable=redefined-outer-name
+	model = DataclassMultiModel([Config(), Config()], instance_names=["a", "b"], undo_stack=undo_stack)
+	assert model.headerData(2, QtCore.Qt.Orientation.Horizontal) == "b"
+	resets = []
+	model.modelReset.connect(lambda: resets.append(True))
+	persistent = QtCore.QPersistentModelIndex(_row(model, "count"))
+	model.set_instances([Config(count=1), Config()]) #Same layout -> no reset
+	assert not resets and persistent.isValid()
+	assert model.get_differing_fields() == {"count"}
+	model.set_instances([Config()])
+	assert len(resets) == 1 and model.columnCount() == 2
+
+	with pytest.raises(ValueError):
+		model.set_instances([])
+	with pytest.raises(TypeError):
+		model.set_instances([Config(), object()])
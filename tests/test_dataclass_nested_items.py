@@ -0,0 +1,127 @@
+"""Tests for the lazily expanded nested dataclasses/containers of DataclassModel"""
+import dataclasses
+import typing
+
+import pytest
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from pyside6_utils.models.dataclass_model import DataclassModel
+from pyside6_utils.widgets.delegates.dataclass_editors_delegate import \
+    DataclassEditorsDelegate
+
+
+@dataclasses.dataclass
+class Inner():
+	value : int = dataclasses.field(default=1, metadata={"display_path" : "Inner group"})
+	fixed : str = dataclasses.field(default="fixed", metadata={"editable" : False})
+
+
+@dataclasses.dataclass
+class Config():
+	items : typing.List[int] = dataclasses.field(default_factory=lambda: [1, 2, 3])
+	mapping : typing.Dict[str, float] = dataclasses.field(default_factory=lambda: {"a" : 1.0, "b" : 2.0})
+	pair : typing.Tuple[int, int] = (1, 2)
+	inner : Inner = dataclasses.field(default_factory=Inner)
+	nested : typing.List[Inner] = dataclasses.field(default_factory=lambda: [Inner()])
+
+
+def _find(model : DataclassModel, name : str, parent : QtCore.QModelIndex = QtCore.QModelIndex()) -> QtCore.QModelIndex:
+	"""Returns the index (column 0) of the (already fetched) item with the passed attribute name"""
+	for row in range(model.rowCount(parent)):
+		index = model.index(row, 0, parent)
+		if index.data(DataclassModel.CustomDataRoles.AttributeNameRole) == name:
+			return index
+		found = _find(model, name, index)
+		if found.isValid():
+			return found
+	return QtCore.QModelIndex()
+
+
+def _fetch(model : DataclassModel, index : QtCore.QModelIndex) -> None:
+	assert model.hasChildren(index) and model.canFetchMore(index)
+	model.fetchMore(index)
+	assert not model.canFetchMore(index)
+
+
+def _is_bold(index : QtCore.QModelIndex) -> bool:
+	font = index.data(QtCore.Qt.ItemDataRole.FontRole)
+	return font is not None and font.bold()
+
+
+def _is_editable(index : QtCore.QModelIndex) -> bool:
+	return bool(index.flags() & QtCore.Qt.ItemFlag.ItemIsEditable)
+
+
+@pytest.fixture
+def undo_stack(qapp):
+	stack = QtGui.QUndoStack()
+	yield stack
+	stack.clear() #Delete the commands (and their persistent indexes) while the models still exist
+
+
+def test_nested_items_are_fetched_lazily_and_editable(undo_stack): #pylint: disable=redefined-outer-name
+	config = Config()
+	model = DataclassModel(config, undo_stack=undo_stack)
+	items = _find(model, "items")
+	assert model.rowCount(items) == 0 #Not created until fetched
+	_fetch(model, items)
+	assert model.rowCount(items) == 3
+	assert model.index(1, 0, items).data() == "[1]"
+	model.setData(model.index(1, 1, items), 20, QtCore.Qt.ItemDataRole.EditRole)
+	assert config.items == [1, 20, 3]
+	assert _is_bold(items) #The field itself is no longer default
+	undo_stack.undo()
+	assert config.items == [1, 2, 3]
+	assert not _is_bold(items)
+
+
+def test_dicts_tuples_and_dataclasses(undo_stack): #pylint: disable=redefined-outer-name
+	config = Config()
+	model = DataclassModel(config, undo_stack=undo_stack)
+	mapping = _find(model, "mapping")
+	_fetch(model, mapping)
+	assert [model.index(row, 0, mapping).data() for row in range(model.rowCount(mapping))] == ["a", "b"]
+	model.setData(model.index(1, 1, mapping), 5.0, QtCore.Qt.ItemDataRole.EditRole)
+	assert config.mapping == {"a" : 1.0, "b" : 5.0}
+
+	pair = _find(model, "pair")
+	_fetch(model, pair)
+	assert not _is_editable(model.index(0, 1, pair)) #Tuples are read-only
+
+	inner = _find(model, "inner")
+	_fetch(model, inner)
+	group = model.index(0, 0, inner) #The display_path of the nested dataclass is used
+	assert group.data() == "Inner group"
+	value = model.index(0, 1, group)
+	assert _is_editable(value)
+	assert not _is_editable(_find(model, "fixed", inner).siblingAtColumn(1))
+	model.setData(value, 7, QtCore.Qt.ItemDataRole.EditRole)
+	assert config.inner.value == 7
+	assert _is_bold(inner) and _is_bold(value.siblingAtColumn(0))
+
+	nested = _find(model, "nested")
+	_fetch(model, nested)
+	first = model.index(0, 0, nested)
+	assert not _is_editable(first.siblingAtColumn(1)) #Nested values themselves are not editable
+	assert model.hasChildren(first)
+
+	model.setData(nested.siblingAtColumn(1), [Inner(), Inner()], QtCore.Qt.ItemDataRole.EditRole)
+	if model.canFetchMore(nested): #Fetched children are dropped (or re-created) when the value is replaced
+		model.fetchMore(nested)
+	assert model.rowCount(nested) == 2
+
+
+def test_delegate_uses_the_type_of_container_items(undo_stack): #pylint: disable=redefined-outer-name
+	model = DataclassModel(Config(), undo_stack=undo_stack)
+	items = _find(model, "items")
+	_fetch(model, items)
+	index = model.index(0, 1, items)
+	assert index.data(DataclassModel.CustomDataRoles.TypeRole) is int #No field -> the type of the value
+
+	parent = QtWidgets.QWidget()
+	delegate = DataclassEditorsDelegate(parent)
+	editor = delegate.createEditor(parent, QtWidgets.QStyleOptionViewItem(), index)
+	assert isinstance(editor, QtWidgets.QSpinBox)
+	delegate.setEditorData(editor, index)
+	assert editor.value() == 1
+	parent.deleteLater()
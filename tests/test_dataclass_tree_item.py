@@ -0,0 +1,46 @@
+"""Tests for DataclassTreeItem"""
+import dataclasses
+
+import pytest
+
+from pyside6_utils.models.dataclass_model import DataclassModel
+from pyside6_utils.models.dataclass_tree_item import DataclassTreeItem
+
+
+def _rows(item : DataclassTreeItem):
+	return [(child.name, child.row()) for child in item.child_items]
+
+
+def test_rows_are_stored_and_updated():
+	root = DataclassTreeItem("root", None, None)
+	for name in "abc":
+		root.append_child(DataclassTreeItem(name, None, None))
+	assert all(child.parent() is root for child in root.child_items)
+	assert _rows(root) == [("a", 0), ("b", 1), ("c", 2)]
+
+	root.insert_child(1, DataclassTreeItem("x", None, None))
+	assert _rows(root) == [("a", 0), ("x", 1), ("b", 2), ("c", 3)]
+	removed = root.remove_child(0)
+	assert removed.name == "a" and removed.parent() is None
+	assert _rows(root) == [("x", 0), ("b", 1), ("c", 2)]
+	assert root.row() == 0
+
+
+def test_items_use_slots():
+	item = DataclassTreeItem("item", None, None)
+	with pytest.raises(AttributeError):
+		item.other = 1 #pylint: disable=attribute-defined-outside-init
+
+
+def test_parent_of_wide_groups(qapp):
+	wide = dataclasses.make_dataclass("Wide", [(f"field_{nr}", int, dataclasses.field(default=nr,
+		metadata={"display_path" : f"Group {nr % 3}"})) for nr in range(30)])
+	model = DataclassModel(wide())
+	assert model.rowCount() == 3
+	for group_row in range(3):
+		group = model.index(group_row, 0)
+		assert model.rowCount(group) == 10
+		for row in range(model.rowCount(group)):
+			child = model.index(row, 1, group)
+			assert model.parent(child) == group
+			assert child.row() == row
@@ -0,0 +1,112 @@
+"""Tests for the constraint-validation of DataclassModel"""
+import dataclasses
+import logging
+
+import pytest
+from PySide6 import QtCore, QtGui
+
+from conftest import wait_until
+from pyside6_utils.classes.constraints import Interval
+from pyside6_utils.models.dataclass_field_info import DataclassFieldInfo
+from pyside6_utils.models.dataclass_model import DataclassModel
+
+ErrorRole = DataclassModel.CustomDataRoles.ValidationErrorRole
+FIELD_COUNT = 20
+
+
+@dataclasses.dataclass
+class Config():
+	count : int = dataclasses.field(default=3, metadata={"constraints" : [Interval(int, 0, 10, closed="both")]})
+	name : str = "name"
+
+
+Big = dataclasses.make_dataclass("Big", [ #pylint: disable=invalid-name
+	(f"value_{nr}", int, dataclasses.field(default=1, metadata={"constraints" : [Interval(int, 0, None, closed="left")]}))
+		for nr in range(FIELD_COUNT)
+])
+
+
+def _index(model : DataclassModel, name : str) -> QtCore.QModelIndex:
+	for row in range(model.rowCount()):
+		index = model.index(row, 1)
+		if index.data(DataclassModel.CustomDataRoles.AttributeNameRole) == name:
+			return index
+	raise KeyError(name)
+
+
+@pytest.fixture
+def undo_stack(qapp):
+	return QtGui.QUndoStack()
+
+
+def test_invalid_edit(undo_stack): #pylint: disable=redefined-outer-name
+	config = Config()
+	model = DataclassModel(config, undo_stack=undo_stack)
+	count = _index(model, "count")
+	assert model.get_validation_errors() == {}
+	assert count.data(ErrorRole) is None
+	assert count.data(QtCore.Qt.ItemDataRole.BackgroundRole) is None
+
+	model.setData(count, -5, QtCore.Qt.ItemDataRole.EditRole)
+	assert config.count == -5 #Invalid values are set, but marked
+	assert "range [0, 10]" in count.data(ErrorRole)
+	assert "Invalid" in count.data(QtCore.Qt.ItemDataRole.ToolTipRole)
+	assert count.data(QtCore.Qt.ItemDataRole.BackgroundRole) is not None
+	assert set(model.get_validation_errors()) == {"count"}
+
+	undo_stack.undo()
+	assert count.data(ErrorRole) is None
+	assert model.get_validation_errors() == {}
+
+
+def test_validation_on_set_instance(undo_stack): #pylint: disable=redefined-outer-name
+	model = DataclassModel(Config(), undo_stack=undo_stack)
+	model.set_dataclass_instance(Config(count=11))
+	assert set(model.get_validation_errors()) == {"count"}
+	assert _index(model, "count").data(ErrorRole) is not None
+
+
+def test_background_validation(qapp, undo_stack): #pylint: disable=redefined-outer-name
+	model = DataclassModel(Big(), undo_stack=undo_stack, background_validation_threshold=FIELD_COUNT)
+	assert wait_until(qapp, lambda: not model.is_validating())
+	finished = []
+	model.validationFinished.connect(lambda: finished.append(True))
+
+	invalid = Big(value_3=-1, value_4=-1) #type: ignore #pylint: disable=unexpected-keyword-arg
+	model.set_dataclass_instance(invalid)
+	assert model.is_validating()
+	model.setData(_index(model, "value_4"), 2, QtCore.Qt.ItemDataRole.EditRole) #Edited during the validation
+	model.setData(_index(model, "value_5"), -2, QtCore.Qt.ItemDataRole.EditRole)
+	assert wait_until(qapp, lambda: len(finished) > 0)
+	assert not model.is_validating()
+	assert set(model.get_validation_errors()) == {"value_3", "value_5"} #Result of the edits is kept
+	assert _index(model, "value_3").data(ErrorRole) is not None
+
+	model.set_background_validation_threshold(FIELD_COUNT + 1) #Synchronous
+	model.validate_all()
+	assert not model.is_validating()
+	assert set(model.get_validation_errors()) == {"value_3", "value_5"}
+
+
+def test_stop_validation(qapp, undo_stack): #pylint: disable=redefined-outer-name
+	model = DataclassModel(Big(), undo_stack=undo_stack, background_validation_threshold=1)
+	model.set_dataclass_instance(Big(value_0=-1)) #type: ignore #pylint: disable=unexpected-keyword-arg
+	model.stop_validation()
+	assert not model.is_validating()
+	qapp.processEvents() #Results of the cancelled validation are ignored
+	assert not model.is_validating()
+	model.validate_all()
+	assert wait_until(qapp, lambda: not model.is_validating())
+	assert set(model.get_validation_errors()) == {"value_0"}
+
+
+def test_invalid_constraints_are_converted_once(caplog):
+	field = dataclasses.field(metadata={"constraints" : ["not a constraint"]})
+	field.name = "invalid"
+	field.type = int
+	with caplog.at_level(logging.WARNING):
+		info = DataclassFieldInfo(field)
+		first, second = info.validate(1), info.validate(2)
+	assert first is not None and first == second
+	assert "Unknown constraint type" in first
+	assert len([record for record in caplog.records if "invalid" in record.getMessage()]) == 1
@@ -0,0 +1,34 @@
+"""Tests for ExtendedSortFilterProxyModel"""
+from PySide6 import QtCore, QtGui
+
+from pyside6_utils.models.extended_sort_filter_proxy_model import \
+    ExtendedSortFilterProxyModel
+
+
+def _proxy(rows) -> ExtendedSortFilterProxyModel:
+	proxy = ExtendedSortFilterProxyModel(None)
+	source = QtGui.QStandardItemModel(proxy)
+	for row in rows:
+		items = []
+		for value in row:
+			item = QtGui.QStandardItem()
+			item.setData(value, QtCore.Qt.ItemDataRole.EditRole)
+			items.append(item)
+		source.appendRow(items)
+	proxy.setSourceModel(source)
+	return proxy
+
+
+def _rows(proxy : ExtendedSortFilterProxyModel):
+	return [tuple(proxy.index(row, column).data(QtCore.Qt.ItemDataRole.EditRole)
+		for column in range(proxy.columnCount())) for row in range(proxy.rowCount())]
+
+
+def test_sort_by_multiple_columns_with_orders(qapp):
+	proxy = _proxy([("b", 1), ("a", 2), ("c", 2), ("a", 1), ("b", None)])
+	proxy.sort_by_columns([1, 0], [QtCore.Qt.SortOrder.DescendingOrder, QtCore.Qt.SortOrder.AscendingOrder])
+	proxy.sort(0)
+	assert _rows(proxy) == [("a", 2), ("c", 2), ("a", 1), ("b", 1), ("b", None)]
+
+	proxy.sort_by_columns([1, 0], [QtCore.Qt.SortOrder.AscendingOrder, QtCore.Qt.SortOrder.DescendingOrder])
+	assert _rows(proxy) == [("b", None), ("b", 1), ("a", 1), ("c", 2), ("a", 2)]